@@ -0,0 +1,236 @@
+"""Benchmark parser throughput over the HTML recorded in the test cassettes.
+
+Usage: python scripts/bench_parse.py [--iterations N] [--min-time SECONDS]
+"""
+
+import argparse
+import logging
+import statistics
+import time
+import tracemalloc
+from collections import defaultdict
+from html import unescape
+from typing import Callable
+
+from cassettes import RecordedPage, iter_recorded_pages
+from jobdog.dedup import NearDuplicateIndex
+from jobdog.exceptions import UnsupportedProviderError
+from jobdog.logger import logger
+from jobdog.models.compact_job_listing import CompactJobListing
+from jobdog.models.job_listing import JobListing
+from jobdog.providers.base import ParseContext
+from jobdog.providers.text import html_to_text
+from jobdog.providers.utils import classify_urls, get_parser, load_parsers, route
+
+
+def _percentile(samples: list[float], percentile: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, round(percentile / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def _time_calls(func: Callable[[], object], iterations: int, min_time: float):
+    samples = []
+    started = time.perf_counter()
+    while len(samples) < iterations or time.perf_counter() - started < min_time:
+        call_started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - call_started)
+    return samples
+
+
+def _peak_memory(func: Callable[[], object]) -> int:
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _report(name: str, samples: list[float], peak_bytes: int = None) -> None:
+    line = (
+        f"{name:<32} {len(samples):>7} runs"
+        f" {len(samples) / sum(samples):>10.1f}/s"
+        f" p50 {_percentile(samples, 50) * 1e3:>8.3f}ms"
+        f" p99 {_percentile(samples, 99) * 1e3:>8.3f}ms"
+    )
+    if peak_bytes is not None:
+        line += f" peak {peak_bytes / 1024:>8.1f}KiB"
+    print(line)
+
+
+def bench_parse_html(pages: list[RecordedPage], iterations: int, min_time: float):
+    print("parse_html")
+    by_parser = defaultdict(list)
+    for page in pages:
+        parser = get_parser(page.url)
+        by_parser[type(parser).__name__].append((parser, page))
+
+    for parser_name, parser_pages in sorted(by_parser.items()):
+        samples = []
+        peak = 0
+        for parser, page in parser_pages:
+            # one untimed run so lazy imports and caches do not skew p99
+            parser.parse_html(page.html)
+            samples += _time_calls(
+                lambda: parser.parse_html(page.html), iterations, min_time
+            )
+            peak = max(peak, _peak_memory(lambda: parser.parse_html(page.html)))
+        _report(f"{parser_name} ({len(parser_pages)} pages)", samples, peak)
+
+
+def bench_text(pages: list[RecordedPage], iterations: int, min_time: float):
+    print("html_to_text")
+    fragments = []
+    nodes = []
+    for page in pages:
+        context = ParseContext(page.html)
+        description = (context.job_posting or {}).get("description")
+        if description:
+            fragments.append(unescape(description))
+        spec = get_parser(page.url).spec
+        for selector in spec.fields["job_description"].selectors if spec else ():
+            node = context.tree.css_first(selector)
+            if node is not None:
+                nodes.append(node)
+                break
+
+    for name, items in [
+        (f"JSON-LD fragments ({len(fragments)})", fragments),
+        (f"description nodes ({len(nodes)})", nodes),
+    ]:
+        if not items:
+            continue
+        _report(
+            name,
+            _time_calls(
+                lambda: [html_to_text(item) for item in items], iterations, min_time
+            ),
+        )
+    # what the text costs without any structure, as a floor
+    _report(
+        f"Node.text() ({len(nodes)} nodes)",
+        _time_calls(lambda: [node.text() for node in nodes], iterations, min_time),
+    )
+
+
+def bench_records(pages: list[RecordedPage], iterations: int, min_time: float):
+    print("records")
+    values = [
+        {
+            name: extract()
+            for name, extract in get_parser(page.url).extractors(page.html).items()
+        }
+        for page in pages
+    ]
+    # many records per page, as in a backfill
+    batch = values * max(1, 10_000 // len(values))
+
+    def build_listings():
+        return [JobListing(**record) for record in batch]
+
+    def build_compact():
+        return [CompactJobListing.from_values(record) for record in batch]
+
+    listings = build_listings()
+    for name, build in [
+        (f"JobListing ({len(batch)} records)", build_listings),
+        (f"CompactJobListing ({len(batch)} records)", build_compact),
+        (
+            f"CompactJobListing.from_listing ({len(batch)} records)",
+            lambda: [CompactJobListing.from_listing(listing) for listing in listings],
+        ),
+    ]:
+        _report(name, _time_calls(build, iterations, min_time), _peak_memory(build))
+
+
+def bench_dedup(pages: list[RecordedPage], iterations: int, min_time: float):
+    print("dedup")
+    listings = [get_parser(page.url).parse_html(page.html) for page in pages]
+    index = NearDuplicateIndex()
+    # a realistically full index, so lookups pay for the bucket sizes
+    for i in range(10_000):
+        index.add(
+            f"filler:{i}",
+            listings[i % len(listings)].model_copy(
+                update={"job_description": f"{i} {i * 7} {i * 13} filler listing"}
+            ),
+        )
+    _report(
+        f"signature ({len(listings)} listings)",
+        _time_calls(
+            lambda: [index.signature(listing) for listing in listings],
+            iterations,
+            min_time,
+        ),
+    )
+    _report(
+        f"query ({len(listings)} listings, {len(index)} indexed)",
+        _time_calls(
+            lambda: [index.query(listing) for listing in listings],
+            iterations,
+            min_time,
+        ),
+    )
+
+
+def bench_urls(pages: list[RecordedPage], iterations: int, min_time: float):
+    print("urls")
+    urls = [page.url for page in pages]
+    _report(
+        f"get_parser ({len(urls)} urls)",
+        _time_calls(lambda: [get_parser(url) for url in urls], iterations, min_time),
+    )
+    _report(
+        f"route ({len(urls)} urls)",
+        _time_calls(lambda: [route(url) for url in urls], iterations, min_time),
+    )
+    batch = urls * max(1, 10_000 // len(urls))
+    _report(
+        f"classify_urls ({len(batch)} urls)",
+        _time_calls(lambda: classify_urls(batch), iterations, min_time),
+    )
+    parsers = [(get_parser(url), url) for url in urls]
+    _report(
+        f"sanitize_url ({len(urls)} urls)",
+        _time_calls(
+            lambda: [parser.sanitize_url(url) for parser, url in parsers],
+            iterations,
+            min_time,
+        ),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--min-time", type=float, default=0.5)
+    args = parser.parse_args()
+
+    # keep the per-URL log lines of sanitize_url out of the report
+    logger.setLevel(logging.WARNING)
+    load_parsers()
+    pages = []
+    for page in iter_recorded_pages():
+        try:
+            get_parser(page.url)
+        except UnsupportedProviderError:
+            continue
+        pages.append(page)
+    if not pages:
+        raise SystemExit("No parseable pages found in the cassettes")
+
+    print(
+        f"{len(pages)} pages, median size"
+        f" {statistics.median(len(page.html) for page in pages) / 1024:.1f}KiB"
+    )
+    bench_parse_html(pages, args.iterations, args.min_time)
+    bench_text(pages, args.iterations, args.min_time)
+    bench_records(pages, args.iterations, args.min_time)
+    bench_dedup(pages, args.iterations, args.min_time)
+    bench_urls(pages, args.iterations, args.min_time)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import gzip
+import os
+import zlib
+from dataclasses import dataclass
+from typing import Iterator
+
+import yaml
+
+CASSETTE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "tests",
+    "providers",
+    "cassettes",
+)
+
+
+@dataclass
+class RecordedPage:
+    url: str
+    status_code: int
+    html: str
+    cassette: str
+
+
+def _decode_body(body, headers: dict) -> str:
+    if isinstance(body, str):
+        return body
+    encoding = {key.lower(): value for key, value in headers.items()}.get(
+        "content-encoding", [""]
+    )[0]
+    if "gzip" in encoding:
+        body = gzip.decompress(body)
+    elif "deflate" in encoding:
+        body = zlib.decompress(body)
+    return body.decode("utf-8", errors="replace")
+
+
+def iter_recorded_pages(
+    cassette_dir: str = CASSETTE_DIR, only_ok: bool = True
+) -> Iterator[RecordedPage]:
+    """Yield every page recorded in the VCR cassettes under ``cassette_dir``.
+
+    Identical URLs recorded by several tests are yielded once.
+    """
+    seen = set()
+    for root, _, files in sorted(os.walk(cassette_dir)):
+        for name in sorted(files):
+            if not name.endswith(".yaml"):
+                continue
+            path = os.path.join(root, name)
+            with open(path, encoding="utf-8") as f:
+                cassette = yaml.safe_load(f)
+            for interaction in cassette.get("interactions", []):
+                url = interaction["request"]["uri"]
+                response = interaction["response"]
+                status_code = response["status"]["code"]
+                if url in seen or (only_ok and status_code != 200):
+                    continue
+                seen.add(url)
+                html = _decode_body(response["body"]["string"], response["headers"])
+                yield RecordedPage(url, status_code, html, path)
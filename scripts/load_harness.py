@@ -0,0 +1,264 @@
+"""Load-test JobDog against a local stand-in for the job boards.
+
+A local HTTP server replays the pages recorded in the test cassettes under
+their original paths, with configurable latency, error rate and injected
+429s. JobDog's client is pointed at it through a transport that rewrites
+every request to the local server, so URLs, sanitizing and parsing behave
+exactly as against the real sites. Every request of the workload is for a
+listing of its own, so batch modes cannot skip any as duplicates.
+
+Usage: python scripts/load_harness.py [--requests N] [--concurrency N] ...
+"""
+
+import argparse
+import logging
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+import httpx
+
+from cassettes import iter_recorded_pages
+from jobdog.exceptions import UnsupportedProviderError
+from jobdog.http_client import create_default_client
+from jobdog.jobdog import JobDog
+from jobdog.logger import logger
+from jobdog.providers.utils import get_parser, load_parsers, route
+
+ORIGINAL_HOST_HEADER = "X-Original-Host"
+HISTOGRAM_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+
+def create_server(
+    pages: dict[tuple[str, str], str],
+    latency_ms: float,
+    jitter_ms: float,
+    error_rate: float,
+    rate_limit_rate: float,
+) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:
+            delay = latency_ms + random.uniform(-jitter_ms, jitter_ms)
+            time.sleep(max(0.0, delay) / 1000)
+
+            roll = random.random()
+            key = (self.headers.get(ORIGINAL_HOST_HEADER, ""), urlparse(self.path).path)
+            if roll < rate_limit_rate:
+                self._send(429, b"", {"Retry-After": "0"})
+            elif roll < rate_limit_rate + error_rate:
+                self._send(500, b"Internal Server Error")
+            elif key not in pages:
+                self._send(404, b"Not Found")
+            else:
+                self._send(200, pages[key].encode())
+
+        def _send(self, status: int, body: bytes, headers: dict = None) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    return server
+
+
+class LocalTransport(httpx.HTTPTransport):
+    """Sends every request to the local server, keeping the original host in
+    a header, and counts response status codes."""
+
+    def __init__(self, port: int, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.port = port
+        self.status_codes = Counter()
+        self._lock = threading.Lock()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.headers[ORIGINAL_HOST_HEADER] = request.url.host
+        request.url = request.url.copy_with(
+            scheme="http", host="127.0.0.1", port=self.port
+        )
+        response = super().handle_request(request)
+        with self._lock:
+            self.status_codes[response.status_code] += 1
+        return response
+
+
+class TimedJobDog(JobDog):
+    """Records the wall time and outcome of every fetch, whether it came
+    from ``fetch_details`` or a batch."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.latencies: list[float] = []
+        self.outcomes = Counter()
+
+    def _fetch_resolved(self, url: str, resolved, fields=None):
+        started = time.perf_counter()
+        outcome = "ok"
+        try:
+            return super()._fetch_resolved(url, resolved, fields)
+        except Exception as e:
+            outcome = _classify_error(e)
+            raise
+        finally:
+            self.latencies.append(time.perf_counter() - started)
+            self.outcomes[outcome] += 1
+
+
+def _classify_error(error: Exception) -> str:
+    message = str(error)
+    for status in ("429", "500", "404"):
+        if f"'{status} " in message:
+            return f"http {status}"
+    return type(error).__name__
+
+
+def _print_report(
+    mode: str, elapsed: float, dog: TimedJobDog, transport: LocalTransport
+) -> None:
+    latencies_ms = sorted(latency * 1000 for latency in dog.latencies)
+    count = len(latencies_ms)
+    print(f"\n== {mode}: {count} listings in {elapsed:.2f}s ({count / elapsed:.1f}/s)")
+    print(
+        "   latency p50 {:.1f}ms  p90 {:.1f}ms  p99 {:.1f}ms  max {:.1f}ms".format(
+            latencies_ms[count // 2],
+            latencies_ms[min(count - 1, int(count * 0.9))],
+            latencies_ms[min(count - 1, int(count * 0.99))],
+            latencies_ms[-1],
+        )
+    )
+    print("   outcomes  " + ", ".join(f"{k}={v}" for k, v in dog.outcomes.items()))
+    print(
+        "   responses "
+        + ", ".join(f"{k}={v}" for k, v in sorted(transport.status_codes.items()))
+    )
+
+    lower = 0
+    for upper in HISTOGRAM_BUCKETS_MS + [float("inf")]:
+        in_bucket = sum(1 for latency in latencies_ms if lower <= latency < upper)
+        if in_bucket:
+            label = f"<{upper}ms" if upper != float("inf") else f">={lower}ms"
+            bar = "#" * max(1, round(40 * in_bucket / count))
+            print(f"   {label:>9} {in_bucket:>6} {bar}")
+        lower = upper
+
+
+def _sanitized_key(url: str) -> tuple[str, str]:
+    parsed_url = urlparse(get_parser(url).sanitize_url(url))
+    return parsed_url.hostname, parsed_url.path
+
+
+def unique_workload(
+    pages: dict[tuple[str, str], str], urls: list[str], requests: int
+) -> list[str]:
+    """``requests`` URLs cycling through ``urls``, each with a job ID of its
+    own that the server serves the recorded page under."""
+    workload = []
+    for i in range(requests):
+        url = urls[i % len(urls)]
+        job_id = route(url).job_id
+        # a fixed-width suffix keeps IDs of different pages apart
+        unique_url = url.replace(job_id, f"{job_id}{i:07d}", 1)
+        pages[_sanitized_key(unique_url)] = pages[_sanitized_key(url)]
+        workload.append(unique_url)
+    return workload
+
+
+def run(args: argparse.Namespace, workload: list[str], port: int, mode: str) -> None:
+    transport = LocalTransport(
+        port,
+        limits=httpx.Limits(
+            max_connections=args.max_connections,
+            max_keepalive_connections=args.max_connections,
+        ),
+    )
+    client = create_default_client(mounts={"all://": transport})
+    dog = TimedJobDog(http_client=client, backoff_factor=0.01)
+
+    started = time.perf_counter()
+    if mode == "sync":
+        for url in workload:
+            try:
+                dog.fetch_details(url)
+            except Exception:
+                pass
+    elif mode == "batch":
+        dog.fetch_many(
+            workload,
+            max_concurrency=args.concurrency,
+            per_host_limit=args.per_host_limit,
+        )
+    elif mode == "iter":
+        for _ in dog.iter_details(
+            workload,
+            max_concurrency=args.concurrency,
+            per_host_limit=args.per_host_limit,
+        ):
+            pass
+    elapsed = time.perf_counter() - started
+
+    dog.close()
+    _print_report(mode, elapsed, dog, transport)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--modes", default="sync,batch,iter")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--per-host-limit", type=int, default=None)
+    parser.add_argument("--max-connections", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--jitter-ms", type=float, default=10)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    # failed fetches are counted in the report instead
+    logger.setLevel(logging.CRITICAL)
+    load_parsers()
+
+    pages = {}
+    urls = []
+    for page in iter_recorded_pages():
+        try:
+            pages[_sanitized_key(page.url)] = page.html
+        except UnsupportedProviderError:
+            continue
+        if route(page.url).job_id:
+            urls.append(page.url)
+    if not urls:
+        raise SystemExit("No servable pages found in the cassettes")
+    workload = unique_workload(pages, urls, args.requests)
+
+    server = create_server(
+        pages,
+        args.latency_ms,
+        args.jitter_ms,
+        args.error_rate,
+        args.rate_limit_rate,
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"Serving {len(pages)} pages on http://127.0.0.1:{server.server_port}")
+
+    try:
+        for mode in args.modes.split(","):
+            run(args, workload, server.server_port, mode.strip())
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Profile parsers over the HTML recorded in the test cassettes.
+
+Reports where parse time goes: per parser, per extractor (``_extract_*``
+method or spec field) and per selector, with selector hit rates and how deep
+extractors fall back.
+
+Usage: python scripts/profile_parsers.py [--repeat N] [--provider DOMAIN] [--top N]
+"""
+
+import argparse
+import logging
+
+from cassettes import iter_recorded_pages
+from jobdog.exceptions import UnsupportedProviderError
+from jobdog.logger import logger
+from jobdog.profiling import ParserProfiler
+from jobdog.providers.utils import PARSER_MAP, get_provider_domain, load_parsers
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20, help="parses per page")
+    parser.add_argument("--provider", help="only profile this provider domain")
+    parser.add_argument("--top", type=int, default=None, help="rows per table")
+    args = parser.parse_args()
+
+    logger.setLevel(logging.WARNING)
+    load_parsers()
+    # instances of our own, since profiling patches them
+    parsers = {domain: parser_class() for domain, parser_class in PARSER_MAP.items()}
+    for job_parser in parsers.values():
+        job_parser.setup()
+
+    profiler = ParserProfiler()
+    for page in iter_recorded_pages():
+        try:
+            domain = get_provider_domain(page.url)
+        except UnsupportedProviderError:
+            continue
+        if args.provider and domain != args.provider:
+            continue
+        for _ in range(args.repeat):
+            profiler.profile(parsers[domain], page.html)
+
+    if not profiler.pages:
+        raise SystemExit("No parseable pages found in the cassettes")
+    print(profiler.report(args.top))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Optional
+
+from httpx import Response
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    value: str
+    stored_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @property
+    def has_validators(self) -> bool:
+        return self.etag is not None or self.last_modified is not None
+
+    def conditional_headers(self) -> dict[str, str]:
+        headers = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class BaseCache(ABC):
+    """Key/value store for fetched pages, keyed by sanitized URL.
+
+    Entries younger than ``ttl`` seconds are served without touching the
+    network. Older entries carrying an ``ETag`` or ``Last-Modified`` are kept
+    and revalidated with a conditional request; older entries without either
+    are dropped. ``ttl=None`` means entries never go stale.
+    """
+
+    # whether calls wait on disk or network I/O; AsyncJobDog runs the calls
+    # of such caches in a thread so they do not stall the event loop
+    blocking: bool = True
+
+    def __init__(self, ttl: Optional[float] = None) -> None:
+        self.ttl = ttl
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[CacheEntry]:
+        pass
+
+    @abstractmethod
+    def set(self, key: str, entry: CacheEntry) -> None:
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        pass
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return self.ttl is None or time.time() - entry.stored_at < self.ttl
+
+    def lookup(self, key: str) -> Optional[CacheEntry]:
+        """Return the entry for ``key`` unless it is stale and unrevalidatable."""
+        entry = self.get(key)
+        if entry is None or self.is_fresh(entry) or entry.has_validators:
+            return entry
+        self.delete(key)
+        return None
+
+    def store_response(
+        self,
+        key: str,
+        response: Response,
+        previous: Optional[CacheEntry],
+        body: Optional[str] = None,
+    ) -> str:
+        """Store ``response`` under ``key`` and return the page body.
+
+        A ``304 Not Modified`` answer to a conditional request refreshes
+        ``previous`` and returns its body instead. Pass ``body`` for a
+        streamed response, whose content httpx does not keep.
+        """
+        if response.status_code == 304 and previous is not None:
+            self.set(key, replace(previous, stored_at=time.time()))
+            return previous.value
+
+        response.raise_for_status()
+        entry = CacheEntry(
+            value=response.text if body is None else body,
+            stored_at=time.time(),
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+        self.set(key, entry)
+        return entry.value
+
+
+class MemoryCache(BaseCache):
+    """In-process LRU cache holding at most ``max_entries`` entries."""
+
+    blocking = False
+
+    def __init__(self, max_entries: int = 1024, ttl: Optional[float] = None) -> None:
+        super().__init__(ttl)
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCache(BaseCache):
+    """On-disk cache in a single SQLite file, evicting least recently used
+    entries once it holds more than ``max_entries``."""
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: Optional[int] = None,
+        ttl: Optional[float] = None,
+    ) -> None:
+        super().__init__(ttl)
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    stored_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT
+                )
+                """
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS entries_accessed_at"
+                " ON entries (accessed_at)"
+            )
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT value, stored_at, etag, last_modified FROM entries"
+                " WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._connection.execute(
+                "UPDATE entries SET accessed_at = ? WHERE key = ?",
+                (time.time(), key),
+            )
+        return CacheEntry(*row)
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO entries"
+                " (key, value, stored_at, accessed_at, etag, last_modified)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    entry.value,
+                    entry.stored_at,
+                    time.time(),
+                    entry.etag,
+                    entry.last_modified,
+                ),
+            )
+            if self.max_entries is not None:
+                self._connection.execute(
+                    "DELETE FROM entries WHERE key IN ("
+                    " SELECT key FROM entries"
+                    " ORDER BY accessed_at DESC, rowid DESC"
+                    " LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._connection.execute(
+                "SELECT COUNT(*) FROM entries"
+            ).fetchone()
+        return count
@@ -0,0 +1,315 @@
+import argparse
+import glob
+import logging
+import os
+import sys
+import time
+from typing import IO, Iterable, Iterator, Optional, Sequence
+
+from jobdog.cache import SQLiteCache
+from jobdog.exceptions import FetchError
+from jobdog.jobdog import JobDog, PerHostLimit, batch_key
+from jobdog.logger import logger, warn
+from jobdog.sinks import BaseSink, Listing, NDJSONSink, ParquetSink
+
+DEFAULT_CHECKPOINT_EVERY = 1000
+
+
+def read_urls(
+    lines: Iterable[str],
+    done: Optional[set[str]] = None,
+    keys: Optional[dict[str, str]] = None,
+) -> Iterator[str]:
+    """URLs from ``lines``, skipping blank lines, ``#`` comments and URLs
+    whose ``batch_key`` is in ``done``. With ``keys``, URLs whose key was
+    read before are skipped too, and the key of each URL yielded is stored
+    in ``keys`` under the URL for the caller to pop."""
+    seen: set[str] = set()
+    for line in lines:
+        url = line.strip()
+        if not url or url.startswith("#"):
+            continue
+        if done or keys is not None:
+            key = batch_key(url)
+            if done and key in done or key in seen:
+                continue
+            if keys is not None:
+                seen.add(key)
+                keys[url] = key
+        yield url
+
+
+class Checkpoint:
+    """The ``batch_key`` of every URL fetched and written out, one per line
+    in an append-only file. Failed URLs are not recorded, so a rerun
+    retries them. Keys are staged with ``add`` and only written by
+    ``commit``, which the runner calls once the results are written out."""
+
+    def __init__(self, path: Optional[str]) -> None:
+        self.path = path
+        self.done: set[str] = set()
+        self._staged: list[str] = []
+        if path is not None and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.done.update(line.strip() for line in f if line.strip())
+
+    def add(self, key: str) -> None:
+        self._staged.append(key)
+
+    def commit(self) -> None:
+        if self.path is None or not self._staged:
+            self._staged.clear()
+            return
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.writelines(f"{key}\n" for key in self._staged)
+            f.flush()
+            os.fsync(f.fileno())
+        self.done.update(self._staged)
+        self._staged.clear()
+
+
+class ParquetPartsSink(BaseSink):
+    """Writes listings as ``part-NNNNN.parquet`` files in ``directory``. A
+    ``flush`` finishes the current part, so everything written so far stays
+    readable if the process dies later; a resumed run adds parts. Parts are
+    written under a temporary name and renamed once complete."""
+
+    def __init__(self, directory: str) -> None:
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self._part = len(glob.glob(os.path.join(directory, "part-*.parquet")))
+        self._sink: Optional[ParquetSink] = None
+        self._path = ""
+
+    def write(self, listing: Listing) -> None:
+        if self._sink is None:
+            self._path = os.path.join(self.directory, f"part-{self._part:05d}.parquet")
+            self._sink = ParquetSink(self._path + ".tmp")
+            self._part += 1
+        self._sink.write(listing)
+
+    def flush(self) -> None:
+        if self._sink is not None:
+            self._sink.close()
+            os.replace(self._path + ".tmp", self._path)
+            self._sink = None
+
+    def close(self) -> None:
+        self.flush()
+
+
+class Progress:
+    """Counts results and reports throughput to ``stream`` at most every
+    ``interval`` seconds, on one updating line when it is a terminal."""
+
+    def __init__(self, stream: IO[str], interval: float = 2.0) -> None:
+        self.stream = stream
+        self.interval = interval
+        self.ok = 0
+        self.failed = 0
+        self.started = self._reported = time.monotonic()
+        self._live = stream.isatty()
+
+    def add(self, ok: bool) -> None:
+        if ok:
+            self.ok += 1
+        else:
+            self.failed += 1
+        if self.interval and time.monotonic() - self._reported >= self.interval:
+            self.report()
+
+    def line(self) -> str:
+        elapsed = time.monotonic() - self.started
+        done = self.ok + self.failed
+        rate = done / elapsed if elapsed > 0 else 0.0
+        return (
+            f"{done} done, {self.ok} ok, {self.failed} failed,"
+            f" {rate:.1f}/s, {elapsed:.0f}s elapsed"
+        )
+
+    def report(self, final: bool = False) -> None:
+        self._reported = time.monotonic()
+        if self._live:
+            self.stream.write("\r\033[K" + self.line() + ("\n" if final else ""))
+        else:
+            self.stream.write(self.line() + "\n")
+        self.stream.flush()
+
+
+def _host_limit(value: str) -> tuple[str, int]:
+    domain, _, limit = value.partition("=")
+    if not limit:
+        raise argparse.ArgumentTypeError(f"Expected DOMAIN=N, got {value!r}")
+    return domain.strip(), _positive_int(limit)
+
+
+def _positive_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"Expected a positive integer, got {value!r}")
+    return number
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="jobdog",
+        description="Fetch and parse job listings for a list of URLs.",
+        epilog=(
+            "With --checkpoint, fetched URLs are recorded once their results"
+            " are written out, and a rerun with the same checkpoint skips them;"
+            " failed URLs are fetched again."
+            " Results written after the last checkpoint before a crash are"
+            " fetched and written again on resume."
+        ),
+    )
+    parser.add_argument(
+        "input",
+        nargs="?",
+        default="-",
+        help="file with one URL per line, or - for stdin (default)",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default="-",
+        help=(
+            "NDJSON file, or - for stdout (default); with --format parquet,"
+            " a directory of part files"
+        ),
+    )
+    parser.add_argument(
+        "--format",
+        choices=("ndjson", "parquet"),
+        help="output format (default: parquet if --output ends in .parquet)",
+    )
+    parser.add_argument(
+        "-w", "--workers", type=_positive_int, default=10, help="concurrent fetches"
+    )
+    limits = parser.add_mutually_exclusive_group()
+    limits.add_argument(
+        "--per-host-limit",
+        type=_positive_int,
+        help="concurrent fetches per provider",
+    )
+    limits.add_argument(
+        "--host-limit",
+        type=_host_limit,
+        action="append",
+        metavar="DOMAIN=N",
+        help="concurrent fetches for one provider domain; repeatable",
+    )
+    parser.add_argument("--cache", help="SQLite file to cache fetched pages in")
+    parser.add_argument(
+        "--cache-ttl", type=float, help="seconds before cached pages go stale"
+    )
+    parser.add_argument(
+        "--fields", help="comma-separated fields to extract (default: all)"
+    )
+    parser.add_argument("--timeout", type=float, default=30, help="seconds")
+    parser.add_argument("--max-retries", type=int, default=3)
+    parser.add_argument("--checkpoint", help="file recording fetched URLs")
+    parser.add_argument(
+        "--checkpoint-every",
+        type=_positive_int,
+        default=DEFAULT_CHECKPOINT_EVERY,
+        metavar="N",
+        help="flush output and checkpoint every N results",
+    )
+    parser.add_argument("--failed", help="file to append failed URLs to, one per line")
+    parser.add_argument(
+        "--progress-interval",
+        type=float,
+        default=2.0,
+        metavar="SECONDS",
+        help="how often to report progress on stderr; 0 to only report at the end",
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", help="log every fetch")
+    return parser
+
+
+def _open_sink(output: str, output_format: str, resume: bool) -> BaseSink:
+    if output_format == "parquet":
+        if output == "-":
+            raise SystemExit("Parquet output needs a directory, not stdout")
+        return ParquetPartsSink(output)
+    if output == "-":
+        return NDJSONSink(sys.stdout)
+    # a resumed run adds to the output of the interrupted one
+    return NDJSONSink(output, append=resume)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_arg_parser().parse_args(argv)
+    logger.setLevel(logging.INFO if args.verbose else logging.WARNING)
+
+    output_format = args.format or (
+        "parquet" if args.output.endswith(".parquet") else "ndjson"
+    )
+    per_host_limit: PerHostLimit = args.per_host_limit
+    if args.host_limit:
+        per_host_limit = dict(args.host_limit)
+    fields = (
+        [field.strip() for field in args.fields.split(",")] if args.fields else None
+    )
+
+    checkpoint = Checkpoint(args.checkpoint)
+    input_file = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    sink = _open_sink(args.output, output_format, resume=bool(checkpoint.done))
+    failed_file = open(args.failed, "a", encoding="utf-8") if args.failed else None
+    cache = SQLiteCache(args.cache, ttl=args.cache_ttl) if args.cache else None
+    progress = Progress(sys.stderr, args.progress_interval)
+
+    def commit() -> None:
+        # results first, so the checkpoint never covers unwritten listings
+        sink.flush()
+        if failed_file is not None:
+            failed_file.flush()
+        checkpoint.commit()
+
+    exit_code = 0
+    try:
+        with JobDog(
+            cache=cache, timeout=args.timeout, max_retries=args.max_retries
+        ) as dog:
+            # read_urls dedupes, as it works out the keys for the checkpoint
+            # anyway
+            keys: dict[str, str] = {}
+            results = dog.iter_details(
+                read_urls(input_file, checkpoint.done, keys),
+                max_concurrency=args.workers,
+                per_host_limit=per_host_limit,
+                fields=fields,
+            )
+            for url, result in results:
+                key = keys.pop(url)
+                # failures are already logged by JobDog
+                if isinstance(result, FetchError):
+                    if failed_file is not None:
+                        failed_file.write(url + "\n")
+                else:
+                    sink.write(result)
+                    checkpoint.add(key)
+                progress.add(not isinstance(result, FetchError))
+                if (progress.ok + progress.failed) % args.checkpoint_every == 0:
+                    commit()
+    except KeyboardInterrupt:
+        warn("Interrupted, saving progress")
+        exit_code = 130
+    finally:
+        commit()
+        sink.close()
+        if failed_file is not None:
+            failed_file.close()
+        if input_file is not sys.stdin:
+            input_file.close()
+        if cache is not None:
+            cache.close()
+        progress.report(final=True)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
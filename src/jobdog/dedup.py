@@ -0,0 +1,207 @@
+import json
+import os
+import re
+import threading
+from bisect import bisect_left
+from html import unescape
+from itertools import repeat
+from operator import rshift
+from typing import Any, Iterator, Optional, Union
+from zlib import crc32
+
+from jobdog.models.compact_job_listing import CompactJobListing
+from jobdog.models.job_listing import JobListing
+from jobdog.providers.text import html_to_text
+
+Listing = Union[JobListing, CompactJobListing]
+
+WORD_RE = re.compile(r"\w+")
+# words per shingle
+SHINGLE_SIZE = 3
+# added to a borrowed value per bin skipped, so densified bins rarely collide
+_DENSIFY_OFFSET = 0x278DDE6D
+_MAX_HASH = 1 << 30
+
+
+def normalize_text(text: str) -> list[str]:
+    """Lowercased words of ``text`` with markup and punctuation dropped."""
+    if "<" in text:
+        text = html_to_text(text)
+    elif "&" in text:
+        text = unescape(text)
+    return WORD_RE.findall(text.lower())
+
+
+def listing_text(listing: Listing) -> str:
+    return " ".join(
+        getattr(listing, name, None) or ""
+        for name in ("job_title", "company_name", "job_description")
+    )
+
+
+def minhash(words: list[str], num_perm: int = 64) -> tuple[int, ...]:
+    """MinHash signature of the word shingles of ``words``.
+
+    Uses one-permutation hashing: every shingle is hashed once with CRC32
+    (kept to 30 bits), the hash range is split into ``num_perm`` bins and
+    each bin keeps its smallest hash, found by bisecting the sorted hashes.
+    Empty bins (short texts) borrow from the next non-empty bin. The
+    per-shingle work all happens in C, which keeps a signature well under a
+    millisecond.
+    """
+    if len(words) < SHINGLE_SIZE:
+        shingles = [" ".join(words)]
+    else:
+        shingles = map(" ".join, zip(*(words[i:] for i in range(SHINGLE_SIZE))))
+    # 30-bit hashes are single-digit ints, which sort about twice as fast
+    hashes = sorted(set(map(rshift, map(crc32, map(str.encode, shingles)), repeat(2))))
+
+    bounds = [-(-(index * _MAX_HASH) // num_perm) for index in range(num_perm + 1)]
+    bins = []
+    for index in range(num_perm):
+        position = bisect_left(hashes, bounds[index])
+        if position < len(hashes) and hashes[position] < bounds[index + 1]:
+            bins.append(hashes[position])
+        else:
+            bins.append(None)
+
+    for index, value in enumerate(bins):
+        distance = 1
+        while value is None:
+            value = bins[(index + distance) % num_perm]
+            distance += 1
+            if value is not None:
+                value = (value + (distance - 1) * _DENSIFY_OFFSET) % _MAX_HASH
+        bins[index] = value
+    return tuple(bins)
+
+
+def similarity(first: tuple[int, ...], second: tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of the texts behind two signatures."""
+    return sum(a == b for a, b in zip(first, second)) / len(first)
+
+
+class NearDuplicateIndex:
+    """Finds listings whose title, company and description are near
+    duplicates of one seen before, e.g. the same job posted on several
+    boards with slightly different text.
+
+    Signatures are split into ``bands`` bands; listings that agree on all
+    values of any band are candidates, and a candidate whose estimated
+    similarity reaches ``threshold`` is a duplicate. Lookups only touch
+    the candidates, so they stay fast however large the index grows.
+    """
+
+    def __init__(
+        self, num_perm: int = 64, bands: int = 16, threshold: float = 0.8
+    ) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.threshold = threshold
+        self._rows = num_perm // bands
+        self._signatures: dict[str, tuple[int, ...]] = {}
+        self._buckets: list[dict[tuple[int, ...], list[str]]] = [
+            {} for _ in range(bands)
+        ]
+        self._lock = threading.Lock()
+
+    def signature(self, listing: Listing) -> tuple[int, ...]:
+        return minhash(normalize_text(listing_text(listing)), self.num_perm)
+
+    def _band_keys(self, signature: tuple[int, ...]) -> Iterator[tuple[int, ...]]:
+        for band in range(self.bands):
+            yield signature[band * self._rows : (band + 1) * self._rows]
+
+    def _query(self, signature: tuple[int, ...]) -> Optional[str]:
+        best_key, best_similarity = None, self.threshold
+        checked = set()
+        for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+            for key in buckets.get(band_key, ()):
+                if key in checked:
+                    continue
+                checked.add(key)
+                score = similarity(signature, self._signatures[key])
+                if score >= best_similarity:
+                    best_key, best_similarity = key, score
+        return best_key
+
+    def _add(self, key: str, signature: tuple[int, ...]) -> None:
+        if key in self._signatures:
+            self._remove(key)
+        self._signatures[key] = signature
+        for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+            buckets.setdefault(band_key, []).append(key)
+
+    def _remove(self, key: str) -> None:
+        signature = self._signatures.pop(key)
+        for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+            bucket = buckets[band_key]
+            bucket.remove(key)
+            if not bucket:
+                del buckets[band_key]
+
+    def query(self, listing: Listing) -> Optional[str]:
+        """Return the key of the most similar listing at or above
+        ``threshold``, if any."""
+        signature = self.signature(listing)
+        with self._lock:
+            return self._query(signature)
+
+    def add(self, key: str, listing: Listing) -> None:
+        """Index ``listing`` under ``key``, replacing what ``key`` held."""
+        signature = self.signature(listing)
+        with self._lock:
+            self._add(key, signature)
+
+    def find_or_add(self, key: str, listing: Listing) -> Optional[str]:
+        """Return the key of a near duplicate of ``listing`` if one is
+        indexed, otherwise index ``listing`` under ``key`` and return
+        ``None``."""
+        signature = self.signature(listing)
+        with self._lock:
+            duplicate = self._query(signature)
+            if duplicate is None:
+                self._add(key, signature)
+            return duplicate
+
+    def remove(self, key: str) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._signatures
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def to_dict(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "num_perm": self.num_perm,
+                "bands": self.bands,
+                "threshold": self.threshold,
+                "signatures": {
+                    key: list(signature) for key, signature in self._signatures.items()
+                },
+            }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "NearDuplicateIndex":
+        index = cls(data["num_perm"], data["bands"], data["threshold"])
+        for key, signature in data["signatures"].items():
+            index._add(key, tuple(signature))
+        return index
+
+    def save(self, path: Union[str, os.PathLike]) -> None:
+        """Write the index to ``path`` as JSON, replacing the file atomically."""
+        tmp_path = f"{os.fspath(path)}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Union[str, os.PathLike]) -> "NearDuplicateIndex":
+        with open(path, encoding="utf-8") as file:
+            return cls.from_dict(json.load(file))
@@ -1,6 +1,15 @@
 import random
 from typing import Optional
-from httpx import Client
+from httpx import (
+    AsyncBaseTransport,
+    AsyncClient,
+    AsyncHTTPTransport,
+    BaseTransport,
+    Client,
+    HTTPTransport,
+    Limits,
+    Timeout,
+)
 
 
 USER_AGENTS = [
@@ -10,24 +19,93 @@ USER_AGENTS = [
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/18.1 Safari/605.1.1",
 ]
 
+# Same as httpx's own defaults.
+DEFAULT_LIMITS = Limits(max_connections=100, max_keepalive_connections=20)
+
 
 def _get_random_user_agent() -> str:
     return random.choice(USER_AGENTS)
 
 
+def _get_default_headers(headers: Optional[dict[str, str]]) -> dict[str, str]:
+    default_headers = dict(headers or {})
+    if "User-Agent" not in default_headers:
+        default_headers["User-Agent"] = _get_random_user_agent()
+    return default_headers
+
+
+def _get_timeout(
+    timeout: float, connect_timeout: Optional[float], read_timeout: Optional[float]
+) -> Timeout:
+    return Timeout(
+        timeout,
+        connect=timeout if connect_timeout is None else connect_timeout,
+        read=timeout if read_timeout is None else read_timeout,
+    )
+
+
+def _get_provider_mounts(
+    mounts: Optional[dict[str, BaseTransport]],
+    provider_limits: Optional[dict[str, Limits]],
+    transport_class: type,
+    http2: bool,
+) -> Optional[dict]:
+    if not provider_limits:
+        return mounts
+    # A transport per provider gives every host its own connection pool, so
+    # a busy provider cannot use up the connections meant for the others.
+    provider_mounts = {
+        f"all://*{domain}": transport_class(limits=limits, http2=http2)
+        for domain, limits in provider_limits.items()
+    }
+    return {**provider_mounts, **(mounts or {})}
+
+
 def create_default_client(
-    mounts: Optional[dict[str, str]] = None,
+    mounts: Optional[dict[str, BaseTransport]] = None,
     headers: Optional[dict[str, str]] = None,
-    timeout: int = 30,
+    timeout: float = 30,
+    connect_timeout: Optional[float] = None,
+    read_timeout: Optional[float] = None,
+    limits: Optional[Limits] = None,
+    http2: bool = False,
+    provider_limits: Optional[dict[str, Limits]] = None,
 ) -> Client:
-    default_headers = headers or {}
-    if "User-Agent" not in default_headers:
-        default_headers["User-Agent"] = _get_random_user_agent()
+    """Create the ``httpx.Client`` JobDog uses by default.
 
+    ``limits`` sets pool size and keep-alive expiry for the client, while
+    ``provider_limits`` maps a provider domain (e.g. ``"greenhouse.io"``) to
+    the limits of a dedicated pool for that host and its subdomains.
+    ``http2=True`` needs the ``h2`` package (``pip install httpx[http2]``).
+    """
     return Client(
-        mounts=mounts,
-        headers=default_headers,
-        timeout=timeout,
+        mounts=_get_provider_mounts(mounts, provider_limits, HTTPTransport, http2),
+        headers=_get_default_headers(headers),
+        timeout=_get_timeout(timeout, connect_timeout, read_timeout),
+        limits=limits or DEFAULT_LIMITS,
+        http2=http2,
+    )
+
+
+def create_default_async_client(
+    mounts: Optional[dict[str, AsyncBaseTransport]] = None,
+    headers: Optional[dict[str, str]] = None,
+    timeout: float = 30,
+    connect_timeout: Optional[float] = None,
+    read_timeout: Optional[float] = None,
+    limits: Optional[Limits] = None,
+    http2: bool = False,
+    provider_limits: Optional[dict[str, Limits]] = None,
+) -> AsyncClient:
+    """Async counterpart of ``create_default_client``, taking the same options."""
+    # AsyncClient is bound to the event loop it is first used on, so unlike
+    # the sync client there is no shared module-level instance.
+    return AsyncClient(
+        mounts=_get_provider_mounts(mounts, provider_limits, AsyncHTTPTransport, http2),
+        headers=_get_default_headers(headers),
+        timeout=_get_timeout(timeout, connect_timeout, read_timeout),
+        limits=limits or DEFAULT_LIMITS,
+        http2=http2,
     )
 
 
@@ -1,43 +1,672 @@
-from typing import Optional, Dict
-from httpx import Client
-from jobdog.exceptions import FetchError
+import asyncio
+import hashlib
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from contextlib import aclosing
+from itertools import count
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Collection,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Optional,
+    Dict,
+    TypeVar,
+    Union,
+)
+from httpx import AsyncClient, BaseTransport, Client, Limits, Response
+from jobdog import metrics
+from jobdog.cache import BaseCache, CacheEntry
+from jobdog.exceptions import (
+    FetchError,
+    JobDogSanitizeUrlError,
+    UnsupportedProviderError,
+)
 from jobdog.logger import logger
 from jobdog.models.job_listing import JobListing
-from jobdog.providers.utils import get_parser
+from jobdog.parse_pool import listing_from_dict, parse_html_in_worker, run_parser
+from jobdog.providers.utils import get_parser, get_provider_domain, route
+from jobdog.rate_limit import RateLimiters, get_retry_delay
+from jobdog.streaming import DEFAULT_MAX_BODY_BYTES, FieldScanner
 from jobdog.providers.base import BaseParser
-from jobdog.http_client import sync_http_client
+from jobdog.http_client import create_default_async_client, create_default_client
+
+PerHostLimit = Optional[Union[int, Dict[str, int]]]
+# answers that mean the listing was taken down
+GONE_STATUS_CODES = frozenset({404, 410})
+# the parser of a URL and the URL sanitized by it
+Resolved = tuple[BaseParser, str]
+T = TypeVar("T")
+
+
+class Revalidation(NamedTuple):
+    """Outcome of ``JobDog.revalidate``. ``listing`` is only set when the
+    page was fetched again, not for a ``304`` or a listing that is gone."""
+
+    status_code: int
+    listing: Optional[JobListing] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+class _HostLimits:
+    """Looks up the cap on concurrent fetches of a URL's provider.
+
+    ``per_host_limit`` is either a cap applied to every provider or a mapping
+    of provider domain (as registered with ``register_parser``) to its cap.
+    Providers without a cap are not limited; a cap below 1 is a
+    ``ValueError``, as nothing could ever be fetched from that provider.
+    """
+
+    def __init__(self, per_host_limit: PerHostLimit):
+        if isinstance(per_host_limit, int):
+            limits = [per_host_limit]
+        else:
+            limits = list((per_host_limit or {}).values())
+        if any(limit < 1 for limit in limits):
+            raise ValueError(
+                f"per_host_limit must be at least 1, got {per_host_limit!r}"
+            )
+        self.per_host_limit = per_host_limit
+
+    def limit(self, url: str) -> tuple[Optional[str], Optional[int]]:
+        """Provider domain of ``url`` and its cap, if it has one."""
+        if self.per_host_limit is None:
+            return None, None
+        try:
+            domain = get_provider_domain(url)
+        except UnsupportedProviderError:
+            # fetch_details reports this as a FetchError for the URL
+            return None, None
+        if isinstance(self.per_host_limit, int):
+            return domain, self.per_host_limit
+        return domain, self.per_host_limit.get(domain)
+
+
+class _HostQueue:
+    """Orders batch work so that no provider exceeds its ``per_host_limit``.
+
+    Work for a provider at its cap is held back here instead of in a pool
+    worker blocked on a semaphore, so workers stay free for other providers.
+    ``add`` queues an item, ``pop`` returns the next one that may start and
+    ``finished`` frees the provider's slot once an item's fetch is done.
+    """
+
+    def __init__(self, per_host_limit: PerHostLimit) -> None:
+        self.host_limits = _HostLimits(per_host_limit)
+        self.ready: deque = deque()
+        self.waiting: dict[str, deque] = {}
+        self.running: Counter = Counter()
+        # items in ``waiting``
+        self.held = 0
+
+    def add(self, url: str, item) -> None:
+        domain, limit = self.host_limits.limit(url)
+        if limit is None:
+            self.ready.append(item)
+        elif self.running[domain] < limit:
+            self.running[domain] += 1
+            self.ready.append(item)
+        else:
+            self.waiting.setdefault(domain, deque()).append(item)
+            self.held += 1
+
+    def pop(self):
+        return self.ready.popleft() if self.ready else None
+
+    def finished(self, url: str) -> None:
+        domain, limit = self.host_limits.limit(url)
+        if limit is None:
+            return
+        waiting = self.waiting.get(domain)
+        if waiting:
+            # hand the slot straight to the next item of the provider
+            self.ready.append(waiting.popleft())
+            self.held -= 1
+        else:
+            self.running[domain] -= 1
+
+
+def _parse_cache_key(parser: BaseParser, html: str) -> str:
+    parser_class = type(parser)
+    digest = hashlib.sha256(html.encode()).hexdigest()
+    return (
+        f"{parser_class.__module__}.{parser_class.__qualname__}"
+        f":{parser_class.version}:{digest}"
+    )
+
+
+def _load_parsed(
+    parse_cache: Optional[BaseCache], parser: BaseParser, html: str
+) -> tuple[Optional[str], Optional[JobListing]]:
+    if parse_cache is None:
+        return None, None
+    key = _parse_cache_key(parser, html)
+    entry = parse_cache.lookup(key)
+    if entry is None:
+        return key, None
+    return key, JobListing.model_validate_json(entry.value)
+
+
+def _store_parsed(
+    parse_cache: Optional[BaseCache], key: Optional[str], job_details: JobListing
+) -> None:
+    if parse_cache is not None:
+        parse_cache.set(key, CacheEntry(job_details.model_dump_json(), time.time()))
+
+
+async def _call_cache(
+    cache: Optional[BaseCache], function: Callable[..., T], *args
+) -> T:
+    """``function(*args)``, run in a thread if it works with a blocking
+    ``cache``."""
+    if cache is not None and cache.blocking:
+        return await asyncio.to_thread(function, *args)
+    return function(*args)
+
+
+def _body_limit_reached(
+    url: str, response: Response, max_body_bytes: Optional[int]
+) -> bool:
+    if max_body_bytes is None or response.num_bytes_downloaded < max_body_bytes:
+        return False
+    logger.warning(
+        "Stopped reading %s after %s bytes", url, response.num_bytes_downloaded
+    )
+    return True
+
+
+def _provider_tag(url: str) -> Optional[str]:
+    """Provider domain of ``url`` for metric tags, looked up only while
+    instrumentation is enabled."""
+    if not metrics.enabled():
+        return None
+    try:
+        return get_provider_domain(url)
+    except UnsupportedProviderError:
+        return "unsupported"
+
+
+def dedupe_key(url: str, sanitized_url: str) -> str:
+    """Key shared by the URL variants of one listing: the provider domain and
+    job ID when the parser's ``url_patterns`` find one, so e.g. ``boards``
+    and ``job-boards`` Greenhouse URLs match, else the sanitized URL."""
+    try:
+        url_route = route(url)
+    except UnsupportedProviderError:
+        return sanitized_url
+    if url_route.job_id:
+        return f"{url_route.domain}:{url_route.job_id}"
+    return sanitized_url
+
+
+def _resolve(url: str) -> Optional[Resolved]:
+    """Parser and sanitized form of ``url``, or None if it is unsupported or
+    cannot be sanitized; fetching it then reports the error."""
+    try:
+        parser = get_parser(url)
+        return parser, parser.sanitize_url(url)
+    except (UnsupportedProviderError, JobDogSanitizeUrlError):
+        return None
+
+
+def _batch_entry(url: str) -> tuple[str, Optional[Resolved]]:
+    resolved = _resolve(url)
+    if resolved is None:
+        return url, None
+    return dedupe_key(url, resolved[1]), resolved
+
+
+def batch_key(url: str) -> str:
+    """``dedupe_key`` of ``url``, or ``url`` itself if it cannot be
+    sanitized; fetching it then reports the error."""
+    return _batch_entry(url)[0]
+
+
+def _dedupe_batch(
+    urls: Iterable[str],
+) -> tuple[list[str], dict[str, tuple[str, Optional[Resolved]]]]:
+    """Return the ``batch_key`` of each URL, and the first URL per key with
+    its parser and sanitized URL."""
+    keys = []
+    unique_urls: dict[str, tuple[str, Optional[Resolved]]] = {}
+    for url in urls:
+        key, resolved = _batch_entry(url)
+        keys.append(key)
+        if key not in unique_urls:
+            unique_urls[key] = (url, resolved)
+    return keys, unique_urls
+
+
+def _fields_key(fields: Optional[Collection[str]]) -> Optional[frozenset]:
+    return None if fields is None else frozenset(fields)
+
+
+async def _aiter_sync(urls: Iterable[str]) -> AsyncIterator[str]:
+    for url in urls:
+        yield url
 
 
 class JobDog:
     def __init__(
         self,
         http_client: Optional[Client] = None,
+        cache: Optional[BaseCache] = None,
+        parse_cache: Optional[BaseCache] = None,
+        parse_executor: Optional[Executor] = None,
+        timeout: float = 30,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        limits: Optional[Limits] = None,
+        http2: bool = False,
+        provider_limits: Optional[Dict[str, Limits]] = None,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 60,
+        stream: bool = False,
+        max_body_bytes: Optional[int] = DEFAULT_MAX_BODY_BYTES,
     ) -> None:
-        self.http_client = http_client or sync_http_client
+        self.mounts: Optional[Dict[str, BaseTransport]] = None
+        self.headers: Dict[str, str] = {}
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.limits = limits
+        self.http2 = http2
+        self.provider_limits = provider_limits
+        # a client passed in is the caller's to configure and close
+        self._owns_client = http_client is None
+        self.http_client = http_client or self._create_http_client()
+        self.cache = cache
+        self.parse_cache = parse_cache
+        self.parse_executor = parse_executor
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.stream = stream
+        self.max_body_bytes = max_body_bytes
+        self.rate_limiters = RateLimiters()
+        self._in_flight: dict[tuple, Future] = {}
+        self._in_flight_lock = threading.Lock()
+
+    def _create_http_client(self) -> Client:
+        return create_default_client(
+            mounts=self.mounts,
+            headers=self.headers,
+            timeout=self.timeout,
+            connect_timeout=self.connect_timeout,
+            read_timeout=self.read_timeout,
+            limits=self.limits,
+            http2=self.http2,
+            provider_limits=self.provider_limits,
+        )
+
+    def fetch_details(
+        self, url: str, fields: Optional[Collection[str]] = None
+    ) -> JobListing:
+        """Fetch and parse the listing at ``url``.
+
+        Pass ``fields`` to extract only those ``JobListing`` fields, which
+        skips the work for the others; fields that are not requested are
+        ``None`` on the result, required ones included.
+        """
+        return self._fetch_resolved(url, None, fields)
+
+    def revalidate(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> Revalidation:
+        """Conditionally fetch the listing at ``url`` again, given the
+        ``ETag``/``Last-Modified`` validators of the previous fetch.
 
-    def fetch_details(self, url: str) -> JobListing:
+        An unchanged page (``304``) or a listing that was taken down
+        (``404``/``410``) comes back as its status code; a changed page is
+        parsed, with its new validators. ``cache`` is bypassed, as the
+        validators are the caller's. Any other failure raises ``FetchError``.
+        """
+        with metrics.span("revalidate", provider=_provider_tag(url)):
+            try:
+                parser = get_parser(url)
+                sanitized_url = parser.sanitize_url(url)
+                headers = {}
+                if etag is not None:
+                    headers["If-None-Match"] = etag
+                if last_modified is not None:
+                    headers["If-Modified-Since"] = last_modified
+                response = self._request(sanitized_url, headers=headers)
+                if response.status_code == 304 or (
+                    response.status_code in GONE_STATUS_CODES
+                ):
+                    return Revalidation(response.status_code)
+                response.raise_for_status()
+                listing = self._parse_html(url, parser, response.text)
+                listing.job_listing_url = sanitized_url
+                return Revalidation(
+                    response.status_code,
+                    listing,
+                    response.headers.get("ETag"),
+                    response.headers.get("Last-Modified"),
+                )
+            except Exception as e:
+                logger.error("Error revalidating %s: %s", url, e)
+                raise FetchError(f"Failed to revalidate URL: {url}. Error: {str(e)}")
+
+    def _fetch_resolved(
+        self,
+        url: str,
+        resolved: Optional[Resolved],
+        fields: Optional[Collection[str]] = None,
+    ) -> JobListing:
+        """``fetch_details``, with the parser and sanitized URL when a batch
+        has looked them up already."""
+        with metrics.span("fetch_details", provider=_provider_tag(url)):
+            try:
+                logger.info("Fetching details for %s", url)
+                if resolved is None:
+                    with metrics.span("get_parser"):
+                        parser: BaseParser = get_parser(url)
+                    with metrics.span("sanitize_url"):
+                        sanitized_url = parser.sanitize_url(url)
+                else:
+                    parser, sanitized_url = resolved
+                key = (dedupe_key(url, sanitized_url), _fields_key(fields))
+                with self._in_flight_lock:
+                    in_flight = self._in_flight.get(key)
+                    if in_flight is None:
+                        future = self._in_flight[key] = Future()
+                if in_flight is not None:
+                    logger.debug("Joining in-flight fetch of %s", sanitized_url)
+                    metrics.increment("coalesced_fetches")
+                    return in_flight.result()
+
+                try:
+                    job_details = self._fetch_details(
+                        url, parser, sanitized_url, fields
+                    )
+                    future.set_result(job_details)
+                    return job_details
+                except BaseException as e:
+                    future.set_exception(e)
+                    raise
+                finally:
+                    with self._in_flight_lock:
+                        del self._in_flight[key]
+            except Exception as e:
+                logger.error("Error fetching %s: %s", url, e)
+                raise FetchError(f"Failed to fetch URL: {url}. Error: {str(e)}")
+
+    def _fetch_details(
+        self,
+        url: str,
+        parser: BaseParser,
+        sanitized_url: str,
+        fields: Optional[Collection[str]],
+    ) -> JobListing:
+        html = self._get_html(sanitized_url, parser, fields)
+        job_details = self._parse_html(url, parser, html, fields)
+        job_details.job_listing_url = sanitized_url
+        return job_details
+
+    def _get_html(
+        self,
+        url: str,
+        parser: BaseParser,
+        fields: Optional[Collection[str]] = None,
+    ) -> str:
+        if self.stream:
+            return self._stream_html(url, parser, fields)
+        if self.cache is None:
+            response = self._request(url)
+            response.raise_for_status()
+            return response.text
+
+        entry = self.cache.lookup(url)
+        if entry is not None and self.cache.is_fresh(entry):
+            logger.debug("Cache hit for %s", url)
+            metrics.increment("cache_hits")
+            return entry.value
+        headers = entry.conditional_headers() if entry else {}
+        response = self._request(url, headers=headers)
+        return self.cache.store_response(url, response, entry)
+
+    def _stream_html(
+        self, url: str, parser: BaseParser, fields: Optional[Collection[str]]
+    ) -> str:
+        """Download the page at ``url`` chunk by chunk and stop as soon as it
+        holds the wanted fields, or after ``max_body_bytes``. Only pages read
+        to the end are cached."""
+        entry = self.cache.lookup(url) if self.cache is not None else None
+        if entry is not None and self.cache.is_fresh(entry):
+            logger.debug("Cache hit for %s", url)
+            metrics.increment("cache_hits")
+            return entry.value
+        headers = entry.conditional_headers() if entry else {}
+
+        scanner = FieldScanner(parser.stream_markers, fields)
+        response = self._request(url, stream=True, headers=headers)
         try:
-            logger.info(f"Fetching details for {url}")
-            parser: BaseParser = get_parser(url)
-            sanitized_url = parser.sanitize_url(url)
-            response = self.http_client.get(sanitized_url)
+            if response.status_code == 304 and entry is not None:
+                return self.cache.store_response(url, response, entry)
             response.raise_for_status()
-            job_details: JobListing = parser.parse_html(response.text)
-            job_details.job_listing_url = sanitized_url
+            for chunk in response.iter_text():
+                if scanner.feed(chunk) or _body_limit_reached(
+                    url, response, self.max_body_bytes
+                ):
+                    return scanner.html
+        finally:
+            response.close()
+
+        if self.cache is not None:
+            self.cache.store_response(url, response, entry, body=scanner.html)
+        return scanner.html
+
+    def _request(self, url: str, stream: bool = False, **kwargs) -> Response:
+        bucket = self.rate_limiters.get(url)
+        extensions = kwargs.get("extensions") or {}
+        for attempt in count():
+            if bucket:
+                bucket.acquire()
+            if metrics.enabled():
+                trace = metrics.HttpTrace(extensions.get("trace"))
+                kwargs["extensions"] = {**extensions, "trace": trace}
+            with metrics.span("http_request") as request_span:
+                if stream:
+                    request = self.http_client.build_request("GET", url, **kwargs)
+                    response = self.http_client.send(request, stream=True)
+                else:
+                    response = self.http_client.get(url, **kwargs)
+                request_span.set_tag("status", response.status_code)
+            delay = get_retry_delay(
+                response,
+                attempt,
+                self.max_retries,
+                self.backoff_factor,
+                self.max_backoff,
+            )
+            if delay is None:
+                return response
+            logger.warning(
+                "Got %s for %s, retrying in %.1fs", response.status_code, url, delay
+            )
+            metrics.increment("retries", status=response.status_code)
+            response.close()
+            if bucket:
+                bucket.pause(delay)
+            time.sleep(delay)
+
+    def _parse_html(
+        self,
+        url: str,
+        parser: BaseParser,
+        html: str,
+        fields: Optional[Collection[str]] = None,
+    ) -> JobListing:
+        # partial listings are not memoized
+        parse_cache = self.parse_cache if fields is None else None
+        key, job_details = _load_parsed(parse_cache, parser, html)
+        if job_details is not None:
+            metrics.increment("parse_cache_hits")
             return job_details
-        except Exception as e:
-            logger.error(f"Error fetching {url}: {str(e)}")
-            raise FetchError(f"Failed to fetch URL: {url}. Error: {str(e)}")
 
-    def set_mounts(self, mounts: Dict[str, str]) -> None:
+        with metrics.span("parse_html"):
+            if self.parse_executor is None:
+                job_details = run_parser(parser, html, fields)
+            else:
+                future = self.parse_executor.submit(
+                    parse_html_in_worker, get_provider_domain(url), html, fields
+                )
+                job_details = listing_from_dict(future.result(), fields)
+        _store_parsed(parse_cache, key, job_details)
+        return job_details
+
+    def fetch_many(
+        self,
+        urls: Iterable[str],
+        max_concurrency: int = 10,
+        per_host_limit: PerHostLimit = None,
+        fields: Optional[Collection[str]] = None,
+    ) -> list[Union[JobListing, FetchError]]:
+        """Fetch many listings concurrently on a thread pool.
+
+        Results are returned in input order. A URL that fails yields its
+        ``FetchError`` in place of a listing instead of aborting the batch.
+        URLs that are variants of the same listing (see ``dedupe_key``) are
+        fetched once and share the result.
+        """
+        keys, unique_urls = _dedupe_batch(urls)
+        results = dict(
+            self._run_batch(
+                iter(unique_urls.values()), max_concurrency, per_host_limit, fields
+            )
+        )
+        return [results[unique_urls[key][0]] for key in keys]
+
+    def iter_details(
+        self,
+        urls: Iterable[str],
+        max_concurrency: int = 10,
+        per_host_limit: PerHostLimit = None,
+        fields: Optional[Collection[str]] = None,
+        dedupe: bool = False,
+    ) -> Iterator[tuple[str, Union[JobListing, FetchError]]]:
+        """Yield ``(url, listing or FetchError)`` pairs as fetches complete.
+
+        ``urls`` is consumed lazily and at most ``max_concurrency`` fetches
+        are in flight. Results are yielded in completion order, not input
+        order. Memory stays flat however long the input is. With ``dedupe``,
+        a URL that is a variant of one seen before (see ``dedupe_key``) is
+        skipped, which means remembering the key of every listing fetched so
+        far.
+        """
+
+        def entries() -> Iterator[tuple[str, Optional[Resolved]]]:
+            seen: set[str] = set()
+            for url in urls:
+                if not dedupe:
+                    yield url, _resolve(url)
+                    continue
+                key, resolved = _batch_entry(url)
+                if key not in seen:
+                    seen.add(key)
+                    yield url, resolved
+
+        yield from self._run_batch(entries(), max_concurrency, per_host_limit, fields)
+
+    def _run_batch(
+        self,
+        entries: Iterator[tuple[str, Optional[Resolved]]],
+        max_concurrency: int,
+        per_host_limit: PerHostLimit,
+        fields: Optional[Collection[str]],
+    ) -> Iterator[tuple[str, Union[JobListing, FetchError]]]:
+        """Fetch ``(url, resolved)`` entries on a thread pool and yield
+        ``(url, listing or FetchError)`` as they complete.
+
+        Entries are read lazily: at most ``max_concurrency`` fetches run at
+        once, and at most as many entries more are held back for providers
+        at their ``per_host_limit``.
+        """
+        host_queue = _HostQueue(per_host_limit)
+        running: dict[Future, str] = {}
+        exhausted = False
+
+        def submit() -> None:
+            nonlocal exhausted
+            while len(running) < max_concurrency:
+                entry = host_queue.pop()
+                if entry is None:
+                    if exhausted or host_queue.held >= max_concurrency:
+                        return
+                    entry = next(entries, None)
+                    if entry is None:
+                        exhausted = True
+                        return
+                    host_queue.add(entry[0], entry)
+                    continue
+                url, resolved = entry
+                future = executor.submit(self._fetch_or_error, url, resolved, fields)
+                running[future] = url
+
+        executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        try:
+            submit()
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                completed = []
+                for future in done:
+                    url = running.pop(future)
+                    host_queue.finished(url)
+                    completed.append((url, future.result()))
+                # top up before yielding so the pool keeps working while the
+                # caller handles the results
+                submit()
+                yield from completed
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+    def _fetch_or_error(
+        self,
+        url: str,
+        resolved: Optional[Resolved],
+        fields: Optional[Collection[str]] = None,
+    ) -> Union[JobListing, FetchError]:
+        try:
+            return self._fetch_resolved(url, resolved, fields)
+        except FetchError as e:
+            return e
+
+    def set_mounts(self, mounts: Dict[str, BaseTransport]) -> None:
+        """Rebuild the client with ``mounts``, closing the old one. Not
+        possible for a client passed in as ``http_client``: mount the
+        transports on that client instead."""
+        if not self._owns_client:
+            raise ValueError(
+                "set_mounts cannot rebuild an http_client passed to JobDog;"
+                " pass mounts to that client instead"
+            )
         self.mounts = mounts
+        old_client = self.http_client
         self.http_client = self._create_http_client()
+        old_client.close()
 
     def set_headers(self, headers: Dict[str, str]) -> None:
         self.headers.update(headers)
         self.http_client.headers.update(headers)
 
-    def set_timeout(self, timeout: int) -> None:
+    def set_timeout(self, timeout: float) -> None:
         self.timeout = timeout
         self.http_client.timeout = timeout
 
@@ -52,3 +681,369 @@ class JobDog:
 
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:
         self.close()
+
+
+class AsyncJobDog:
+    def __init__(
+        self,
+        http_client: Optional[AsyncClient] = None,
+        cache: Optional[BaseCache] = None,
+        parse_cache: Optional[BaseCache] = None,
+        parse_executor: Optional[Executor] = None,
+        timeout: float = 30,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        limits: Optional[Limits] = None,
+        http2: bool = False,
+        provider_limits: Optional[Dict[str, Limits]] = None,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 60,
+        stream: bool = False,
+        max_body_bytes: Optional[int] = DEFAULT_MAX_BODY_BYTES,
+    ) -> None:
+        self.http_client = http_client or create_default_async_client(
+            timeout=timeout,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+            limits=limits,
+            http2=http2,
+            provider_limits=provider_limits,
+        )
+        self.cache = cache
+        self.parse_cache = parse_cache
+        self.parse_executor = parse_executor
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.stream = stream
+        self.max_body_bytes = max_body_bytes
+        self.rate_limiters = RateLimiters()
+        self._in_flight: dict[tuple, asyncio.Future] = {}
+
+    async def fetch_details(
+        self, url: str, fields: Optional[Collection[str]] = None
+    ) -> JobListing:
+        """Fetch and parse the listing at ``url``; see ``JobDog.fetch_details``."""
+        return await self._fetch_resolved(url, None, fields)
+
+    async def _fetch_resolved(
+        self,
+        url: str,
+        resolved: Optional[Resolved],
+        fields: Optional[Collection[str]] = None,
+    ) -> JobListing:
+        """See ``JobDog._fetch_resolved``."""
+        with metrics.span("fetch_details", provider=_provider_tag(url)):
+            try:
+                logger.info("Fetching details for %s", url)
+                if resolved is None:
+                    with metrics.span("get_parser"):
+                        parser: BaseParser = get_parser(url)
+                    with metrics.span("sanitize_url"):
+                        sanitized_url = parser.sanitize_url(url)
+                else:
+                    parser, sanitized_url = resolved
+                key = (dedupe_key(url, sanitized_url), _fields_key(fields))
+                in_flight = self._in_flight.get(key)
+                if in_flight is not None:
+                    logger.debug("Joining in-flight fetch of %s", sanitized_url)
+                    metrics.increment("coalesced_fetches")
+                    # a cancelled joiner must not cancel the fetch it shares
+                    return await asyncio.shield(in_flight)
+
+                future = self._in_flight[key] = (
+                    asyncio.get_running_loop().create_future()
+                )
+                try:
+                    job_details = await self._fetch_details(
+                        url, parser, sanitized_url, fields
+                    )
+                    future.set_result(job_details)
+                    return job_details
+                except asyncio.CancelledError:
+                    # joiners were not cancelled themselves; they get an
+                    # ordinary failure, which batches report per URL
+                    future.set_exception(
+                        FetchError(f"Shared fetch of {sanitized_url} was cancelled")
+                    )
+                    future.exception()
+                    raise
+                except Exception as e:
+                    future.set_exception(e)
+                    # only joiners need it; do not warn when there are none
+                    future.exception()
+                    raise
+                finally:
+                    del self._in_flight[key]
+            except Exception as e:
+                logger.error("Error fetching %s: %s", url, e)
+                raise FetchError(f"Failed to fetch URL: {url}. Error: {str(e)}")
+
+    async def _fetch_details(
+        self,
+        url: str,
+        parser: BaseParser,
+        sanitized_url: str,
+        fields: Optional[Collection[str]],
+    ) -> JobListing:
+        html = await self._get_html(sanitized_url, parser, fields)
+        job_details = await self._parse_html(url, parser, html, fields)
+        job_details.job_listing_url = sanitized_url
+        return job_details
+
+    async def _get_html(
+        self,
+        url: str,
+        parser: BaseParser,
+        fields: Optional[Collection[str]] = None,
+    ) -> str:
+        if self.stream:
+            return await self._stream_html(url, parser, fields)
+        if self.cache is None:
+            response = await self._request(url)
+            response.raise_for_status()
+            return response.text
+
+        cache = self.cache
+        entry = await _call_cache(cache, cache.lookup, url)
+        if entry is not None and cache.is_fresh(entry):
+            logger.debug("Cache hit for %s", url)
+            metrics.increment("cache_hits")
+            return entry.value
+        headers = entry.conditional_headers() if entry else {}
+        response = await self._request(url, headers=headers)
+        return await _call_cache(cache, cache.store_response, url, response, entry)
+
+    async def _stream_html(
+        self, url: str, parser: BaseParser, fields: Optional[Collection[str]]
+    ) -> str:
+        cache = self.cache
+        entry = None
+        if cache is not None:
+            entry = await _call_cache(cache, cache.lookup, url)
+        if entry is not None and cache.is_fresh(entry):
+            logger.debug("Cache hit for %s", url)
+            metrics.increment("cache_hits")
+            return entry.value
+        headers = entry.conditional_headers() if entry else {}
+
+        scanner = FieldScanner(parser.stream_markers, fields)
+        response = await self._request(url, stream=True, headers=headers)
+        try:
+            if response.status_code == 304 and entry is not None:
+                return await _call_cache(
+                    cache, cache.store_response, url, response, entry
+                )
+            response.raise_for_status()
+            async for chunk in response.aiter_text():
+                if scanner.feed(chunk) or _body_limit_reached(
+                    url, response, self.max_body_bytes
+                ):
+                    return scanner.html
+        finally:
+            await response.aclose()
+
+        if cache is not None:
+            await _call_cache(
+                cache, cache.store_response, url, response, entry, scanner.html
+            )
+        return scanner.html
+
+    async def _request(self, url: str, stream: bool = False, **kwargs) -> Response:
+        bucket = self.rate_limiters.get(url)
+        extensions = kwargs.get("extensions") or {}
+        for attempt in count():
+            if bucket:
+                await bucket.acquire_async()
+            if metrics.enabled():
+                trace = metrics.HttpTrace(extensions.get("trace"))
+                kwargs["extensions"] = {**extensions, "trace": trace.atrace}
+            with metrics.span("http_request") as request_span:
+                if stream:
+                    request = self.http_client.build_request("GET", url, **kwargs)
+                    response = await self.http_client.send(request, stream=True)
+                else:
+                    response = await self.http_client.get(url, **kwargs)
+                request_span.set_tag("status", response.status_code)
+            delay = get_retry_delay(
+                response,
+                attempt,
+                self.max_retries,
+                self.backoff_factor,
+                self.max_backoff,
+            )
+            if delay is None:
+                return response
+            logger.warning(
+                "Got %s for %s, retrying in %.1fs", response.status_code, url, delay
+            )
+            metrics.increment("retries", status=response.status_code)
+            await response.aclose()
+            if bucket:
+                bucket.pause(delay)
+            await asyncio.sleep(delay)
+
+    async def _parse_html(
+        self,
+        url: str,
+        parser: BaseParser,
+        html: str,
+        fields: Optional[Collection[str]] = None,
+    ) -> JobListing:
+        # partial listings are not memoized
+        parse_cache = self.parse_cache if fields is None else None
+        key, job_details = await _call_cache(
+            parse_cache, _load_parsed, parse_cache, parser, html
+        )
+        if job_details is not None:
+            metrics.increment("parse_cache_hits")
+            return job_details
+
+        with metrics.span("parse_html"):
+            if self.parse_executor is None:
+                job_details = run_parser(parser, html, fields)
+            else:
+                future = self.parse_executor.submit(
+                    parse_html_in_worker, get_provider_domain(url), html, fields
+                )
+                job_details = listing_from_dict(
+                    await asyncio.wrap_future(future), fields
+                )
+        await _call_cache(parse_cache, _store_parsed, parse_cache, key, job_details)
+        return job_details
+
+    async def fetch_many(
+        self,
+        urls: Iterable[str],
+        max_concurrency: int = 10,
+        per_host_limit: PerHostLimit = None,
+        fields: Optional[Collection[str]] = None,
+    ) -> list[Union[JobListing, FetchError]]:
+        """Fetch many listings concurrently on the running event loop.
+
+        Results are returned in input order. A URL that fails yields its
+        ``FetchError`` in place of a listing instead of aborting the batch.
+        URLs that are variants of the same listing are fetched once and
+        share the result.
+        """
+        keys, unique_urls = _dedupe_batch(urls)
+        batch = self._run_batch(
+            _aiter_sync(unique_urls.values()), max_concurrency, per_host_limit, fields
+        )
+        async with aclosing(batch):
+            results = {url: result async for url, result in batch}
+        return [results[unique_urls[key][0]] for key in keys]
+
+    async def iter_details(
+        self,
+        urls: Union[Iterable[str], AsyncIterable[str]],
+        max_concurrency: int = 10,
+        per_host_limit: PerHostLimit = None,
+        fields: Optional[Collection[str]] = None,
+        dedupe: bool = False,
+    ) -> AsyncIterator[tuple[str, Union[JobListing, FetchError]]]:
+        """Yield ``(url, listing or FetchError)`` pairs as fetches complete.
+
+        ``urls`` may be a regular or an async iterable and is consumed lazily,
+        with at most ``max_concurrency`` fetches in flight. Results are
+        yielded in completion order, not input order. With ``dedupe``, a URL
+        that is a variant of one seen before is skipped; see
+        ``JobDog.iter_details`` for the memory this costs.
+        """
+        if isinstance(urls, AsyncIterable):
+            url_iterator = aiter(urls)
+        else:
+            url_iterator = _aiter_sync(urls)
+
+        async def entries() -> AsyncIterator[tuple[str, Optional[Resolved]]]:
+            seen: set[str] = set()
+            async for url in url_iterator:
+                if not dedupe:
+                    yield url, _resolve(url)
+                    continue
+                key, resolved = _batch_entry(url)
+                if key not in seen:
+                    seen.add(key)
+                    yield url, resolved
+
+        # closed explicitly, so an early stop cancels the fetches right away
+        async with aclosing(
+            self._run_batch(entries(), max_concurrency, per_host_limit, fields)
+        ) as batch:
+            async for result in batch:
+                yield result
+
+    async def _run_batch(
+        self,
+        entries: AsyncIterator[tuple[str, Optional[Resolved]]],
+        max_concurrency: int,
+        per_host_limit: PerHostLimit,
+        fields: Optional[Collection[str]],
+    ) -> AsyncIterator[tuple[str, Union[JobListing, FetchError]]]:
+        """``JobDog._run_batch`` with the fetches as tasks on the running
+        event loop."""
+        host_queue = _HostQueue(per_host_limit)
+        running: dict[asyncio.Task, str] = {}
+        exhausted = False
+
+        async def submit() -> None:
+            nonlocal exhausted
+            while len(running) < max_concurrency:
+                entry = host_queue.pop()
+                if entry is None:
+                    if exhausted or host_queue.held >= max_concurrency:
+                        return
+                    entry = await anext(entries, None)
+                    if entry is None:
+                        exhausted = True
+                        return
+                    host_queue.add(entry[0], entry)
+                    continue
+                url, resolved = entry
+                task = asyncio.create_task(self._fetch_or_error(url, resolved, fields))
+                running[task] = url
+
+        try:
+            await submit()
+            while running:
+                done, _ = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
+                )
+                completed = []
+                for task in done:
+                    url = running.pop(task)
+                    host_queue.finished(url)
+                    completed.append((url, task.result()))
+                await submit()
+                for result in completed:
+                    yield result
+        finally:
+            for task in running:
+                task.cancel()
+            # let the cancelled fetches unwind before the caller closes the
+            # client under them
+            await asyncio.gather(*running, return_exceptions=True)
+
+    async def _fetch_or_error(
+        self,
+        url: str,
+        resolved: Optional[Resolved],
+        fields: Optional[Collection[str]] = None,
+    ) -> Union[JobListing, FetchError]:
+        try:
+            return await self._fetch_resolved(url, resolved, fields)
+        except FetchError as e:
+            return e
+
+    async def close(self) -> None:
+        logger.info("Attempting to close session")
+        if self.http_client:
+            await self.http_client.aclose()
+            logger.info("Session closed")
+
+    async def __aenter__(self) -> "AsyncJobDog":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
@@ -12,14 +12,16 @@ ch.setFormatter(formatter)
 
 logger.addHandler(ch)
 
-def info(message: str):
-    logger.info(message)
+# Pass values as arguments ("Parsed %s", url) rather than pre-formatting
+# them, so messages below the logger's level cost no string formatting.
+def info(message: str, *args):
+    logger.info(message, *args, stacklevel=2)
 
-def error(message: str):
-    logger.error(message)
+def error(message: str, *args):
+    logger.error(message, *args, stacklevel=2)
 
-def debug(message: str):
-    logger.debug(message)
+def debug(message: str, *args):
+    logger.debug(message, *args, stacklevel=2)
 
-def warn(message: str):
-    logger.warning(message)
\ No newline at end of file
+def warn(message: str, *args):
+    logger.warning(message, *args, stacklevel=2)
\ No newline at end of file
@@ -0,0 +1,323 @@
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Optional
+
+# upper bounds in seconds, from a cached parse to a slow download
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+    30,
+)
+
+# httpcore trace events (without the http11./http2. prefix) and the stage
+# they time; DNS resolution is part of connect_tcp
+HTTP_TRACE_STAGES = {
+    "connection.connect_tcp": "http_connect",
+    "connection.start_tls": "http_tls",
+    "send_request_headers": "http_send",
+    "receive_response_headers": "http_wait",
+    "receive_response_body": "http_body",
+}
+
+_hooks: list["MetricsHook"] = []
+_current_span: ContextVar[Optional["Span"]] = ContextVar("jobdog_span", default=None)
+
+
+class MetricsHook:
+    """Receives finished spans and counter increments. Subclass it and
+    register the instance with ``add_hook``; hooks are called on the thread
+    that did the work, so they must be thread-safe."""
+
+    def on_span(self, span: "Span") -> None:
+        pass
+
+    def on_count(self, name: str, value: float, tags: dict[str, str]) -> None:
+        pass
+
+
+class Span:
+    """Times one stage of a fetch, e.g. ``sanitize_url`` or ``parse_html``.
+
+    Tags are inherited from the enclosing span, so stages run inside
+    ``fetch_details`` carry its ``provider`` tag. On exit the span gets an
+    ``outcome`` tag of ``ok``, or ``error`` if an exception escaped it.
+    """
+
+    __slots__ = ("name", "tags", "parent", "started_at", "duration", "_token")
+
+    def __init__(self, name: str, tags: dict[str, str]) -> None:
+        self.parent = _current_span.get()
+        self.name = name
+        self.tags = dict(self.parent.tags) if self.parent is not None else {}
+        self.tags.update(tags)
+        self.started_at = 0.0
+        self.duration = 0.0
+
+    def set_tag(self, key: str, value: Any) -> None:
+        self.tags[key] = str(value)
+
+    def __enter__(self) -> "Span":
+        self._token = _current_span.set(self)
+        self.started_at = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.duration = time.perf_counter() - self.started_at
+        _current_span.reset(self._token)
+        self.tags.setdefault("outcome", "ok" if exc_type is None else "error")
+        for hook in _hooks:
+            hook.on_span(self)
+
+
+class _NoopSpan:
+    """Stands in for ``Span`` while no hooks are registered."""
+
+    __slots__ = ()
+
+    def set_tag(self, key: str, value: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def _tags(tags: dict[str, Any]) -> dict[str, str]:
+    return {key: str(value) for key, value in tags.items() if value is not None}
+
+
+def add_hook(hook: MetricsHook) -> MetricsHook:
+    _hooks.append(hook)
+    return hook
+
+
+def remove_hook(hook: MetricsHook) -> None:
+    _hooks.remove(hook)
+
+
+def enabled() -> bool:
+    """Whether any hook is registered; instrumentation is free otherwise."""
+    return bool(_hooks)
+
+
+def span(name: str, **tags: Any):
+    """Context manager timing the stage ``name``; see ``Span``."""
+    if not _hooks:
+        return _NOOP_SPAN
+    return Span(name, _tags(tags))
+
+
+def record(name: str, duration: float, **tags: Any) -> None:
+    """Report a stage timed elsewhere, e.g. from an httpx trace event, as
+    a finished span under the current one."""
+    if not _hooks:
+        return
+    finished = Span(name, _tags(tags))
+    finished.duration = duration
+    finished.tags.setdefault("outcome", "ok")
+    for hook in _hooks:
+        hook.on_span(finished)
+
+
+def increment(name: str, value: float = 1, **tags: Any) -> None:
+    """Add ``value`` to the counter ``name``, tagged like the current span."""
+    if not _hooks:
+        return
+    parent = _current_span.get()
+    merged = dict(parent.tags) if parent is not None else {}
+    merged.pop("outcome", None)
+    merged.update(_tags(tags))
+    for hook in _hooks:
+        hook.on_count(name, value, merged)
+
+
+class HttpTrace:
+    """httpx ``trace`` extension that reports connect, TLS, send, wait
+    (time to first byte) and body download times with ``record``. Pass an
+    instance as ``extensions={"trace": ...}``; ``atrace`` is the variant for
+    ``AsyncClient``. Events are passed on to ``forward``, a trace the
+    caller had set already, if any."""
+
+    def __init__(self, forward: Optional[Callable] = None) -> None:
+        self._started: dict[str, float] = {}
+        self._forward = forward
+
+    def __call__(self, event_name: str, info: dict) -> None:
+        self._record(event_name)
+        if self._forward is not None:
+            self._forward(event_name, info)
+
+    async def atrace(self, event_name: str, info: dict) -> None:
+        self._record(event_name)
+        if self._forward is not None:
+            await self._forward(event_name, info)
+
+    def _record(self, event_name: str) -> None:
+        event, _, phase = event_name.rpartition(".")
+        if not event.startswith("connection."):
+            event = event.partition(".")[2]
+        stage = HTTP_TRACE_STAGES.get(event)
+        if stage is None:
+            return
+        if phase == "started":
+            self._started[event] = time.perf_counter()
+        elif event in self._started:
+            record(
+                stage,
+                time.perf_counter() - self._started.pop(event),
+                outcome="ok" if phase == "complete" else "error",
+            )
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(
+        '{}="{}"'.format(
+            key, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        )
+        for key, value in labels.items()
+    )
+    return f"{{{pairs}}}"
+
+
+def _format_number(value: float) -> str:
+    return "+Inf" if value == float("inf") else repr(float(value))
+
+
+class InMemoryExporter(MetricsHook):
+    """Aggregates spans into a ``jobdog_stage_seconds`` histogram and counter
+    increments into ``jobdog_<name>_total`` counters, labelled by stage and
+    tags (``provider``, ``outcome``, ...). ``render`` returns them in the
+    Prometheus text format, and ``serve`` exposes that over HTTP for
+    scraping."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self._histograms: dict[tuple, list] = {}
+        self._counters: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def on_span(self, span: Span) -> None:
+        key = (span.name, tuple(sorted(span.tags.items())))
+        index = bisect_left(self.buckets, span.duration)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                # per-bucket counts, then +Inf, then the sum
+                histogram = self._histograms[key] = [0] * (len(self.buckets) + 2)
+            histogram[index] += 1
+            histogram[-1] += span.duration
+
+    def on_count(self, name: str, value: float, tags: dict[str, str]) -> None:
+        key = (name, tuple(sorted(tags.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def snapshot(self) -> dict[str, Any]:
+        """Current values: per stage and tags, the count, total seconds and
+        cumulative bucket counts; per counter and tags, its value."""
+        with self._lock:
+            histograms = {key: list(value) for key, value in self._histograms.items()}
+            counters = dict(self._counters)
+        stages = []
+        for (name, tags), histogram in sorted(histograms.items()):
+            cumulative, running = [], 0
+            for count in histogram[:-1]:
+                running += count
+                cumulative.append(running)
+            stages.append(
+                {
+                    "stage": name,
+                    "tags": dict(tags),
+                    "count": running,
+                    "sum": histogram[-1],
+                    "buckets": dict(zip((*self.buckets, float("inf")), cumulative)),
+                }
+            )
+        return {
+            "stages": stages,
+            "counters": [
+                {"name": name, "tags": dict(tags), "value": value}
+                for (name, tags), value in sorted(counters.items())
+            ],
+        }
+
+    def render(self) -> str:
+        snapshot = self.snapshot()
+        lines = [
+            "# HELP jobdog_stage_seconds Time spent per fetch stage.",
+            "# TYPE jobdog_stage_seconds histogram",
+        ]
+        for stage in snapshot["stages"]:
+            labels = {"stage": stage["stage"], **stage["tags"]}
+            for bound, count in stage["buckets"].items():
+                bucket_labels = _format_labels({**labels, "le": _format_number(bound)})
+                lines.append(f"jobdog_stage_seconds_bucket{bucket_labels} {count}")
+            lines.append(
+                f"jobdog_stage_seconds_sum{_format_labels(labels)} {stage['sum']!r}"
+            )
+            lines.append(
+                f"jobdog_stage_seconds_count{_format_labels(labels)} {stage['count']}"
+            )
+
+        described = set()
+        for counter in snapshot["counters"]:
+            name = f"jobdog_{counter['name']}_total"
+            if name not in described:
+                described.add(name)
+                lines.append(f"# TYPE {name} counter")
+            lines.append(
+                f"{name}{_format_labels(counter['tags'])}"
+                f" {_format_number(counter['value'])}"
+            )
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def serve(self, port: int = 9464, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """Serve ``render()`` at ``http://host:port/metrics`` from a daemon
+        thread. Call ``shutdown()`` on the returned server to stop it."""
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = exporter.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
@@ -0,0 +1,109 @@
+import sys
+from dataclasses import dataclass, fields
+from typing import Any, Optional
+
+from pydantic import HttpUrl, TypeAdapter
+
+from jobdog.models.job_listing import (
+    EmploymentType,
+    ExperienceLevel,
+    JobListing,
+    LocationType,
+    to_employment_type,
+    to_experience_level,
+    to_location_type,
+)
+
+_URL_FIELDS = ("job_listing_url", "apply_url")
+_http_url = TypeAdapter(HttpUrl)
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _intern_all(values) -> Optional[tuple[str, ...]]:
+    return None if values is None else tuple(sys.intern(value) for value in values)
+
+
+def _to_str(value) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+@dataclass(slots=True)
+class CompactJobListing:
+    """Lightweight stand-in for ``JobListing`` in bulk pipelines.
+
+    A slotted dataclass without validation: enums are stored as their
+    (shared) members, repeated strings such as the company, locations and
+    industry are interned, list fields are tuples and URLs are plain
+    strings. Convert with ``from_listing`` and ``to_listing`` at the API
+    boundary.
+    """
+
+    job_title: Optional[str]
+    company_name: Optional[str]
+    job_description: Optional[str]
+    job_function: Optional[str] = None
+    job_listing_url: Optional[str] = None
+    location: Optional[tuple[str, ...]] = None
+    location_type: Optional[LocationType] = None
+    employment_type: Optional[EmploymentType] = None
+    experience_level: Optional[ExperienceLevel] = None
+    salary: Optional[str] = None
+    currency: Optional[str] = None
+    apply_url: Optional[str] = None
+    job_posting_date: Optional[str] = None
+    job_expiry_date: Optional[str] = None
+    skills: Optional[tuple[str, ...]] = None
+    industry: Optional[str] = None
+
+    @classmethod
+    def from_values(cls, data: dict[str, Any]) -> "CompactJobListing":
+        """Build a record from raw field values, as returned by a parser's
+        extractors or found in ``JobListing.__dict__``. Enum fields accept
+        the same spellings as ``JobListing``; fields missing from ``data``
+        are ``None``."""
+        get = data.get
+        experience_level = to_experience_level(get("experience_level"))
+        return cls(
+            job_title=get("job_title"),
+            company_name=_intern(get("company_name")),
+            job_description=get("job_description"),
+            job_function=_intern(get("job_function")),
+            job_listing_url=_to_str(get("job_listing_url")),
+            location=_intern_all(get("location")),
+            location_type=to_location_type(get("location_type")),
+            employment_type=to_employment_type(get("employment_type")),
+            experience_level=(
+                ExperienceLevel(experience_level)
+                if isinstance(experience_level, str)
+                else experience_level
+            ),
+            salary=get("salary"),
+            currency=_intern(get("currency")),
+            apply_url=_to_str(get("apply_url")),
+            job_posting_date=get("job_posting_date"),
+            job_expiry_date=get("job_expiry_date"),
+            skills=_intern_all(get("skills")),
+            industry=_intern(get("industry")),
+        )
+
+    @classmethod
+    def from_listing(cls, listing: JobListing) -> "CompactJobListing":
+        return cls.from_values(listing.__dict__)
+
+    def to_listing(self) -> JobListing:
+        """Convert back to a ``JobListing``. Values were normalized on the
+        way in, so only the URLs are validated again."""
+        values = {name: getattr(self, name) for name in _FIELD_NAMES}
+        for name in _URL_FIELDS:
+            if values[name] is not None:
+                values[name] = _http_url.validate_python(values[name])
+        for name in ("location", "skills"):
+            if values[name] is not None:
+                values[name] = list(values[name])
+        return JobListing.model_construct(**values)
+
+
+_FIELD_NAMES = tuple(field.name for field in fields(CompactJobListing))
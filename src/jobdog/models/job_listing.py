@@ -48,26 +48,40 @@ class JobListing(BaseModel):
     @field_validator("location_type", mode="before")
     @classmethod
     def validate_location_type(cls, v):
-        if isinstance(v, str):
-            return LocationType(v.lower())
-        return v
+        return to_location_type(v)
 
     @field_validator("employment_type", mode="before")
     @classmethod
     def validate_employment_type(cls, v):
-        if isinstance(v, str):
-            return EmploymentType(v.lower().replace("-", "_").replace(" ", "_"))
-        return v
+        return to_employment_type(v)
 
     @field_validator("experience_level", mode="before")
     @classmethod
     def validate_experience_level(cls, v):
-        if isinstance(v, str):
-            mapping = {
-                "entry level": ExperienceLevel.ENTRY,
-                "associate": ExperienceLevel.JUNIOR,
-                "mid-senior level": ExperienceLevel.MID,
-                "director": ExperienceLevel.SENIOR,
-            }
-            return mapping.get(v.lower(), v)
-        return v
+        return to_experience_level(v)
+
+
+EXPERIENCE_LEVEL_ALIASES = {
+    "entry level": ExperienceLevel.ENTRY,
+    "associate": ExperienceLevel.JUNIOR,
+    "mid-senior level": ExperienceLevel.MID,
+    "director": ExperienceLevel.SENIOR,
+}
+
+
+def to_location_type(v):
+    if isinstance(v, str):
+        return LocationType(v.lower())
+    return v
+
+
+def to_employment_type(v):
+    if isinstance(v, str):
+        return EmploymentType(v.lower().replace("-", "_").replace(" ", "_"))
+    return v
+
+
+def to_experience_level(v):
+    if isinstance(v, str):
+        return EXPERIENCE_LEVEL_ALIASES.get(v.lower(), v)
+    return v
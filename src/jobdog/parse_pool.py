@@ -0,0 +1,75 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Collection, Iterable, Optional
+
+from jobdog.exceptions import UnsupportedProviderError
+from jobdog.models.job_listing import JobListing
+from jobdog.providers.base import BaseParser, partial_listing
+from jobdog.providers.utils import (
+    BUILTIN_PARSER_MODULES,
+    PARSER_MAP,
+    load_parsers,
+)
+
+
+def _init_worker(parser_modules: tuple[str, ...]) -> None:
+    load_parsers(parser_modules)
+
+
+def run_parser(
+    parser: BaseParser, html: str, fields: Optional[Collection[str]] = None
+) -> JobListing:
+    if fields is None:
+        return parser.parse_html(html)
+    return parser.parse_html(html, fields=fields)
+
+
+def listing_from_dict(
+    data: dict[str, Any], fields: Optional[Collection[str]] = None
+) -> JobListing:
+    """Rebuild the listing returned by ``parse_html_in_worker``."""
+    if fields is None:
+        return JobListing.model_validate(data)
+    return partial_listing(data)
+
+
+def parse_html_in_worker(
+    domain: str, html: str, fields: Optional[Collection[str]] = None
+) -> dict[str, Any]:
+    """Parse ``html`` with the parser registered for ``domain`` and return the
+    listing as a JSON-compatible dict.
+
+    Meant to run in a worker process: only the provider domain and the page
+    travel to the worker, and the parser is looked up in the worker's own
+    ``PARSER_MAP``.
+    """
+    if domain not in PARSER_MAP:
+        load_parsers()
+        if domain not in PARSER_MAP:
+            raise UnsupportedProviderError(
+                f"No parser registered for {domain} in this process; pass its"
+                " module to create_parse_pool(parser_modules=...)"
+            )
+    parser = PARSER_MAP.instance(domain)
+    # unrequested fields of a partial listing are left out
+    return run_parser(parser, html, fields).model_dump(
+        mode="json", exclude_unset=fields is not None
+    )
+
+
+def create_parse_pool(
+    max_workers: Optional[int] = None,
+    parser_modules: Iterable[str] = (),
+    **kwargs,
+) -> ProcessPoolExecutor:
+    """Create a process pool for ``JobDog(parse_executor=...)``.
+
+    Workers import the built-in providers plus ``parser_modules`` on start-up
+    so custom parsers are registered there as well. The pool can be shared
+    by several ``JobDog`` instances and batches; shut it down when done.
+    """
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_worker,
+        initargs=(BUILTIN_PARSER_MODULES + tuple(parser_modules),),
+        **kwargs,
+    )
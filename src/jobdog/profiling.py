@@ -0,0 +1,258 @@
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from selectolax.parser import HTMLParser
+
+from jobdog.providers import base
+from jobdog.providers.base import BaseParser
+from jobdog.providers.extraction import LookupObserver, SpecDocument
+
+# what selector queries made outside any extractor are filed under
+OUTSIDE_EXTRACTORS = "-"
+
+
+class ExtractorStats:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.seconds = 0.0
+        # selectors that missed before one hit; None when all of them missed
+        self.fallback_depths: Counter = Counter()
+
+    @property
+    def mean_depth(self) -> float:
+        depths = [
+            (depth, count)
+            for depth, count in self.fallback_depths.items()
+            if depth is not None
+        ]
+        total = sum(count for _, count in depths)
+        return sum(depth * count for depth, count in depths) / total if total else 0
+
+
+class SelectorStats:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.hits = 0
+        self.seconds = 0.0
+
+
+class _SpecObserver(LookupObserver):
+    def __init__(self, profiler: "ParserProfiler", parser_name: str) -> None:
+        self.profiler = profiler
+        self.parser_name = parser_name
+
+    def scan(self, query: str, seconds: float, hit: bool) -> None:
+        # runs once for all fields, so it is no field's fallback
+        self.profiler._record_query(
+            self.parser_name, query, seconds, hit, OUTSIDE_EXTRACTORS
+        )
+
+    def lookup(self, source: str, seconds: float, hit: bool) -> None:
+        self.profiler._record_query(self.parser_name, source, seconds, hit)
+
+
+class ParserProfiler:
+    """Profiles parsers page by page: wall time of each ``_extract_*``
+    method (or ``spec`` field), wall time and hit/miss of each selector
+    query on the document, and the fallback depth of each extractor call,
+    i.e. how many selectors missed before one matched.
+
+    Selector queries are seen by swapping ``HTMLParser`` in the parser's
+    module and in ``jobdog.providers.base`` for a subclass that times
+    ``css``/``css_first`` on the document; queries on nodes below it count
+    towards the extractor, not as selectors. Parsers with a ``spec`` report
+    every source a field tries instead, as ``SpecDocument.observer``, and
+    the query the spec's simple selectors share is filed outside the
+    fields. Instrumenting patches module and class globals, so profile on
+    one thread with parser instances of your own, not the shared ones from
+    ``get_parser``.
+    """
+
+    def __init__(self) -> None:
+        self.pages = 0
+        self.errors = 0
+        self.parse_seconds: dict[str, float] = Counter()
+        self.dom_seconds: dict[str, float] = Counter()
+        self.extractors: dict[tuple[str, str], ExtractorStats] = {}
+        self.selectors: dict[tuple[str, str, str], SelectorStats] = {}
+        # (extractor name, hits of its selector queries so far) per open call
+        self._calls: list[tuple[str, list[bool]]] = []
+
+    def profile(self, parser: BaseParser, html: str) -> None:
+        """Parse ``html`` with ``parser`` and record where the time went.
+        A page the parser fails on counts towards ``errors``."""
+        parser_name = type(parser).__name__
+        with self.instrument(parser):
+            started = time.perf_counter()
+            try:
+                parser.parse_html(html)
+            except Exception:
+                self.errors += 1
+            finally:
+                self.parse_seconds[parser_name] += time.perf_counter() - started
+                self.pages += 1
+
+    @contextmanager
+    def instrument(self, parser: BaseParser) -> Iterator[BaseParser]:
+        parser_name = type(parser).__name__
+        names = [name for name in dir(type(parser)) if name.startswith("_extract_")]
+        for name in names:
+            setattr(parser, name, self._wrap(parser_name, name, getattr(parser, name)))
+        observer = SpecDocument.observer
+        if parser.spec is not None:
+            # spec fields have no methods of their own; profile the callables
+            names.append("extractors")
+            parser.extractors = self._wrap_spec(parser_name, parser.extractors)
+            SpecDocument.observer = _SpecObserver(self, parser_name)
+
+        # the queries of a spec are reported by its observer
+        tree_class = self._tree_class(parser_name, parser.spec is None)
+        modules = dict.fromkeys([sys.modules[type(parser).__module__], base])
+        patched = [
+            module
+            for module in modules
+            if getattr(module, "HTMLParser", None) is HTMLParser
+        ]
+        for module in patched:
+            module.HTMLParser = tree_class
+        try:
+            yield parser
+        finally:
+            for module in patched:
+                module.HTMLParser = HTMLParser
+            SpecDocument.observer = observer
+            for name in names:
+                delattr(parser, name)
+
+    def _wrap(self, parser_name: str, name: str, method):
+        stats = self.extractors.setdefault((parser_name, name), ExtractorStats())
+
+        def profiled(*args, **kwargs):
+            queries: list[bool] = []
+            self._calls.append((name, queries))
+            started = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            except Exception:
+                stats.errors += 1
+                raise
+            finally:
+                stats.seconds += time.perf_counter() - started
+                stats.calls += 1
+                self._calls.pop()
+                if queries:
+                    depth = queries.index(True) if True in queries else None
+                    stats.fallback_depths[depth] += 1
+
+        return profiled
+
+    def _wrap_spec(self, parser_name: str, extractors):
+        def profiled(html):
+            return {
+                name: self._wrap(parser_name, name, extract)
+                for name, extract in extractors(html).items()
+            }
+
+        return profiled
+
+    def _record_query(
+        self,
+        parser_name: str,
+        query: str,
+        seconds: float,
+        hit: bool,
+        extractor: Optional[str] = None,
+    ) -> None:
+        queries = None
+        if extractor is None and self._calls:
+            extractor, queries = self._calls[-1]
+        key = (parser_name, extractor or OUTSIDE_EXTRACTORS, query)
+        stats = self.selectors.get(key)
+        if stats is None:
+            stats = self.selectors[key] = SelectorStats()
+        stats.calls += 1
+        stats.hits += hit
+        stats.seconds += seconds
+        if queries is not None:
+            queries.append(hit)
+
+    def _tree_class(self, parser_name: str, record_queries: bool = True) -> type:
+        profiler = self
+
+        class ProfiledHTMLParser(HTMLParser):
+            def __init__(self, html, *args, **kwargs) -> None:
+                started = time.perf_counter()
+                super().__init__(html, *args, **kwargs)
+                profiler.dom_seconds[parser_name] += time.perf_counter() - started
+
+            def css(self, query: str):
+                if not record_queries:
+                    return super().css(query)
+                started = time.perf_counter()
+                nodes = super().css(query)
+                profiler._record_query(
+                    parser_name, query, time.perf_counter() - started, bool(nodes)
+                )
+                return nodes
+
+            def css_first(self, query: str, default=None, strict: bool = False):
+                if not record_queries:
+                    return super().css_first(query, default, strict)
+                started = time.perf_counter()
+                node = super().css_first(query, default, strict)
+                profiler._record_query(
+                    parser_name, query, time.perf_counter() - started, node is not None
+                )
+                return node
+
+        return ProfiledHTMLParser
+
+    def report(self, top: Optional[int] = None) -> str:
+        """A plain-text report: time per parser, per extractor (with errors
+        and fallback depth) and per selector (with hit rate), slowest
+        first. ``top`` limits the number of extractor and selector rows."""
+        lines = [f"{self.pages} pages, {self.errors} failed to parse", ""]
+        lines.append(f"{'parser':<24} {'parse ms':>10} {'DOM ms':>10}")
+        for parser_name, seconds in sorted(
+            self.parse_seconds.items(), key=lambda item: -item[1]
+        ):
+            lines.append(
+                f"{parser_name:<24} {seconds * 1e3:>10.2f}"
+                f" {self.dom_seconds[parser_name] * 1e3:>10.2f}"
+            )
+
+        lines += [
+            "",
+            f"{'extractor':<48} {'calls':>6} {'total ms':>9} {'mean ms':>8}"
+            f" {'errors':>6} {'depth':>6} {'all-miss':>8}",
+        ]
+        extractors = sorted(self.extractors.items(), key=lambda item: -item[1].seconds)
+        for (parser_name, name), stats in extractors[:top]:
+            if not stats.calls:
+                continue
+            lines.append(
+                f"{f'{parser_name}.{name}':<48} {stats.calls:>6}"
+                f" {stats.seconds * 1e3:>9.2f} {stats.seconds / stats.calls * 1e3:>8.3f}"
+                f" {stats.errors:>6} {stats.mean_depth:>6.2f}"
+                f" {stats.fallback_depths[None]:>8}"
+            )
+
+        lines += [
+            "",
+            f"{'selector':<72} {'calls':>6} {'hit %':>6} {'total ms':>9}"
+            f" {'mean us':>8}",
+        ]
+        selectors = sorted(self.selectors.items(), key=lambda item: -item[1].seconds)
+        for (parser_name, extractor, query), stats in selectors[:top]:
+            label = f"{parser_name}.{extractor} {query}"
+            if len(label) > 72:
+                label = label[:69] + "..."
+            lines.append(
+                f"{label:<72} {stats.calls:>6} {stats.hits / stats.calls:>6.0%}"
+                f" {stats.seconds * 1e3:>9.2f} {stats.seconds / stats.calls * 1e6:>8.1f}"
+            )
+        return "\n".join(lines)
@@ -1,12 +1,279 @@
+import json
 from abc import ABC, abstractmethod
-from jobdog.models.job_listing import JobListing
+from datetime import datetime
+from functools import cached_property
+from html import unescape
+from typing import Any, Callable, Collection, Optional
+
+from selectolax.parser import HTMLParser
+
+from jobdog import metrics
+from jobdog.logger import debug
+from jobdog.models.compact_job_listing import CompactJobListing
+from jobdog.models.job_listing import EmploymentType, JobListing
+from jobdog.providers.extraction import ExtractionSpec
+from jobdog.providers.text import html_to_text
+
+JSON_LD_SELECTOR = 'script[type="application/ld+json"], script#jobPostingSchema'
+
+SCHEMA_EMPLOYMENT_TYPES = {
+    "FULL_TIME": EmploymentType.FULL_TIME,
+    "PART_TIME": EmploymentType.PART_TIME,
+    "CONTRACTOR": EmploymentType.CONTRACT,
+    "TEMPORARY": EmploymentType.TEMPORARY,
+    "INTERN": EmploymentType.INTERNSHIP,
+    "VOLUNTEER": EmploymentType.VOLUNTEER,
+}
+
+_REQUIRED_FIELDS = tuple(
+    name for name, field in JobListing.model_fields.items() if field.is_required()
+)
 
 
 class BaseParser(ABC):
-    @abstractmethod
-    def sanitize_url(self, url: str) -> str:
+    """Parses the listing pages of one provider.
+
+    ``get_parser`` hands out one shared instance per provider, which many
+    threads use at once: keep per-page state in locals or a
+    ``ParseContext``, and treat attributes set in ``setup`` as read-only
+    afterwards. A parser that cannot follow this sets ``thread_safe =
+    False`` to get one instance per thread instead.
+    """
+
+    thread_safe: bool = True
+    # Bump whenever a change to the parser alters its output, so results
+    # memoized for the previous version are no longer served.
+    version: int = 1
+    # Requests per second JobDog allows against this provider, with bursts of
+    # up to ``burst`` requests. ``None`` leaves the provider unthrottled.
+    requests_per_second: Optional[float] = None
+    burst: int = 1
+    # Regex per ``JobListing`` field that, once it matches the part of a page
+    # streamed so far, means the field can be extracted from that part; see
+    # ``JobDog(stream=True)``. Either cover every field ``parse_html`` fills
+    # in or leave it empty, in which case streamed pages are read in full.
+    # Matches longer than ``streaming.MARKER_WINDOW`` are not seen.
+    stream_markers: dict[str, str] = {}
+    # Regexes searched in the path and query of a listing URL, with a
+    # ``job_id`` group; the first match gives the job ID returned by
+    # ``route``.
+    url_patterns: tuple[str, ...] = ()
+    # Declarative extraction evaluated by the default ``extractors``; see
+    # ``ExtractionSpec``.
+    spec: Optional[ExtractionSpec] = None
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        # a subclass leaving ``sanitize_url`` abstract is a base of its own
+        if getattr(cls.sanitize_url, "__isabstractmethod__", False):
+            return
+        if (
+            cls.spec is None
+            and cls.extractors is BaseParser.extractors
+            and cls.parse_html is BaseParser.parse_html
+        ):
+            raise TypeError(
+                f"{cls.__name__} must set spec or implement extractors or parse_html"
+            )
+
+    def setup(self) -> None:
+        """Called once on each shared instance before it is handed out.
+        Precompile regexes, selectors or lookup tables here."""
         pass
 
     @abstractmethod
-    def parse_html(self, html: str) -> JobListing:
+    def sanitize_url(self, url: str) -> str:
         pass
+
+    def extractors(self, html: str) -> dict[str, Callable[[], Any]]:
+        """Map each ``JobListing`` field this parser fills in to a
+        zero-argument function extracting it from ``html``.
+
+        By default the fields come from ``spec``. Parsers without one
+        implement either this or ``parse_html`` and ``parse_compact``
+        themselves, which subclassing checks.
+        """
+        if self.spec is None:
+            raise NotImplementedError(
+                f"{type(self).__name__} implements parse_html but not extractors"
+            )
+        return self.spec.extractors(ParseContext(html))
+
+    def parse_html(
+        self, html: str, fields: Optional[Collection[str]] = None
+    ) -> JobListing:
+        """Parse a listing page.
+
+        With ``fields``, only those ``JobListing`` fields are extracted; see
+        ``build_listing``.
+        """
+        return build_listing(self.extractors(html), fields)
+
+    def parse_compact(self, html: str) -> CompactJobListing:
+        """Parse a listing page straight into a ``CompactJobListing``,
+        skipping pydantic validation."""
+        return build_compact(self.extractors(html))
+
+
+class ParseContext:
+    """Per-document state shared by the field extractors of one
+    ``parse_html`` call.
+
+    The DOM is built once, and the JSON-LD blocks are looked up and decoded
+    at most once, on first access.
+    """
+
+    def __init__(self, html: str) -> None:
+        self.html = html
+        self.tree = HTMLParser(html)
+
+    @cached_property
+    def json_ld(self) -> list[dict]:
+        blocks = []
+        for script in self.tree.css(JSON_LD_SELECTOR):
+            try:
+                data = json.loads(script.text())
+            except ValueError as e:
+                debug("Skipping malformed JSON-LD block: %s", e)
+                continue
+            blocks.extend(_flatten_json_ld(data))
+        return blocks
+
+    @cached_property
+    def job_posting(self) -> Optional[dict]:
+        """The first schema.org ``JobPosting`` on the page, if any."""
+        for block in self.json_ld:
+            schema_type = block.get("@type")
+            if schema_type == "JobPosting" or (
+                isinstance(schema_type, list) and "JobPosting" in schema_type
+            ):
+                return block
+        return None
+
+    @cached_property
+    def job_posting_fields(self) -> dict[str, Any]:
+        """``JobListing`` fields mapped from ``job_posting``; fields the
+        posting does not provide are left out."""
+        if self.job_posting is None:
+            return {}
+        return map_job_posting(self.job_posting)
+
+    def job_posting_extractors(self, *names: str) -> dict[str, Callable[[], Any]]:
+        """Extractors reading ``names`` from ``job_posting_fields``, for use
+        with ``build_listing``."""
+        return {
+            name: (lambda name=name: self.job_posting_fields.get(name))
+            for name in names
+        }
+
+
+def partial_listing(data: dict[str, Any]) -> JobListing:
+    """Build a ``JobListing`` holding only ``data``, validating each value on
+    its own. Fields missing from ``data`` are ``None``, required ones too,
+    and only the fields in ``data`` count as set."""
+    listing = JobListing.model_construct(set(), **dict.fromkeys(_REQUIRED_FIELDS))
+    for name, value in data.items():
+        JobListing.__pydantic_validator__.validate_assignment(listing, name, value)
+    return listing
+
+
+def build_listing(
+    extractors: dict[str, Callable[[], Any]],
+    fields: Optional[Collection[str]] = None,
+) -> JobListing:
+    """Run ``extractors`` (field name -> zero-argument extractor) and build a
+    ``JobListing`` from the results.
+
+    With ``fields``, only the extractors for those fields run and the result
+    is a ``partial_listing``, in which fields that were not requested are
+    ``None``, required ones included.
+    """
+    if fields is None:
+        values = {name: extract() for name, extract in extractors.items()}
+        with metrics.span("validate"):
+            return JobListing(**values)
+
+    unknown = set(fields) - JobListing.model_fields.keys()
+    if unknown:
+        raise ValueError(f"Unknown JobListing fields: {', '.join(sorted(unknown))}")
+    values = {name: extractors[name]() for name in fields if name in extractors}
+    with metrics.span("validate"):
+        return partial_listing(values)
+
+
+def build_compact(extractors: dict[str, Callable[[], Any]]) -> CompactJobListing:
+    """Like ``build_listing``, but build a ``CompactJobListing``."""
+    return CompactJobListing.from_values(
+        {name: extract() for name, extract in extractors.items()}
+    )
+
+
+def _flatten_json_ld(data: Any) -> list[dict]:
+    if isinstance(data, list):
+        return [block for item in data for block in _flatten_json_ld(item)]
+    if not isinstance(data, dict):
+        return []
+    if "@graph" in data:
+        return _flatten_json_ld(data["@graph"])
+    return [data]
+
+
+def _to_iso_date(value: Any) -> Optional[str]:
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        return datetime.fromisoformat(value).date().isoformat()
+    except ValueError:
+        return value
+
+
+def _map_employment_type(value: Any) -> Optional[EmploymentType]:
+    values = value if isinstance(value, list) else [value]
+    for item in values:
+        if isinstance(item, str):
+            employment_type = SCHEMA_EMPLOYMENT_TYPES.get(item.upper())
+            if employment_type:
+                return employment_type
+    return None
+
+
+def _map_salary(base_salary: Any) -> tuple[Optional[str], Optional[str]]:
+    if not isinstance(base_salary, dict):
+        return None, None
+    currency = base_salary.get("currency")
+    value = base_salary.get("value")
+    if not isinstance(value, dict):
+        return (str(value) if value is not None else None), currency
+
+    amount = value.get("value")
+    if amount is None:
+        bounds = [value.get("minValue"), value.get("maxValue")]
+        amount = "-".join(str(bound) for bound in bounds if bound is not None)
+    if amount in (None, ""):
+        return None, currency
+    salary = str(amount)
+    unit = value.get("unitText")
+    if unit:
+        salary = f"{salary} per {unit.lower()}"
+    return salary, currency
+
+
+def map_job_posting(job_posting: dict) -> dict[str, Any]:
+    """Map a schema.org ``JobPosting`` onto ``JobListing`` field names."""
+    organization = job_posting.get("hiringOrganization")
+    salary, currency = _map_salary(job_posting.get("baseSalary"))
+    description = job_posting.get("description")
+
+    fields = {
+        "job_title": job_posting.get("title"),
+        "company_name": (
+            organization.get("name") if isinstance(organization, dict) else organization
+        ),
+        "job_description": html_to_text(unescape(description)) if description else None,
+        "employment_type": _map_employment_type(job_posting.get("employmentType")),
+        "salary": salary,
+        "currency": currency,
+        "job_posting_date": _to_iso_date(job_posting.get("datePosted")),
+        "job_expiry_date": _to_iso_date(job_posting.get("validThrough")),
+    }
+    return {name: value for name, value in fields.items() if value}
@@ -0,0 +1,283 @@
+import re
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+from selectolax.parser import Node
+
+from jobdog.exceptions import ParserError
+
+if TYPE_CHECKING:
+    from jobdog.providers.base import ParseContext
+
+# a tag, classes and an ID, e.g. "div.job__description.body"; these are
+# matched against nodes in Python, anything else is left to selectolax
+SIMPLE_SELECTOR_RE = re.compile(
+    r"^(?P<tag>[a-zA-Z][\w-]*)?(?P<qualifiers>(?:[.#][\w-]+)*)$"
+)
+
+# the source name lookups of the page's JSON-LD ``JobPosting`` are reported as
+JOB_POSTING = "JSON-LD JobPosting"
+
+
+def node_text(node: Node) -> str:
+    return node.text().strip()
+
+
+@dataclass(frozen=True)
+class Field:
+    """How to extract one ``JobListing`` field.
+
+    Sources are tried in order, moving on whenever one yields nothing (no
+    match, or a falsy result):
+
+    - ``job_posting``: the value the page's schema.org ``JobPosting`` gives
+      for the field
+    - ``selectors``: CSS selectors, the first node each matches in document
+      order
+    - ``labels``: the value of the spec's ``LabelMap`` for the first label
+      containing one of these strings, ignoring case
+
+    Nodes become values through ``process`` (default: their stripped text)
+    or, with ``attribute``, by reading that attribute. A ``required`` field
+    that yields nothing raises ``ParserError``.
+    """
+
+    selectors: tuple[str, ...] = ()
+    labels: tuple[str, ...] = ()
+    attribute: Optional[str] = None
+    process: Callable[[Node], Any] = node_text
+    job_posting: bool = False
+    required: bool = False
+
+
+@dataclass(frozen=True)
+class LabelMap:
+    """A list of label/value pairs on the page, such as LinkedIn's job
+    criteria: every ``items`` node holds a ``label`` node and a ``value``
+    node. The whole list is read in one pass and looked up by label."""
+
+    items: str
+    label: str
+    value: str
+
+
+class _SimpleSelector:
+    """A selector group made of simple selectors only, matched in Python."""
+
+    def __init__(self, selector: str) -> None:
+        self.parts = []
+        for part in selector.split(","):
+            match = SIMPLE_SELECTOR_RE.match(part.strip())
+            if match is None or not part.strip():
+                raise ValueError(f"Not a simple selector: {part!r}")
+            qualifiers = re.findall(r"[.#][\w-]+", match.group("qualifiers"))
+            self.parts.append(
+                (
+                    (match.group("tag") or "").lower() or None,
+                    frozenset(q[1:] for q in qualifiers if q[0] == "."),
+                    next((q[1:] for q in qualifiers if q[0] == "#"), None),
+                )
+            )
+
+    def count(self, node: Node) -> int:
+        """How many of the group's selectors ``node`` matches."""
+        attributes = None
+        matched = 0
+        for tag, classes, node_id in self.parts:
+            if tag is not None and node.tag != tag:
+                continue
+            if attributes is None:
+                attributes = node.attributes
+            if classes and not classes.issubset(
+                (attributes.get("class") or "").split()
+            ):
+                continue
+            if node_id is not None and attributes.get("id") != node_id:
+                continue
+            matched += 1
+        return matched
+
+
+def _compile(selector: str) -> Optional[_SimpleSelector]:
+    try:
+        return _SimpleSelector(selector)
+    except ValueError:
+        return None
+
+
+class ExtractionSpec:
+    """Declarative extraction for a parser: a ``Field`` per ``JobListing``
+    field and an optional ``LabelMap``. Set it as ``BaseParser.spec`` and the
+    default ``extractors`` evaluates it.
+
+    The spec is compiled once. Per document, every simple selector
+    (``tag.class#id`` and groups of them) and the label items are found in a
+    single query over the tree, and matched nodes are assigned to selectors
+    in Python; selectolax cannot report which selector of a group matched a
+    node. Other selectors, e.g. with combinators or ``:nth-child``, are
+    queried on their own, and only when their field gets to them.
+
+    The combined query lists matches per selector of the group, not in
+    document order, so a node matching two selectors shows up twice and
+    may come before the first match of either. Results are only taken from
+    it for selectors none of whose nodes matched another selector; the
+    others are queried on their own too.
+    """
+
+    def __init__(
+        self, fields: dict[str, Field], label_map: Optional[LabelMap] = None
+    ) -> None:
+        self.fields = fields
+        self.label_map = label_map
+        selectors = [
+            selector for field in fields.values() for selector in field.selectors
+        ]
+        if label_map is not None:
+            selectors.append(label_map.items)
+        self._simple = {}
+        for selector in dict.fromkeys(selectors):
+            compiled = _compile(selector)
+            if compiled is not None:
+                self._simple[selector] = compiled
+        self._query = ", ".join(self._simple)
+
+    def extractors(self, context: "ParseContext") -> dict[str, Callable[[], Any]]:
+        document = SpecDocument(self, context)
+        return {name: (lambda name=name: document.value(name)) for name in self.fields}
+
+
+class SpecDocument:
+    """An ``ExtractionSpec`` evaluated on one page. The shared query and the
+    label map are run on first use."""
+
+    # gets every lookup when set, see ``jobdog.profiling.ParserProfiler``
+    observer: Optional["LookupObserver"] = None
+
+    def __init__(self, spec: ExtractionSpec, context: "ParseContext") -> None:
+        self.spec = spec
+        self.context = context
+        self._first: Optional[dict[str, Node]] = None
+        self._items: list[Node] = []
+        # selectors whose nodes also matched another selector
+        self._overlapping: set[str] = set()
+        self._labels: Optional[list[tuple[str, Node]]] = None
+
+    def _scan(self) -> dict[str, Node]:
+        if self._first is None:
+            started = time.perf_counter()
+            first: dict[str, Node] = {}
+            items_selector = self.spec.label_map.items if self.spec.label_map else None
+            nodes = self.context.tree.css(self.spec._query) if self.spec._query else []
+            for node in nodes:
+                matched = []
+                for selector, compiled in self.spec._simple.items():
+                    count = compiled.count(node)
+                    if count:
+                        matched.append(selector)
+                        if count > 1:
+                            self._overlapping.add(selector)
+                if len(matched) > 1:
+                    self._overlapping.update(matched)
+                for selector in matched:
+                    if selector == items_selector:
+                        self._items.append(node)
+                    first.setdefault(selector, node)
+            self._first = first
+            if self.observer is not None:
+                self.observer.scan(
+                    self.spec._query, time.perf_counter() - started, bool(nodes)
+                )
+        return self._first
+
+    def first(self, selector: str) -> Optional[Node]:
+        """The first node matching ``selector``, as ``css_first`` finds it."""
+        if selector in self.spec._simple:
+            first = self._scan()
+            if selector not in self._overlapping:
+                return first.get(selector)
+        return self.context.tree.css_first(selector)
+
+    def labels(self) -> list[tuple[str, Node]]:
+        """``(label, value node)`` pairs of the label map, in page order."""
+        if self._labels is None:
+            label_map = self.spec.label_map
+            if label_map.items in self.spec._simple:
+                self._scan()
+            if (
+                label_map.items in self.spec._simple
+                and label_map.items not in self._overlapping
+            ):
+                items = self._items
+            else:
+                items = self.context.tree.css(label_map.items)
+            self._labels = []
+            for item in items:
+                label = item.css_first(label_map.label)
+                value = item.css_first(label_map.value)
+                if label is not None and value is not None:
+                    self._labels.append((node_text(label).lower(), value))
+        return self._labels
+
+    def value(self, name: str) -> Any:
+        field = self.spec.fields[name]
+        observer = self.observer
+        if field.job_posting:
+            started = time.perf_counter()
+            value = self.context.job_posting_fields.get(name)
+            if observer is not None:
+                observer.lookup(JOB_POSTING, time.perf_counter() - started, bool(value))
+            if value:
+                return value
+        for selector in field.selectors:
+            if observer is not None and selector in self.spec._simple:
+                # the shared query is reported on its own
+                self._scan()
+            started = time.perf_counter()
+            node = self.first(selector)
+            value = None if node is None else self._read(field, node)
+            if observer is not None:
+                observer.lookup(selector, time.perf_counter() - started, bool(value))
+            if value:
+                return value
+        if field.labels:
+            if observer is not None:
+                self.labels()
+            started = time.perf_counter()
+            node = next(
+                (
+                    node
+                    for label, node in self.labels()
+                    if any(needle.lower() in label for needle in field.labels)
+                ),
+                None,
+            )
+            value = None if node is None else self._read(field, node)
+            if observer is not None:
+                observer.lookup(
+                    "label: " + " | ".join(field.labels),
+                    time.perf_counter() - started,
+                    bool(value),
+                )
+            if value:
+                return value
+        if field.required:
+            raise ParserError(f"Failed to extract {name.replace('_', ' ')}")
+        return None
+
+    @staticmethod
+    def _read(field: Field, node: Node) -> Any:
+        if field.attribute:
+            return node.attributes.get(field.attribute)
+        return field.process(node)
+
+
+class LookupObserver:
+    """Told about every lookup a ``SpecDocument`` makes."""
+
+    def scan(self, query: str, seconds: float, hit: bool) -> None:
+        """The shared query of the simple selectors ran."""
+
+    def lookup(self, source: str, seconds: float, hit: bool) -> None:
+        """A field tried ``source`` (a selector, a label or ``JOB_POSTING``);
+        ``hit`` when it yielded a value."""
@@ -1,17 +1,76 @@
 from typing import Optional
-from selectolax.parser import HTMLParser
+from selectolax.parser import Node
 from urllib.parse import urlparse, urlunparse
-from jobdog.exceptions import JobDogSanitizeUrlError, ParserError
+from jobdog.exceptions import JobDogSanitizeUrlError
 from jobdog.logger import debug, info, warn, error
-from jobdog.models.job_listing import JobListing
 from jobdog.providers.base import BaseParser
+from jobdog.providers.extraction import ExtractionSpec, Field
+from jobdog.providers.text import html_to_text
 from jobdog.providers.utils import register_parser
 
 
+def _description_text(node: Node) -> str:
+    # h-prefixed listings put the location and the apply button in the body
+    return html_to_text(node, skip_classes=("location", "jix_onlineapplication_button"))
+
+
+def _location(node: Node) -> Optional[list[str]]:
+    location = node.text().strip()
+    return [location] if location else None
+
+
 @register_parser("jobindex.dk")
 class JobIndexParser(BaseParser):
+    version = 2
+    url_patterns = (r"^/jobannonce/(?P<job_id>[rh]\d+)",)
+    stream_markers = {
+        "job_title": r"<h1[^>]*>.*?</h1>",
+        # r-prefixed listings, then h-prefixed ones
+        "company_name": (
+            r"class=\"jobtext-jobad__company\"[^>]*>[^<]*<"
+            r"|class=\"[^\"]*col-xl-4[^\"]*\">\s*<p><b>[^<]*</b>"
+        ),
+        "job_description": (
+            r"class=\"jobtext-jobad__body\".*?</section>"
+            r"|class=\"[^\"]*col-xl-7[^\"]*\">.*?class=\"[^\"]*col-xl-4"
+        ),
+        "location": (
+            r"class=\"jobtext-jobad__place-item\".*?</div>"
+            r"|class=\"location[^\"]*\">\s*<p>.*?</p>"
+        ),
+    }
+
+    spec = ExtractionSpec(
+        {
+            "job_title": Field(selectors=("h1",), required=True),
+            "company_name": Field(
+                selectors=(
+                    # h-prefixed listings
+                    "div.col-xl-4:nth-child(1) > p:nth-child(1) > b:nth-child(1)",
+                    # r-prefixed listings
+                    ".jobtext-jobad__company, span.jobtext-jobad__company",
+                ),
+                required=True,
+            ),
+            "job_description": Field(
+                selectors=(
+                    # r-prefixed listings
+                    ".jobtext-jobad__body",
+                    # h-prefixed listings
+                    ".col-md-10.offset-md-1.col-xl-7.offset-xl-0.pt-0.pt-md-5.mt-5.px-3.px-xxl-0",
+                ),
+                process=_description_text,
+                required=True,
+            ),
+            "location": Field(
+                selectors=(".jobtext-jobad__place-item", ".location > p:nth-child(1)"),
+                process=_location,
+            ),
+        }
+    )
+
     def sanitize_url(self, url: str) -> str:
-        debug(f"Sanitizing JobIndex job URL: {url}")
+        debug("Sanitizing JobIndex job URL: %s", url)
         parsed_url = urlparse(url)
         path_parts = parsed_url.path.split("/")
 
@@ -29,82 +88,11 @@ class JobIndexParser(BaseParser):
             new_path = f"/jobannonce/{job_id}"
             new_parsed = parsed_url._replace(path=new_path, query="", fragment="")
             sanitized_url = urlunparse(new_parsed)
-            info(f"Sanitized JobIndex job URL: {sanitized_url}")
+            info("Sanitized JobIndex job URL: %s", sanitized_url)
             return sanitized_url
 
         except Exception as e:
-            error(f"Error sanitizing JobIndex job URL: {url}. Error: {str(e)}")
+            error("Error sanitizing JobIndex job URL: %s. Error: %s", url, e)
             raise JobDogSanitizeUrlError(
                 f"Error sanitizing JobIndex job URL: {url}. Error: {str(e)}"
             )
-
-    def parse_html(self, html: str) -> JobListing:
-        tree = HTMLParser(html)
-
-        job_title = self._extract_job_title(tree)
-        company_name = self._extract_company_name(tree)
-        job_description = self._extract_job_description(tree)
-        location = self._extract_location(tree)
-        if not all([job_title, company_name, job_description]):
-            raise ParserError("Failed to extract required fields from HTML")
-
-        return JobListing(
-            job_title=job_title,
-            company_name=company_name,
-            job_description=job_description,
-            location=location,
-        )
-
-    def _extract_job_title(self, tree: HTMLParser) -> str:
-        title_elem = tree.css_first("h1")
-        if title_elem:
-            return title_elem.text().strip()
-        raise ParserError("Failed to extract job title")
-
-    def _extract_company_name(self, tree: HTMLParser) -> str:
-        # h-prefixed listings
-        footer_company_elem = tree.css_first(
-            "div.col-xl-4:nth-child(1) > p:nth-child(1) > b:nth-child(1)"
-        )
-        if footer_company_elem:
-            return footer_company_elem.text().strip()
-        # r-prefixed listings
-        company_elem = tree.css_first(
-            ".jobtext-jobad__company, span.jobtext-jobad__company"
-        )
-        if company_elem:
-            return company_elem.text().strip()
-
-        raise ParserError("Failed to extract company name")
-
-    def _extract_job_description(self, tree: HTMLParser) -> str:
-        # r-prefixed listings
-        description_elem = tree.css_first(".jobtext-jobad__body")
-
-        # h-prefixed listings
-        if not description_elem:
-            description_elem = tree.css_first(
-                ".col-md-10.offset-md-1.col-xl-7.offset-xl-0.pt-0.pt-md-5.mt-5.px-3.px-xxl-0"
-            )
-
-        if description_elem:
-            description = ""
-            for child in description_elem.iter():
-                if child.tag in ["p", "ul", "ol", "h2", "h3", "h4"]:
-                    description += child.text().strip() + "\n\n"
-            return description.strip()
-
-        raise ParserError("Failed to extract job description")
-
-    def _extract_location(self, tree: HTMLParser) -> Optional[list[str]]:
-        location_elem = tree.css_first(".jobtext-jobad__place-item")
-        if location_elem:
-            location = location_elem.text().strip()
-            return [location] if location else None
-
-        location_elem = tree.css_first(".location > p:nth-child(1)")
-        if location_elem:
-            location = location_elem.text().strip()
-            return [location] if location else None
-
-        return None
@@ -0,0 +1,189 @@
+import re
+import threading
+from collections import defaultdict
+from typing import TYPE_CHECKING, Iterable, NamedTuple, Optional, Type
+
+from jobdog.exceptions import UnsupportedProviderError
+
+if TYPE_CHECKING:
+    from jobdog.providers.base import BaseParser
+
+# scheme, optional userinfo, host, optional port, then path and query
+URL_RE = re.compile(
+    r"^(?:[a-zA-Z][a-zA-Z0-9+.-]*:)?//(?:[^@/?#]*@)?"
+    r"(?P<host>[^:/?#]*)(?::\d*)?(?P<rest>[^#]*)"
+)
+
+MAX_MEMOIZED_HOSTS = 10_000
+
+
+class Route(NamedTuple):
+    domain: str
+    parser_class: Type["BaseParser"]
+    job_id: Optional[str]
+
+
+def split_url(url: str) -> tuple[str, str]:
+    """Return the lowercased host of ``url`` and its path plus query."""
+    match = URL_RE.match(url)
+    if match is None:
+        return "", ""
+    return match.group("host").lower().rstrip("."), match.group("rest")
+
+
+class Router:
+    """Routes URLs to the parser registered for the longest matching host
+    suffix, e.g. ``job-boards.eu.greenhouse.io`` to ``greenhouse.io`` or
+    ``www.reed.co.uk`` to ``reed.co.uk``.
+
+    Registered domains are kept in a trie of reversed host labels, and
+    resolved hosts are memoized since batches repeat the same few hosts. The
+    job ID comes from the first of the parser's ``url_patterns`` that
+    matches the path and query.
+    """
+
+    def __init__(self, parser_map: dict[str, Type["BaseParser"]]) -> None:
+        self._trie: dict = {}
+        for domain in parser_map:
+            node = self._trie
+            for label in reversed(domain.lower().split(".")):
+                node = node.setdefault(label, {})
+            node[None] = domain
+        self._parsers = dict(parser_map)
+        self._patterns = {
+            domain: [re.compile(pattern) for pattern in parser_class.url_patterns]
+            for domain, parser_class in parser_map.items()
+        }
+        self._hosts: dict[str, Optional[str]] = {}
+
+    def domain_for_host(self, host: str) -> Optional[str]:
+        try:
+            return self._hosts[host]
+        except KeyError:
+            pass
+        node = self._trie
+        domain = None
+        for label in reversed(host.split(".")):
+            node = node.get(label)
+            if node is None:
+                break
+            domain = node.get(None, domain)
+        if len(self._hosts) >= MAX_MEMOIZED_HOSTS:
+            self._hosts.clear()
+        self._hosts[host] = domain
+        return domain
+
+    def match(self, url: str) -> Route:
+        """Return the provider domain, parser class and job ID for ``url``.
+
+        ``job_id`` is ``None`` when none of the parser's ``url_patterns``
+        match. Raises ``UnsupportedProviderError`` for unknown hosts.
+        """
+        host, rest = split_url(url)
+        domain = self.domain_for_host(host)
+        if domain is None:
+            raise UnsupportedProviderError(f"No parser found for domain: {host}")
+
+        job_id = None
+        for pattern in self._patterns[domain]:
+            match = pattern.search(rest)
+            if match:
+                job_id = match.group("job_id")
+                break
+        return Route(domain, self._parsers[domain], job_id)
+
+    def classify(self, urls: Iterable[str]) -> dict[Optional[str], list[str]]:
+        """Bucket ``urls`` by provider domain; unsupported URLs go under
+        ``None``."""
+        buckets = defaultdict(list)
+        for url in urls:
+            buckets[self.domain_for_host(split_url(url)[0])].append(url)
+        return dict(buckets)
+
+
+def _create_parser(parser_class: Type["BaseParser"]) -> "BaseParser":
+    parser = parser_class()
+    parser.setup()
+    return parser
+
+
+class ParserRegistry(dict):
+    """``PARSER_MAP``: a dict of provider domain to parser class that keeps a
+    ``Router`` over its current registrations, rebuilt after any change, and
+    the parser instances handed out by ``instance``."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._router: Optional[Router] = None
+        self._instances: dict[str, "BaseParser"] = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def instance(self, domain: str) -> "BaseParser":
+        """Return the parser for ``domain``, created and ``setup()`` on first
+        use and shared from then on; parsers that are not ``thread_safe``
+        get one instance per thread."""
+        parser_class = self[domain]
+        if not parser_class.thread_safe:
+            instances = self._local.__dict__.setdefault("instances", {})
+            parser = instances.get(domain)
+            if type(parser) is not parser_class:
+                parser = instances[domain] = _create_parser(parser_class)
+            return parser
+
+        parser = self._instances.get(domain)
+        if type(parser) is not parser_class:
+            with self._lock:
+                parser = self._instances.get(domain)
+                if type(parser) is not parser_class:
+                    parser = self._instances[domain] = _create_parser(parser_class)
+        return parser
+
+    @property
+    def router(self) -> Router:
+        router = self._router
+        if router is None:
+            with self._lock:
+                router = self._router = Router(self)
+        return router
+
+    def _changed(self) -> None:
+        with self._lock:
+            self._router = None
+            self._instances = {}
+
+    def __setitem__(self, key, value) -> None:
+        super().__setitem__(key, value)
+        self._changed()
+
+    def __delitem__(self, key) -> None:
+        super().__delitem__(key)
+        self._changed()
+
+    def clear(self) -> None:
+        super().clear()
+        self._changed()
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self._changed()
+        return value
+
+    def popitem(self):
+        item = super().popitem()
+        self._changed()
+        return item
+
+    def setdefault(self, key, default=None):
+        value = super().setdefault(key, default)
+        self._changed()
+        return value
+
+    def update(self, *args, **kwargs) -> None:
+        super().update(*args, **kwargs)
+        self._changed()
+
+    def __ior__(self, other):
+        result = super().__ior__(other)
+        self._changed()
+        return result
@@ -0,0 +1,286 @@
+import re
+from html import unescape
+from typing import Collection, Optional, Union
+
+from selectolax.parser import HTMLParser, Node
+
+# elements that start and end a paragraph of their own
+BLOCK_TAGS = frozenset(
+    {
+        "address",
+        "article",
+        "aside",
+        "blockquote",
+        "dd",
+        "div",
+        "dl",
+        "dt",
+        "figcaption",
+        "figure",
+        "footer",
+        "h1",
+        "h2",
+        "h3",
+        "h4",
+        "h5",
+        "h6",
+        "header",
+        "hr",
+        "main",
+        "p",
+        "pre",
+        "section",
+        "table",
+        "td",
+        "th",
+        "tr",
+    }
+)
+LIST_TAGS = frozenset({"ul", "ol"})
+SKIP_TAGS = frozenset(
+    {"script", "style", "noscript", "template", "svg", "button", "head", "_comment"}
+)
+
+# tags ``_fragment_text`` handles on the string, without a tree; the HTML
+# parser moves table parts around and drops the first newline of a <pre>, so
+# those are left to the tree
+_FLAT_BLOCK_TAGS = BLOCK_TAGS - {"pre", "table", "td", "th", "tr"}
+_INLINE_TAGS = frozenset(
+    {
+        "a",
+        "abbr",
+        "b",
+        "bdi",
+        "bdo",
+        "cite",
+        "code",
+        "data",
+        "dfn",
+        "em",
+        "font",
+        "i",
+        "kbd",
+        "mark",
+        "q",
+        "s",
+        "samp",
+        "small",
+        "span",
+        "strong",
+        "sub",
+        "sup",
+        "time",
+        "u",
+        "var",
+    }
+)
+_HEADINGS = frozenset({"h1", "h2", "h3", "h4", "h5", "h6"})
+_NOTHING: frozenset[str] = frozenset()
+# open elements the HTML parser closes when one of these tags starts inside
+# them; ``_fragment_text`` gives up instead
+_CLOSED_BY = {
+    **dict.fromkeys(_HEADINGS, _HEADINGS),
+    "dd": frozenset({"dd", "dt"}),
+    "dt": frozenset({"dd", "dt"}),
+    "a": frozenset({"a"}),
+}
+_TAG_RE = re.compile(r"<(/?)([a-zA-Z][a-zA-Z0-9]*)\b(?:[^>\"']|\"[^\"]*\"|'[^']*')*>")
+
+BULLET = "• "
+INDENT = "  "
+# stands in for <br> until a paragraph is flushed; the HTML parser replaces
+# NUL characters in the input, so it cannot come from the page
+_LINE_BREAK = "\0"
+
+
+def _collapse(text: str) -> str:
+    if _LINE_BREAK in text:
+        lines = (" ".join(line.split()) for line in text.split(_LINE_BREAK))
+        return "\n".join(line for line in lines if line)
+    # splitting and joining is the costly part, and most paragraphs have no
+    # runs of whitespace to collapse
+    if "\n" in text or "  " in text or "\t" in text:
+        return " ".join(text.split())
+    return text.strip()
+
+
+class _TextWriter:
+    """Walks a tree once. Inline text is gathered until the enclosing block
+    ends and finished blocks are appended to ``parts``, which is joined once
+    at the end."""
+
+    def __init__(self, skip_classes: Collection[str] = ()) -> None:
+        self.skip_classes = frozenset(skip_classes)
+        self.parts: list[str] = []
+        self.inline: list[str] = []
+        self.list_depth = 0
+        # bullet for the next block, set when a list item opens
+        self.bullet = ""
+        self.previous_in_list = False
+
+    def walk(self, node: Node) -> None:
+        inline = self.inline
+        for child in node.iter(include_text=True):
+            tag = child.tag
+            if tag == "-text":
+                text = child.text_content
+                # whitespace between blocks would only be collapsed away
+                if inline or not text.isspace():
+                    inline.append(text)
+            elif tag in BLOCK_TAGS:
+                if not self.skip_classes or not self._skipped(child):
+                    if inline:
+                        self.flush()
+                    self._block(child)
+            elif tag == "li":
+                if inline:
+                    self.flush()
+                self.bullet = INDENT * (self.list_depth - 1) + BULLET
+                self._block(child)
+                self.bullet = ""
+            elif tag in LIST_TAGS:
+                if inline:
+                    self.flush()
+                self.list_depth += 1
+                self.walk(child)
+                if inline:
+                    self.flush()
+                self.list_depth -= 1
+            elif tag == "br":
+                inline.append(_LINE_BREAK)
+            elif tag not in SKIP_TAGS and not (
+                self.skip_classes and self._skipped(child)
+            ):
+                self.walk(child)
+
+    def _block(self, node: Node) -> None:
+        # most paragraphs and list items hold nothing but text
+        first = node.child
+        if first is not None and first.next is None and first.tag == "-text":
+            self.emit(first.text_content)
+        else:
+            self.walk(node)
+            if self.inline:
+                self.flush()
+
+    def _skipped(self, node: Node) -> bool:
+        return not self.skip_classes.isdisjoint(
+            (node.attributes.get("class") or "").split()
+        )
+
+    def flush(self) -> None:
+        self.emit("".join(self.inline))
+        self.inline.clear()
+
+    def emit(self, text: str) -> None:
+        text = _collapse(text)
+        if not text:
+            return
+        parts = self.parts
+        in_list = self.list_depth > 0
+        if parts:
+            parts.append("\n" if in_list and self.previous_in_list else "\n\n")
+        if self.bullet:
+            parts.append(self.bullet)
+            self.bullet = ""
+        elif in_list:
+            # a further paragraph of the same item
+            parts.append(INDENT * self.list_depth)
+        parts.append(text)
+        self.previous_in_list = in_list
+
+    def text(self) -> str:
+        if self.inline:
+            self.flush()
+        return "".join(self.parts)
+
+
+def _fragment_text(html: str) -> Optional[str]:
+    """``html_to_text`` of a fragment worked out from its tags, without
+    building a tree. Covers well-nested paragraphs, headings, inline markup
+    and lists of plain items, which is what most descriptions in JSON-LD are
+    made of; None for anything the HTML parser would have to repair or that
+    needs the tree (nested lists, blocks in list items, tables, comments,
+    scripts, a stray ``<``, ...)."""
+    # the HTML parser drops whitespace before the body starts
+    pieces = _TAG_RE.split(html.lstrip(" \t\n\r\f"))
+    # text, "/" or "", tag name, text, ...
+    if len(pieces) // 3 != html.count("<") or _LINE_BREAK in html:
+        return None
+    writer = _TextWriter()
+    inline = writer.inline
+    open_tags: list[str] = []
+    for i in range(0, len(pieces) - 1, 3):
+        text = unescape(pieces[i])
+        # as in ``_TextWriter.walk``
+        if inline or text and not text.isspace():
+            inline.append(text)
+        closing, tag = pieces[i + 1], pieces[i + 2].lower()
+        if tag == "br":
+            inline.append(_LINE_BREAK)
+        elif tag == "wbr" and not closing:
+            continue
+        elif closing:
+            if not open_tags or open_tags.pop() != tag:
+                return None
+            if tag not in _INLINE_TAGS:
+                if inline:
+                    writer.flush()
+                if tag in LIST_TAGS:
+                    writer.list_depth = 0
+                writer.bullet = ""
+        elif not _CLOSED_BY.get(tag, _NOTHING).isdisjoint(open_tags):
+            return None
+        elif tag in _INLINE_TAGS:
+            open_tags.append(tag)
+        else:
+            # blocks in paragraphs, list items and nested lists
+            if "p" in open_tags or writer.list_depth and tag != "li":
+                return None
+            if inline:
+                writer.flush()
+            if tag == "li":
+                if not open_tags or open_tags[-1] not in LIST_TAGS:
+                    return None
+                writer.bullet = BULLET
+            elif tag in LIST_TAGS:
+                writer.list_depth = 1
+            elif tag not in _FLAT_BLOCK_TAGS:
+                return None
+            if tag != "hr":
+                open_tags.append(tag)
+    text = unescape(pieces[-1])
+    if inline or text and not text.isspace():
+        inline.append(text)
+    return writer.text()
+
+
+def html_to_text(
+    html: Union[str, Node, None], skip_classes: Collection[str] = ()
+) -> str:
+    """Plain text of an HTML fragment, or of a node's contents.
+
+    Blocks (paragraphs, headings, ...) are separated by blank lines, list
+    items become bullets on lines of their own, indented per nesting level,
+    and ``<br>`` becomes a line break. Other whitespace is collapsed, and
+    scripts, styles and buttons are left out, as are elements with any of
+    ``skip_classes``.
+    """
+    if html is None:
+        return ""
+    node: Optional[Node]
+    if isinstance(html, str):
+        if "<" not in html and "&" not in html:
+            return _collapse(html)
+        if not skip_classes:
+            text = _fragment_text(html)
+            if text is not None:
+                return text
+        node = HTMLParser(html).body
+        if node is None:
+            return ""
+    else:
+        node = html
+    writer = _TextWriter(skip_classes)
+    writer.walk(node)
+    return writer.text()
@@ -1,26 +1,56 @@
-from urllib.parse import urlparse
-from typing import Type
-from jobdog.exceptions import UnsupportedProviderError
+import importlib
+from typing import Iterable, Optional, Type
 from jobdog.providers.base import BaseParser
+from jobdog.providers.router import ParserRegistry, Route
 
-PARSER_MAP: dict[str, Type[BaseParser]] = {}
+PARSER_MAP: ParserRegistry = ParserRegistry()
+# domain -> parser class registered by each module, for ``load_parsers``
+_MODULE_PARSERS: dict[str, dict[str, Type[BaseParser]]] = {}
+
+BUILTIN_PARSER_MODULES = (
+    "jobdog.providers.greenhouse",
+    "jobdog.providers.jobindex",
+    "jobdog.providers.linkedin",
+)
 
 
 def register_parser(domain: str):
     def decorator(cls):
         PARSER_MAP[domain] = cls
+        _MODULE_PARSERS.setdefault(cls.__module__, {})[domain] = cls
         return cls
 
     return decorator
 
 
-def get_parser(url: str) -> BaseParser:
-    parsed_url = urlparse(url)
-    domain = parsed_url.netloc.lower()
+def load_parsers(modules: Iterable[str] = BUILTIN_PARSER_MODULES) -> None:
+    """Import parser modules so their ``register_parser`` calls populate
+    ``PARSER_MAP``, e.g. in a freshly started worker process. Parsers of
+    modules imported before are registered again if their domain has been
+    removed from ``PARSER_MAP`` since."""
+    for module in modules:
+        importlib.import_module(module)
+        for domain, parser_class in _MODULE_PARSERS.get(module, {}).items():
+            if domain not in PARSER_MAP:
+                PARSER_MAP[domain] = parser_class
+
+
+def route(url: str) -> Route:
+    """Return the provider domain, parser class and job ID for ``url`` in one
+    pass; see ``Router.match``."""
+    return PARSER_MAP.router.match(url)
+
 
-    main_domain = ".".join(domain.split(".")[-2:])
+def classify_urls(urls: Iterable[str]) -> dict[Optional[str], list[str]]:
+    """Bucket ``urls`` by provider domain, with unsupported ones under
+    ``None``."""
+    return PARSER_MAP.router.classify(urls)
 
-    parser_class = PARSER_MAP.get(main_domain)
-    if parser_class is None:
-        raise UnsupportedProviderError(f"No parser found for domain: {main_domain}")
-    return parser_class()
+
+def get_provider_domain(url: str) -> str:
+    return route(url).domain
+
+
+def get_parser(url: str) -> BaseParser:
+    """Return the shared parser instance for ``url``'s provider."""
+    return PARSER_MAP.instance(route(url).domain)
@@ -0,0 +1,118 @@
+import asyncio
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+from httpx import Response
+
+from jobdog.exceptions import UnsupportedProviderError
+from jobdog.providers.utils import PARSER_MAP, get_provider_domain
+
+RETRY_STATUS_CODES = frozenset({429, 503})
+
+
+class TokenBucket:
+    """Token bucket allowing ``rate`` requests per second with bursts of up
+    to ``burst`` requests.
+
+    Callers reserve a slot and then wait for it outside the lock, so the
+    bucket can be shared by threads and by coroutines alike.
+    """
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._interval = 1 / rate
+        self._next_slot = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next_slot, now)
+            self._next_slot = slot + self._interval
+            # up to ``burst`` slots may be handed out ahead of time
+            return max(0.0, slot - now - (self.burst - 1) * self._interval)
+
+    def acquire(self) -> None:
+        delay = self._reserve()
+        if delay:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        delay = self._reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+    def pause(self, seconds: float) -> None:
+        """Hand out no tokens for the next ``seconds``, e.g. after a 429."""
+        with self._lock:
+            resume_at = time.monotonic() + seconds + (self.burst - 1) * self._interval
+            self._next_slot = max(self._next_slot, resume_at)
+
+
+class RateLimiters:
+    """One ``TokenBucket`` per provider domain, configured from the
+    ``requests_per_second`` and ``burst`` attributes of its registered parser.
+    Providers without ``requests_per_second`` are not limited."""
+
+    def __init__(self) -> None:
+        self._buckets: dict[str, Optional[TokenBucket]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> Optional[TokenBucket]:
+        try:
+            domain = get_provider_domain(url)
+        except UnsupportedProviderError:
+            return None
+        with self._lock:
+            if domain not in self._buckets:
+                parser_class = PARSER_MAP[domain]
+                rate = parser_class.requests_per_second
+                self._buckets[domain] = (
+                    TokenBucket(rate, parser_class.burst) if rate else None
+                )
+            return self._buckets[domain]
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a ``Retry-After`` header given either in seconds or as a date."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def get_retry_delay(
+    response: Response,
+    attempt: int,
+    max_retries: int,
+    backoff_factor: float,
+    max_backoff: float,
+) -> Optional[float]:
+    """Return how long to wait before retrying ``response``, or ``None`` if it
+    should not be retried.
+
+    A ``Retry-After`` header is honored as long as it is within
+    ``max_backoff``; otherwise the delay is exponential in ``attempt`` with
+    full jitter.
+    """
+    if response.status_code not in RETRY_STATUS_CODES or attempt >= max_retries:
+        return None
+    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+    if retry_after is not None:
+        return retry_after if retry_after <= max_backoff else None
+    return random.uniform(0, min(max_backoff, backoff_factor * 2**attempt))
@@ -0,0 +1,295 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+from jobdog.exceptions import (
+    FetchError,
+    JobDogSanitizeUrlError,
+    UnsupportedProviderError,
+)
+from jobdog.jobdog import GONE_STATUS_CODES, JobDog, Revalidation
+from jobdog.logger import logger
+from jobdog.models.job_listing import JobListing
+from jobdog.providers.utils import get_parser
+
+ACTIVE = "active"
+EXPIRED = "expired"
+GONE = "gone"
+
+
+@dataclass(frozen=True)
+class ListingState:
+    url: str
+    source_url: str
+    next_fetch_at: float
+    interval: float
+    fetched_at: Optional[float] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_hash: Optional[str] = None
+    expires_at: Optional[float] = None
+    checks: int = 0
+    changes: int = 0
+    status: str = ACTIVE
+
+
+class _Check(NamedTuple):
+    state: ListingState
+    result: Optional[Revalidation] = None
+    error: Optional[Exception] = None
+
+
+def content_hash(listing: JobListing) -> str:
+    """Hash of the parsed listing. Raw pages change on every request
+    (tracking parameters, CSRF tokens), so changes are detected on the
+    extracted fields instead."""
+    data = listing.model_dump_json(exclude={"job_listing_url"})
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+def expiry_timestamp(job_expiry_date: Optional[str]) -> Optional[float]:
+    """Unix time at which a listing with ``job_expiry_date`` expires; a bare
+    date expires at the end of that day (UTC)."""
+    if not job_expiry_date:
+        return None
+    try:
+        expires = datetime.fromisoformat(job_expiry_date)
+    except ValueError:
+        return None
+    if len(job_expiry_date) == 10:
+        expires += timedelta(days=1)
+    if expires.tzinfo is None:
+        expires = expires.replace(tzinfo=timezone.utc)
+    return expires.timestamp()
+
+
+class RecrawlScheduler:
+    """Re-polls known listings and yields the ones that changed.
+
+    Per sanitized URL it keeps, in a SQLite file at ``path``, when the
+    listing was last fetched, its ``ETag``/``Last-Modified`` validators, a
+    hash of the parsed listing and its expiry date. Every URL has its own
+    revisit interval: it starts at ``initial_interval``, shrinks by
+    ``backoff`` when a check finds a change and grows by the same factor
+    when it does not, within ``min_interval`` and ``max_interval``. Re-polls
+    are conditional requests made with ``JobDog.revalidate``, so unchanged
+    pages usually cost a ``304`` and no parsing. A check that fails is
+    retried after ``min_interval``. Listings past their ``job_expiry_date``
+    or answered with ``404``/``410`` are no longer polled.
+    """
+
+    def __init__(
+        self,
+        dog: JobDog,
+        path: str,
+        initial_interval: float = 86400,
+        min_interval: float = 3600,
+        max_interval: float = 14 * 86400,
+        backoff: float = 2,
+    ) -> None:
+        self.dog = dog
+        self.path = path
+        self.initial_interval = initial_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS listings (
+                    url TEXT PRIMARY KEY,
+                    source_url TEXT NOT NULL,
+                    next_fetch_at REAL NOT NULL,
+                    interval REAL NOT NULL,
+                    fetched_at REAL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    content_hash TEXT,
+                    expires_at REAL,
+                    checks INTEGER NOT NULL DEFAULT 0,
+                    changes INTEGER NOT NULL DEFAULT 0,
+                    status TEXT NOT NULL DEFAULT 'active'
+                )
+                """
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS listings_due"
+                " ON listings (status, next_fetch_at)"
+            )
+
+    def add(self, urls: Iterable[str], now: Optional[float] = None) -> int:
+        """Start tracking ``urls``, due right away. URLs already tracked and
+        unsupported or malformed URLs are skipped. Returns how many were
+        added."""
+        now = time.time() if now is None else now
+        rows = []
+        for url in urls:
+            try:
+                sanitized_url = get_parser(url).sanitize_url(url)
+            except (UnsupportedProviderError, JobDogSanitizeUrlError) as e:
+                logger.warning("Not scheduling %s: %s", url, e)
+                continue
+            rows.append((sanitized_url, url, now, self.initial_interval))
+        with self._lock, self._connection:
+            before = self._connection.total_changes
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO listings"
+                " (url, source_url, next_fetch_at, interval) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            return self._connection.total_changes - before
+
+    def get(self, url: str) -> Optional[ListingState]:
+        """The stored state of the listing with sanitized URL ``url``."""
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT {_COLUMNS} FROM listings WHERE url = ?", (url,)
+            ).fetchone()
+        return None if row is None else ListingState(*row)
+
+    def due(
+        self, now: Optional[float] = None, limit: Optional[int] = None
+    ) -> list[ListingState]:
+        """Active listings whose revisit time has come, most overdue first.
+        Listings found past their expiry date are marked ``expired``."""
+        now = time.time() if now is None else now
+        with self._lock, self._connection:
+            self._connection.execute(
+                "UPDATE listings SET status = ? WHERE status = ? AND expires_at <= ?",
+                (EXPIRED, ACTIVE, now),
+            )
+            rows = self._connection.execute(
+                f"SELECT {_COLUMNS} FROM listings"
+                " WHERE status = ? AND next_fetch_at <= ?"
+                " ORDER BY next_fetch_at LIMIT ?",
+                (ACTIVE, now, -1 if limit is None else limit),
+            ).fetchall()
+        return [ListingState(*row) for row in rows]
+
+    def next_due_at(self) -> Optional[float]:
+        """When the next active listing is due, or ``None`` if none are."""
+        with self._lock:
+            (next_fetch_at,) = self._connection.execute(
+                "SELECT MIN(next_fetch_at) FROM listings WHERE status = ?",
+                (ACTIVE,),
+            ).fetchone()
+        return next_fetch_at
+
+    def run_once(
+        self,
+        max_concurrency: int = 10,
+        limit: Optional[int] = None,
+        now: Optional[float] = None,
+    ) -> Iterator[JobListing]:
+        """Check every due listing and yield those that are new or changed
+        since the last check, most overdue first."""
+        now = time.time() if now is None else now
+        states = self.due(now, limit)
+        if not states:
+            return
+        logger.info("Re-crawling %s due listings", len(states))
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            for check in executor.map(self._check, states):
+                listing = self._record(check, now)
+                if listing is not None:
+                    yield listing
+
+    def run(
+        self,
+        max_concurrency: int = 10,
+        max_sleep: float = 300,
+        batch_size: int = 1000,
+    ) -> Iterator[JobListing]:
+        """Re-crawl forever, sleeping (at most ``max_sleep`` seconds at a
+        time) until the next listing is due. Due listings are checked
+        ``batch_size`` at a time, so a large backlog is not loaded at once."""
+        while True:
+            yield from self.run_once(max_concurrency, batch_size)
+            next_fetch_at = self.next_due_at()
+            delay = max_sleep if next_fetch_at is None else next_fetch_at - time.time()
+            time.sleep(min(max(delay, 0), max_sleep))
+
+    def _check(self, state: ListingState) -> _Check:
+        try:
+            return _Check(
+                state,
+                self.dog.revalidate(state.source_url, state.etag, state.last_modified),
+            )
+        except FetchError as e:
+            return _Check(state, error=e)
+
+    def _record(self, check: _Check, now: float) -> Optional[JobListing]:
+        """Store the outcome of ``check`` and return its listing if it is
+        new or changed."""
+        state, result = check.state, check.result
+        changed = False
+        values = {"fetched_at": now, "checks": state.checks + 1}
+        next_fetch_in = None
+        if result is None:
+            logger.warning("Error re-crawling %s: %s", state.url, check.error)
+            interval = state.interval
+            # retry soon, without counting the failure against the interval
+            next_fetch_in = self.min_interval
+        elif result.status_code in GONE_STATUS_CODES:
+            logger.info("Listing %s is gone (%s)", state.url, result.status_code)
+            interval = state.interval
+            values["status"] = GONE
+        elif result.listing is None:
+            # 304 Not Modified
+            interval = state.interval * self.backoff
+        else:
+            listing_hash = content_hash(result.listing)
+            changed = listing_hash != state.content_hash
+            # a first fetch is emitted but not counted as a change
+            edited = changed and state.content_hash is not None
+            if edited:
+                interval = state.interval / self.backoff
+            elif changed:
+                interval = state.interval
+            else:
+                interval = state.interval * self.backoff
+            values.update(
+                etag=result.etag,
+                last_modified=result.last_modified,
+                content_hash=listing_hash,
+                expires_at=expiry_timestamp(result.listing.job_expiry_date),
+                changes=state.changes + edited,
+            )
+        interval = min(max(interval, self.min_interval), self.max_interval)
+        if next_fetch_in is None:
+            next_fetch_in = interval
+        values.update(interval=interval, next_fetch_at=now + next_fetch_in)
+
+        assignments = ", ".join(f"{name} = ?" for name in values)
+        with self._lock, self._connection:
+            self._connection.execute(
+                f"UPDATE listings SET {assignments} WHERE url = ?",
+                (*values.values(), state.url),
+            )
+        return result.listing if changed else None
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._connection.execute(
+                "SELECT COUNT(*) FROM listings"
+            ).fetchone()
+        return count
+
+    def __enter__(self) -> "RecrawlScheduler":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+_COLUMNS = ", ".join(ListingState.__dataclass_fields__)
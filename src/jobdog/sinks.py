@@ -0,0 +1,163 @@
+import json
+import os
+from abc import ABC, abstractmethod
+from enum import Enum
+from typing import IO, Any, Iterable, Optional, Union
+
+from jobdog.models.compact_job_listing import CompactJobListing
+from jobdog.models.job_listing import JobListing
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+Listing = Union[JobListing, CompactJobListing]
+
+COLUMNS = tuple(JobListing.model_fields)
+ENUM_COLUMNS = frozenset({"location_type", "employment_type", "experience_level"})
+LIST_COLUMNS = frozenset({"location", "skills"})
+
+
+def _to_column_value(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    return str(value)
+
+
+def to_record(listing: Listing) -> dict[str, Any]:
+    """``listing`` as a flat dict of JSON values with every ``JobListing``
+    field; fields a partial listing lacks are ``None``."""
+    return {name: _to_column_value(getattr(listing, name, None)) for name in COLUMNS}
+
+
+class ColumnBuffer:
+    """Listings held column by column: one list of plain values (strings,
+    lists of strings or ``None``) per ``JobListing`` field. Enums are stored
+    by value and URLs as strings."""
+
+    def __init__(self) -> None:
+        self.columns: dict[str, list] = {name: [] for name in COLUMNS}
+
+    def append(self, listing: Listing) -> None:
+        for name, column in self.columns.items():
+            column.append(_to_column_value(getattr(listing, name, None)))
+
+    def clear(self) -> None:
+        for column in self.columns.values():
+            column.clear()
+
+    def __len__(self) -> int:
+        return len(self.columns[COLUMNS[0]])
+
+
+class BaseSink(ABC):
+    """Writes listings to a file in batches. Use as a context manager, or
+    call ``close`` when done so buffered listings are flushed."""
+
+    @abstractmethod
+    def write(self, listing: Listing) -> None:
+        pass
+
+    def write_many(self, listings: Iterable[Listing]) -> None:
+        for listing in listings:
+            self.write(listing)
+
+    def flush(self) -> None:
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class NDJSONSink(BaseSink):
+    """Streams listings as newline-delimited JSON, one ``to_record`` object
+    per line, to ``path`` or to an open text file such as ``sys.stdout``.
+    With ``append``, an existing file at ``path`` is added to instead of
+    truncated."""
+
+    def __init__(
+        self, file: Union[str, os.PathLike, IO[str]], append: bool = False
+    ) -> None:
+        self._owns_file = isinstance(file, (str, os.PathLike))
+        self._file = (
+            open(file, "a" if append else "w", encoding="utf-8")
+            if self._owns_file
+            else file
+        )
+
+    def write(self, listing: Listing) -> None:
+        self._file.write(json.dumps(to_record(listing), ensure_ascii=False) + "\n")
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._owns_file:
+            self._file.close()
+        else:
+            self._file.flush()
+
+
+def _column_type(name: str):
+    if name in ENUM_COLUMNS:
+        return pa.dictionary(pa.int32(), pa.string())
+    if name in LIST_COLUMNS:
+        return pa.list_(pa.string())
+    return pa.string()
+
+
+def parquet_schema():
+    """The Arrow schema ``ParquetSink`` writes: strings, dictionary-encoded
+    enum columns and list-of-string ``location``/``skills`` columns."""
+    if pa is None:
+        raise ImportError("Writing Parquet requires pyarrow: pip install pyarrow")
+    return pa.schema([pa.field(name, _column_type(name)) for name in COLUMNS])
+
+
+class ParquetSink(BaseSink):
+    """Buffers listings in a ``ColumnBuffer`` and writes a Parquet row group
+    every ``row_group_size`` listings, so memory stays bounded however many
+    listings are written. Requires pyarrow."""
+
+    def __init__(
+        self,
+        path: Union[str, os.PathLike],
+        row_group_size: int = 10_000,
+        compression: Optional[str] = "zstd",
+    ) -> None:
+        self.schema = parquet_schema()
+        self.row_group_size = row_group_size
+        self._buffer = ColumnBuffer()
+        self._writer = pq.ParquetWriter(path, self.schema, compression=compression)
+
+    def write(self, listing: Listing) -> None:
+        self._buffer.append(listing)
+        if len(self._buffer) >= self.row_group_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not len(self._buffer):
+            return
+        arrays = [
+            pa.array(self._buffer.columns[field.name], type=field.type)
+            for field in self.schema
+        ]
+        self._writer.write_table(pa.Table.from_arrays(arrays, schema=self.schema))
+        self._buffer.clear()
+
+    def close(self) -> None:
+        self.flush()
+        self._writer.close()
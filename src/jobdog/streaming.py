@@ -0,0 +1,80 @@
+import re
+from typing import Collection, Optional
+
+# Streamed pages are cut off after this many bytes even if the wanted fields
+# have not all been seen, so a runaway page cannot stall a fetch.
+DEFAULT_MAX_BODY_BYTES = 5 * 1024 * 1024
+# Every chunk is searched for markers together with the last MARKER_OVERLAP
+# characters before it, and each time MARKER_RESCAN more characters have come
+# in, the last MARKER_WINDOW characters are searched as a whole. That keeps
+# scanning linear in the page size: a short match is seen as soon as it is
+# complete and a longer one at most MARKER_RESCAN characters later. A marker
+# match longer than the window is not seen, which only means more of the page
+# is read.
+MARKER_WINDOW = 128 * 1024
+MARKER_OVERLAP = 4 * 1024
+MARKER_RESCAN = MARKER_WINDOW // 8
+
+
+class FieldScanner:
+    """Collects a page while it is downloaded and tells when every wanted
+    field can be extracted from the part read so far.
+
+    A field is available once its marker pattern (see
+    ``BaseParser.stream_markers``) matches the text received. Without
+    ``fields`` all fields with a marker are wanted; a wanted field without a
+    marker means the whole page has to be read. Chunks are kept in a list
+    and joined once ``html`` is read.
+    """
+
+    def __init__(
+        self, markers: dict[str, str], fields: Optional[Collection[str]] = None
+    ) -> None:
+        wanted = markers.keys() if fields is None else fields
+        self._pending: Optional[dict[str, re.Pattern]] = None
+        if markers and all(name in markers for name in wanted):
+            self._pending = {
+                name: re.compile(markers[name], re.DOTALL) for name in wanted
+            }
+        self._chunks: list[str] = []
+        # the end of the page received so far, see ``MARKER_OVERLAP``
+        self._tail = ""
+        # characters received since the window was last searched
+        self._unsearched = 0
+
+    @property
+    def html(self) -> str:
+        if len(self._chunks) > 1:
+            self._chunks[:] = ["".join(self._chunks)]
+        return self._chunks[0] if self._chunks else ""
+
+    @property
+    def done(self) -> bool:
+        return self._pending is not None and not self._pending
+
+    def feed(self, chunk: str) -> bool:
+        """Add ``chunk`` to the page and return whether it is complete enough
+        for the wanted fields."""
+        self._chunks.append(chunk)
+        if self._pending:
+            self._unsearched += len(chunk)
+            if self._unsearched >= MARKER_RESCAN:
+                text = self._window()
+                self._unsearched = 0
+            else:
+                # a match within the tail alone was looked for already
+                text = self._tail + chunk
+            for name, pattern in list(self._pending.items()):
+                if pattern.search(text):
+                    del self._pending[name]
+            self._tail = text[-MARKER_OVERLAP:]
+        return self.done
+
+    def _window(self) -> str:
+        """The last ``MARKER_WINDOW`` characters received."""
+        size = 0
+        start = len(self._chunks)
+        while start and size < MARKER_WINDOW:
+            start -= 1
+            size += len(self._chunks[start])
+        return "".join(self._chunks[start:])[-MARKER_WINDOW:]
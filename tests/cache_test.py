@@ -0,0 +1,214 @@
+import asyncio
+import threading
+import time
+import pytest
+from httpx import Request, Response
+from unittest.mock import patch, AsyncMock, MagicMock
+from jobdog.cache import CacheEntry, MemoryCache, SQLiteCache
+from jobdog.jobdog import AsyncJobDog, JobDog
+from jobdog.models.job_listing import JobListing
+from jobdog.providers.base import BaseParser
+
+URL = "https://example.com/job/123"
+
+
+def _response(status_code: int, text: str = "", headers=None) -> Response:
+    return Response(
+        status_code, text=text, headers=headers, request=Request("GET", URL)
+    )
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_cache(request, tmp_path):
+    def make(**kwargs):
+        if request.param == "memory":
+            return MemoryCache(**kwargs)
+        return SQLiteCache(str(tmp_path / "cache.sqlite"), **kwargs)
+
+    return make
+
+
+def test_cache_evicts_least_recently_used(make_cache):
+    cache = make_cache(max_entries=2)
+    cache.set("a", CacheEntry("A", time.time()))
+    cache.set("b", CacheEntry("B", time.time()))
+    assert cache.get("a").value == "A"
+    cache.set("c", CacheEntry("C", time.time()))
+
+    assert cache.get("b") is None
+    assert cache.get("a").value == "A"
+    assert cache.get("c").value == "C"
+    assert len(cache) == 2
+
+
+def test_cache_lookup_drops_stale_entries_without_validators(make_cache):
+    cache = make_cache(ttl=60)
+    cache.set("old", CacheEntry("old", time.time() - 120))
+    cache.set("etag", CacheEntry("etag", time.time() - 120, etag='"v1"'))
+
+    assert cache.lookup("old") is None
+    assert cache.get("old") is None
+    entry = cache.lookup("etag")
+    assert entry.value == "etag"
+    assert not cache.is_fresh(entry)
+
+
+def test_sqlite_cache_persists(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = SQLiteCache(path)
+    cache.set(URL, CacheEntry("<html/>", 1.0, etag='"v1"', last_modified=None))
+    cache.close()
+
+    assert SQLiteCache(path).get(URL) == CacheEntry("<html/>", 1.0, etag='"v1"')
+
+
+def test_store_response_reuses_body_on_not_modified():
+    cache = MemoryCache()
+    previous = CacheEntry("<html>cached</html>", 1.0, etag='"v1"')
+
+    body = cache.store_response(URL, _response(304), previous)
+
+    assert body == "<html>cached</html>"
+    assert cache.get(URL).stored_at > 1.0
+
+
+def _mock_parser() -> MagicMock:
+    mock_parser = MagicMock()
+    mock_parser.sanitize_url.return_value = URL
+    mock_parser.parse_html.side_effect = lambda html: JobListing(
+        job_title=html, company_name="NotVought", job_description="Not evil"
+    )
+    return mock_parser
+
+
+@patch("jobdog.jobdog.get_parser")
+def test_fetch_details_serves_fresh_entries_from_cache(mock_get_parser):
+    mock_get_parser.return_value = _mock_parser()
+    mock_client = MagicMock()
+    mock_client.get.return_value = _response(200, "first", {"ETag": '"v1"'})
+
+    dog = JobDog(http_client=mock_client, cache=MemoryCache(ttl=60))
+    assert dog.fetch_details(URL).job_title == "first"
+    assert dog.fetch_details(URL).job_title == "first"
+
+    mock_client.get.assert_called_once_with(URL, headers={})
+
+
+@patch("jobdog.jobdog.get_parser")
+def test_fetch_details_revalidates_stale_entries(mock_get_parser):
+    mock_get_parser.return_value = _mock_parser()
+    cache = MemoryCache(ttl=60)
+    cache.set(
+        URL,
+        CacheEntry(
+            "cached",
+            time.time() - 120,
+            etag='"v1"',
+            last_modified="Mon, 21 Oct 2024 07:28:00 GMT",
+        ),
+    )
+    mock_client = MagicMock()
+    mock_client.get.return_value = _response(304)
+
+    dog = JobDog(http_client=mock_client, cache=cache)
+    assert dog.fetch_details(URL).job_title == "cached"
+
+    mock_client.get.assert_called_once_with(
+        URL,
+        headers={
+            "If-None-Match": '"v1"',
+            "If-Modified-Since": "Mon, 21 Oct 2024 07:28:00 GMT",
+        },
+    )
+    assert cache.is_fresh(cache.get(URL))
+
+
+class CountingParser(BaseParser):
+    def __init__(self):
+        self.calls = 0
+
+    def sanitize_url(self, url):
+        return url
+
+    def parse_html(self, html):
+        self.calls += 1
+        return JobListing(
+            job_title=html,
+            company_name="NotVought",
+            job_description="Not evil",
+            location=["Copenhagen"],
+        )
+
+
+def test_fetch_details_skips_parsing_unchanged_bodies():
+    parser = CountingParser()
+    mock_client = MagicMock()
+    mock_client.get.side_effect = [
+        _response(200, "same"),
+        _response(200, "same"),
+        _response(200, "changed"),
+    ]
+
+    with patch("jobdog.jobdog.get_parser", return_value=parser):
+        dog = JobDog(http_client=mock_client, parse_cache=MemoryCache())
+        first = dog.fetch_details(URL)
+        second = dog.fetch_details(URL)
+        changed = dog.fetch_details(URL)
+
+    assert parser.calls == 2
+    assert second == first
+    assert second.location == ["Copenhagen"]
+    assert str(second.job_listing_url) == URL
+    assert changed.job_title == "changed"
+
+
+def test_parse_cache_is_keyed_by_parser_version():
+    parse_cache = MemoryCache()
+    parser = CountingParser()
+    mock_client = MagicMock()
+    mock_client.get.side_effect = lambda url: _response(200, "same")
+
+    with patch("jobdog.jobdog.get_parser", return_value=parser):
+        dog = JobDog(http_client=mock_client, parse_cache=parse_cache)
+        dog.fetch_details(URL)
+        with patch.object(CountingParser, "version", 2):
+            dog.fetch_details(URL)
+        dog.fetch_details(URL)
+
+    assert parser.calls == 2
+    assert len(parse_cache) == 2
+
+
+class ThreadRecordingCache(SQLiteCache):
+    def __init__(self, path):
+        super().__init__(path)
+        self.threads = set()
+
+    def get(self, key):
+        self.threads.add(threading.get_ident())
+        return super().get(key)
+
+    def set(self, key, entry):
+        self.threads.add(threading.get_ident())
+        super().set(key, entry)
+
+
+def test_async_fetch_details_keeps_blocking_caches_off_the_loop(tmp_path):
+    cache = ThreadRecordingCache(str(tmp_path / "pages.sqlite"))
+    parse_cache = ThreadRecordingCache(str(tmp_path / "listings.sqlite"))
+    mock_client = MagicMock()
+    mock_client.get = AsyncMock(return_value=_response(200, "fetched"))
+
+    async def run():
+        dog = AsyncJobDog(http_client=mock_client, cache=cache, parse_cache=parse_cache)
+        first = await dog.fetch_details(URL)
+        second = await dog.fetch_details(URL)
+        return threading.get_ident(), first, second
+
+    with patch("jobdog.jobdog.get_parser", return_value=CountingParser()):
+        loop_thread, first, second = asyncio.run(run())
+
+    assert first.job_title == second.job_title == "fetched"
+    mock_client.get.assert_awaited_once()
+    assert cache.threads and loop_thread not in cache.threads
+    assert parse_cache.threads and loop_thread not in parse_cache.threads
@@ -0,0 +1,156 @@
+import json
+from unittest.mock import patch
+
+import pytest
+
+from jobdog.cli import main
+from jobdog.exceptions import FetchError
+from jobdog.jobdog import JobDog, batch_key
+from jobdog.models.job_listing import JobListing
+
+URLS = [f"https://example.com/job/{i}" for i in range(5)]
+
+
+def fetch(url, resolved=None, fields=None):
+    if url.endswith("/3"):
+        raise FetchError("Connection error")
+    return JobListing(
+        job_title=url.rsplit("/", 1)[-1],
+        company_name="NotVought",
+        job_description="You will not be evil",
+        job_listing_url=url,
+    )
+
+
+@pytest.fixture
+def fetched():
+    with patch.object(JobDog, "_fetch_resolved", side_effect=fetch) as mock:
+        yield mock
+
+
+@pytest.fixture
+def url_file(tmp_path):
+    path = tmp_path / "urls.txt"
+    path.write_text("# backfill\n" + "\n\n".join(URLS) + "\n")
+    return path
+
+
+def test_cli_writes_ndjson_and_checkpoint(fetched, url_file, tmp_path, capsys):
+    output = tmp_path / "out.ndjson"
+    checkpoint = tmp_path / "checkpoint.txt"
+    failed = tmp_path / "failed.txt"
+
+    exit_code = main(
+        [
+            str(url_file),
+            "-o",
+            str(output),
+            "--checkpoint",
+            str(checkpoint),
+            "--failed",
+            str(failed),
+            "--checkpoint-every",
+            "2",
+            "-w",
+            "2",
+        ]
+    )
+
+    assert exit_code == 0
+    titles = {json.loads(line)["job_title"] for line in output.read_text().splitlines()}
+    assert titles == {"0", "1", "2", "4"}
+    # failed URLs are retried on resume
+    assert sorted(checkpoint.read_text().split()) == URLS[:3] + URLS[4:]
+    assert failed.read_text() == URLS[3] + "\n"
+    assert "5 done, 4 ok, 1 failed" in capsys.readouterr().err
+
+
+def test_cli_resumes_from_checkpoint(fetched, url_file, tmp_path):
+    output = tmp_path / "out.ndjson"
+    output.write_text('{"job_title": "0"}\n{"job_title": "2"}\n')
+    checkpoint = tmp_path / "checkpoint.txt"
+    checkpoint.write_text(URLS[0] + "\n" + URLS[2] + "\n")
+
+    main([str(url_file), "-o", str(output), "--checkpoint", str(checkpoint)])
+
+    fetched_urls = sorted(call.args[0] for call in fetched.call_args_list)
+    assert fetched_urls == [URLS[1], URLS[3], URLS[4]]
+    titles = [json.loads(line)["job_title"] for line in output.read_text().splitlines()]
+    assert sorted(titles) == ["0", "1", "2", "4"]
+    assert sorted(checkpoint.read_text().split()) == URLS[:3] + URLS[4:]
+
+
+def test_cli_fetches_repeated_urls_once(fetched, tmp_path):
+    url_file = tmp_path / "urls.txt"
+    url_file.write_text("\n".join([URLS[0], URLS[1], URLS[0]]) + "\n")
+    output = tmp_path / "out.ndjson"
+
+    main([str(url_file), "-o", str(output)])
+
+    assert sorted(call.args[0] for call in fetched.call_args_list) == URLS[:2]
+    assert len(output.read_text().splitlines()) == 2
+
+
+def test_cli_works_out_each_key_once(fetched, url_file, tmp_path):
+    checkpoint = tmp_path / "checkpoint.txt"
+    checkpoint.write_text(URLS[0] + "\n")
+
+    with patch("jobdog.cli.batch_key", wraps=batch_key) as keyed:
+        main(
+            [
+                str(url_file),
+                "-o",
+                str(tmp_path / "out.ndjson"),
+                "--checkpoint",
+                str(checkpoint),
+            ]
+        )
+
+    assert sorted(call.args[0] for call in keyed.call_args_list) == URLS
+    assert sorted(checkpoint.read_text().split()) == URLS[:3] + URLS[4:]
+
+
+@pytest.mark.parametrize("every", ["0", "-1", "many"])
+def test_cli_rejects_bad_checkpoint_every(every, capsys):
+    with pytest.raises(SystemExit):
+        main(["-", "--checkpoint-every", every])
+    assert "positive integer" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize(
+    "option",
+    [
+        ["-w", "0"],
+        ["--per-host-limit", "0"],
+        ["--host-limit", "example.com=0"],
+        ["--host-limit", "example.com=-2"],
+    ],
+)
+def test_cli_rejects_limits_below_one(option, capsys):
+    with pytest.raises(SystemExit):
+        main(["-", *option])
+    assert "positive integer" in capsys.readouterr().err
+
+
+def test_cli_writes_parquet_parts(fetched, url_file, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    output = tmp_path / "listings"
+
+    main(
+        [
+            str(url_file),
+            "-o",
+            str(output),
+            "--format",
+            "parquet",
+            "--checkpoint-every",
+            "2",
+            "-w",
+            "1",
+        ]
+    )
+
+    parts = sorted(path.name for path in output.iterdir())
+    assert parts == ["part-00000.parquet", "part-00001.parquet", "part-00002.parquet"]
+    table = pq.read_table(output)
+    assert sorted(table.column("job_title").to_pylist()) == ["0", "1", "2", "4"]
@@ -1,5 +1,7 @@
 import pytest
 
+from jobdog.providers.utils import PARSER_MAP
+
 
 @pytest.fixture(scope="module")
 def vcr_config():
@@ -15,3 +17,12 @@ def cassette_id_func(fixture_value):
     if isinstance(fixture_value, str) and "/" in fixture_value:
         return f"job_{fixture_value.split('/')[-1].split('?')[0]}"
     return fixture_value
+
+
+@pytest.fixture
+def restore_parser_map():
+    """Undo registrations and ``PARSER_MAP.clear()`` calls of a test."""
+    saved = dict(PARSER_MAP)
+    yield PARSER_MAP
+    PARSER_MAP.clear()
+    PARSER_MAP.update(saved)
@@ -0,0 +1,91 @@
+from jobdog.dedup import NearDuplicateIndex, minhash, normalize_text, similarity
+from jobdog.models.compact_job_listing import CompactJobListing
+from jobdog.models.job_listing import JobListing
+
+DESCRIPTION = (
+    "Would you like to help bring new medicines to patients around the world?"
+    " As pilot scientist in our purification team you will drive production"
+    " campaigns in the pilot plant, plan and dimension chromatography and"
+    " filtration steps, and document every process change for the regulatory"
+    " file. You will work closely with colleagues in fermentation, analytical"
+    " development and quality assurance, and you will coach technicians on the"
+    " shop floor when new equipment is introduced. We expect a master's degree"
+    " or PhD in chemical engineering, biochemistry or a related field, several"
+    " years of hands-on experience with protein purification at scale, and a"
+    " structured way of working. Fluency in English is required; Danish is an"
+    " advantage. We offer a flexible workplace in Kalundborg, an ambitious"
+    " development programme and a team that values curiosity, openness and"
+    " collaboration across sites."
+)
+
+LISTING = JobListing(
+    job_title="Pilot Scientist for Purification",
+    company_name="Novo Nordisk A/S",
+    job_description=DESCRIPTION,
+)
+REPOST = CompactJobListing(
+    job_title="Pilot Scientist - Purification",
+    company_name="Novo Nordisk",
+    job_description="<p>" + DESCRIPTION.replace("every", "each", 1) + "</p>",
+)
+OTHER = JobListing(
+    job_title="International Export Manager",
+    company_name="Arla Foods",
+    job_description=" ".join(
+        f"Ensure exceptional sales performance in market cluster {i}."
+        for i in range(20)
+    ),
+)
+
+
+def test_normalize_text():
+    assert normalize_text("<p>Chase &amp; <b>BARK</b>!</p>") == ["chase", "bark"]
+    # scripts are dropped and inline markup does not split words
+    assert normalize_text("<p>Chase</p><script>track()</script><p>b<b>ark</b></p>") == [
+        "chase",
+        "bark",
+    ]
+    assert normalize_text("R&amp;D") == ["r", "d"]
+
+
+def test_minhash_similarity():
+    first = minhash(normalize_text(DESCRIPTION))
+    assert len(first) == 64
+    assert similarity(first, minhash(normalize_text(DESCRIPTION))) == 1.0
+    assert similarity(first, minhash(normalize_text(OTHER.job_description))) < 0.2
+    # short texts fill every bin too
+    assert len(minhash(["chase", "squirrels"])) == 64
+
+
+def test_find_or_add():
+    index = NearDuplicateIndex()
+    assert index.find_or_add("jobindex:r1", LISTING) is None
+    assert index.find_or_add("greenhouse:1", REPOST) == "jobindex:r1"
+    assert index.find_or_add("jobindex:h2", OTHER) is None
+    assert len(index) == 2
+    assert "greenhouse:1" not in index
+
+
+def test_remove_and_replace():
+    index = NearDuplicateIndex()
+    index.add("jobindex:r1", LISTING)
+    index.add("jobindex:r1", OTHER)
+    assert index.query(REPOST) is None
+    assert index.query(OTHER) == "jobindex:r1"
+
+    index.remove("jobindex:r1")
+    assert len(index) == 0
+    assert index.query(OTHER) is None
+
+
+def test_save_and_load(tmp_path):
+    index = NearDuplicateIndex(num_perm=32, bands=8, threshold=0.7)
+    index.add("jobindex:r1", LISTING)
+    path = tmp_path / "dedup.json"
+    index.save(path)
+
+    loaded = NearDuplicateIndex.load(path)
+    assert (loaded.num_perm, loaded.bands, loaded.threshold) == (32, 8, 0.7)
+    assert loaded.query(REPOST) == "jobindex:r1"
+    loaded.add("jobindex:h2", OTHER)
+    assert len(loaded) == 2
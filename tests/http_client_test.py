@@ -0,0 +1,44 @@
+from httpx import URL, Limits
+from jobdog.http_client import create_default_async_client, create_default_client
+
+
+def test_create_default_client_timeouts():
+    client = create_default_client(timeout=20, connect_timeout=3, read_timeout=60)
+    assert client.timeout.connect == 3
+    assert client.timeout.read == 60
+    assert client.timeout.write == 20
+    assert client.timeout.pool == 20
+
+
+def test_create_default_client_keeps_caller_headers_intact():
+    headers = {"Accept-Language": "da"}
+    client = create_default_client(headers=headers)
+    assert headers == {"Accept-Language": "da"}
+    assert client.headers["Accept-Language"] == "da"
+    assert "python-httpx" not in client.headers["User-Agent"]
+
+
+def test_create_default_client_pool_per_provider():
+    client = create_default_client(
+        provider_limits={
+            "greenhouse.io": Limits(max_connections=5),
+            "jobindex.dk": Limits(max_connections=2),
+        }
+    )
+    boards = client._transport_for_url(URL("https://boards.greenhouse.io/a/jobs/1"))
+    job_boards = client._transport_for_url(URL("https://job-boards.greenhouse.io/"))
+    jobindex = client._transport_for_url(URL("https://www.jobindex.dk/jobannonce"))
+    other = client._transport_for_url(URL("https://www.linkedin.com/jobs/view/1"))
+
+    assert boards is job_boards
+    assert len({id(boards), id(jobindex), id(other)}) == 3
+
+
+def test_create_default_async_client_pool_per_provider():
+    client = create_default_async_client(
+        read_timeout=60, provider_limits={"greenhouse.io": Limits(max_connections=5)}
+    )
+    assert client.timeout.read == 60
+    boards = client._transport_for_url(URL("https://boards.greenhouse.io/a/jobs/1"))
+    other = client._transport_for_url(URL("https://www.jobindex.dk/jobannonce"))
+    assert boards is not other
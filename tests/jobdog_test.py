@@ -1,8 +1,15 @@
+import asyncio
+import threading
+import time
+import httpx
 import pytest
-from jobdog.jobdog import JobDog
+from jobdog.cache import MemoryCache
+from jobdog.jobdog import AsyncJobDog, JobDog, batch_key
 from jobdog.models.job_listing import JobListing
 from jobdog.exceptions import FetchError
-from unittest.mock import patch, MagicMock
+from jobdog.providers.greenhouse import GreenhouseParser
+from jobdog.providers.utils import register_parser
+from unittest.mock import patch, AsyncMock, MagicMock
 
 
 def test_jobdog_initialization():
@@ -57,6 +64,31 @@ def test_fetch_details_error(mock_get_parser):
         dog.fetch_details("https://example.com/job/123")
 
 
+@patch("jobdog.jobdog.get_parser")
+def test_fetch_details_with_fields(mock_get_parser):
+    mock_parser = MagicMock()
+    mock_parser.sanitize_url.return_value = "https://example.com/job/123"
+    mock_parser.parse_html.return_value = JobListing.model_construct(
+        job_title="Likeable Superhero"
+    )
+    mock_get_parser.return_value = mock_parser
+
+    mock_client = MagicMock()
+    mock_client.get.return_value.text = "<html>Job details</html>"
+
+    parse_cache = MagicMock()
+    dog = JobDog(http_client=mock_client, parse_cache=parse_cache)
+    result = dog.fetch_details("https://example.com/job/123", fields=["job_title"])
+
+    assert result.job_title == "Likeable Superhero"
+    mock_parser.parse_html.assert_called_once_with(
+        "<html>Job details</html>", fields=["job_title"]
+    )
+    # partial listings are not memoized
+    parse_cache.lookup.assert_not_called()
+    parse_cache.set.assert_not_called()
+
+
 def test_context_manager():
     mock_client = MagicMock()
 
@@ -64,3 +96,681 @@ def test_context_manager():
         assert dog.http_client is mock_client
 
     mock_client.close.assert_called_once()
+
+
+def test_async_jobdog_initialization():
+    dog = AsyncJobDog()
+    assert dog.http_client is not None
+    assert "python-httpx" not in dog.http_client.headers["User-Agent"]
+    asyncio.run(dog.close())
+
+
+@patch("jobdog.jobdog.get_parser")
+def test_async_fetch_details_success(mock_get_parser):
+    mock_parser = MagicMock()
+    mock_parser.sanitize_url.return_value = "https://example.com/job/123"
+    mock_parser.parse_html.return_value = JobListing(
+        job_title="Likeable Superhero",
+        company_name="NotVought",
+        job_description="You will not be evil",
+    )
+    mock_get_parser.return_value = mock_parser
+
+    mock_client = MagicMock()
+    mock_response = MagicMock()
+    mock_response.text = "<html>Job details</html>"
+    mock_client.get = AsyncMock(return_value=mock_response)
+
+    dog = AsyncJobDog(http_client=mock_client)
+    result = asyncio.run(dog.fetch_details("https://example.com/job/123"))
+
+    assert result.job_title == "Likeable Superhero"
+    assert result.job_listing_url == "https://example.com/job/123"
+    mock_client.get.assert_awaited_once_with("https://example.com/job/123")
+    mock_parser.parse_html.assert_called_once_with("<html>Job details</html>")
+
+
+@patch("jobdog.jobdog.get_parser")
+def test_async_fetch_details_error(mock_get_parser):
+    mock_parser = MagicMock()
+    mock_parser.sanitize_url.return_value = "https://example.com/job/123"
+    mock_get_parser.return_value = mock_parser
+
+    mock_client = MagicMock()
+    mock_client.get = AsyncMock(side_effect=Exception("Connection error"))
+
+    dog = AsyncJobDog(http_client=mock_client)
+    with pytest.raises(
+        FetchError,
+        match="Failed to fetch URL: https://example.com/job/123. Error: Connection error",
+    ):
+        asyncio.run(dog.fetch_details("https://example.com/job/123"))
+
+
+def test_async_context_manager():
+    mock_client = MagicMock()
+    mock_client.aclose = AsyncMock()
+
+    async def run():
+        async with AsyncJobDog(http_client=mock_client) as dog:
+            assert dog.http_client is mock_client
+
+    asyncio.run(run())
+    mock_client.aclose.assert_awaited_once()
+
+
+def _make_listing(title: str) -> JobListing:
+    return JobListing(
+        job_title=title, company_name="NotVought", job_description="Not evil"
+    )
+
+
+@patch("jobdog.jobdog.get_provider_domain", return_value="example.com")
+@patch("jobdog.jobdog.get_parser")
+def test_fetch_many_keeps_input_order_and_errors(mock_get_parser, _):
+    mock_parser = MagicMock()
+    mock_parser.sanitize_url.side_effect = lambda url: url
+    mock_parser.parse_html.side_effect = _make_listing
+    mock_get_parser.return_value = mock_parser
+
+    def get(url):
+        if url.endswith("bad"):
+            raise Exception("Connection error")
+        response = MagicMock()
+        response.text = url.rsplit("/", 1)[-1]
+        return response
+
+    mock_client = MagicMock()
+    mock_client.get.side_effect = get
+
+    dog = JobDog(http_client=mock_client)
+    urls = [f"https://example.com/job/{i}" for i in range(5)]
+    urls.insert(2, "https://example.com/job/bad")
+    results = dog.fetch_many(urls, max_concurrency=3, per_host_limit=2)
+
+    assert [r.job_title for r in results if isinstance(r, JobListing)] == [
+        "0",
+        "1",
+        "2",
+        "3",
+        "4",
+    ]
+    assert isinstance(results[2], FetchError)
+
+
+@pytest.mark.parametrize("per_host_limit", [0, {"example.com": 0}])
+def test_batches_reject_per_host_limit_below_one(per_host_limit):
+    urls = ["https://example.com/job/1"]
+    with pytest.raises(ValueError):
+        JobDog(http_client=MagicMock()).fetch_many(urls, per_host_limit=per_host_limit)
+    with pytest.raises(ValueError):
+        asyncio.run(
+            AsyncJobDog(http_client=MagicMock()).fetch_many(
+                urls, per_host_limit=per_host_limit
+            )
+        )
+
+
+@patch("jobdog.jobdog.get_parser")
+def test_fetch_many_enforces_per_host_limit(mock_get_parser):
+    mock_parser = MagicMock()
+    mock_parser.sanitize_url.side_effect = lambda url: url
+    mock_parser.parse_html.return_value = _make_listing("Hero")
+    mock_get_parser.return_value = mock_parser
+
+    lock = threading.Lock()
+    in_flight = {"a.com": 0, "b.com": 0}
+    peak = {"a.com": 0, "b.com": 0}
+
+    def get(url):
+        domain = url.split("/")[2]
+        with lock:
+            in_flight[domain] += 1
+            peak[domain] = max(peak[domain], in_flight[domain])
+        time.sleep(0.01)
+        with lock:
+            in_flight[domain] -= 1
+        return MagicMock()
+
+    mock_client = MagicMock()
+    mock_client.get.side_effect = get
+
+    urls = [f"https://{d}/job/{i}" for i in range(6) for d in ("a.com", "b.com")]
+    with patch(
+        "jobdog.jobdog.get_provider_domain", side_effect=lambda url: url.split("/")[2]
+    ):
+        dog = JobDog(http_client=mock_client)
+        results = dog.fetch_many(
+            urls, max_concurrency=8, per_host_limit={"a.com": 1, "b.com": 3}
+        )
+
+    assert all(isinstance(r, JobListing) for r in results)
+    assert peak["a.com"] == 1
+    assert 1 <= peak["b.com"] <= 3
+
+
+@patch("jobdog.jobdog.get_parser")
+def test_fetch_many_keeps_workers_free_for_other_hosts(mock_get_parser):
+    mock_parser = MagicMock()
+    mock_parser.sanitize_url.side_effect = lambda url: url
+    mock_parser.parse_html.return_value = _make_listing("Hero")
+    mock_get_parser.return_value = mock_parser
+
+    b_fetched = threading.Event()
+    a_saw_b = []
+
+    def get(url):
+        if "a.com" in url:
+            a_saw_b.append(b_fetched.wait(5))
+        else:
+            b_fetched.set()
+        return MagicMock()
+
+    mock_client = MagicMock()
+    mock_client.get.side_effect = get
+
+    # with a.com at its limit, its second URL must not take the other worker
+    urls = ["https://a.com/job/1", "https://a.com/job/2", "https://b.com/job/1"]
+    with patch(
+        "jobdog.jobdog.get_provider_domain", side_effect=lambda url: url.split("/")[2]
+    ):
+        dog = JobDog(http_client=mock_client)
+        results = dog.fetch_many(urls, max_concurrency=2, per_host_limit=1)
+
+    assert all(isinstance(r, JobListing) for r in results)
+    assert a_saw_b == [True, True]
+
+
+@pytest.mark.parametrize("method", ["fetch_many", "iter_details"])
+@patch("jobdog.jobdog.get_parser")
+def test_async_batch_keeps_slots_free_for_other_hosts(mock_get_parser, method):
+    mock_get_parser.return_value = _echo_parser()
+    released = asyncio.Event()
+    slow_saw_release = []
+
+    async def get(url):
+        if "slow.com" in url:
+            try:
+                await asyncio.wait_for(released.wait(), 5)
+                slow_saw_release.append(True)
+            except TimeoutError:
+                slow_saw_release.append(False)
+        elif url.endswith("/9"):
+            released.set()
+        response = MagicMock()
+        response.text = url.rsplit("/", 1)[-1]
+        return response
+
+    mock_client = MagicMock()
+    mock_client.get.side_effect = get
+
+    # slow.com URLs held back by their limit must not take the slots the
+    # uncapped provider needs to get to the URL that releases them
+    urls = [f"https://slow.com/job/{i}" for i in range(2)]
+    urls += [f"https://fast.com/job/{i}" for i in range(10)]
+
+    async def run():
+        dog = AsyncJobDog(http_client=mock_client)
+        if method == "fetch_many":
+            return await dog.fetch_many(
+                urls, max_concurrency=2, per_host_limit={"slow.com": 1}
+            )
+        return [
+            listing
+            async for _, listing in dog.iter_details(
+                urls, max_concurrency=2, per_host_limit={"slow.com": 1}
+            )
+        ]
+
+    with patch(
+        "jobdog.jobdog.get_provider_domain", side_effect=lambda url: url.split("/")[2]
+    ):
+        results = asyncio.run(run())
+
+    assert all(isinstance(r, JobListing) for r in results)
+    assert slow_saw_release == [True, True]
+
+
+@patch("jobdog.jobdog.get_provider_domain", return_value="example.com")
+@patch("jobdog.jobdog.get_parser")
+def test_async_fetch_many_keeps_input_order_and_errors(mock_get_parser, _):
+    mock_parser = MagicMock()
+    mock_parser.sanitize_url.side_effect = lambda url: url
+    mock_parser.parse_html.side_effect = _make_listing
+    mock_get_parser.return_value = mock_parser
+
+    async def get(url):
+        if url.endswith("bad"):
+            raise Exception("Connection error")
+        await asyncio.sleep(0.001 * (5 - int(url[-1])))
+        response = MagicMock()
+        response.text = url.rsplit("/", 1)[-1]
+        return response
+
+    mock_client = MagicMock()
+    mock_client.get.side_effect = get
+
+    dog = AsyncJobDog(http_client=mock_client)
+    urls = [f"https://example.com/job/{i}" for i in range(5)]
+    urls.append("https://example.com/job/bad")
+    results = asyncio.run(dog.fetch_many(urls, max_concurrency=2, per_host_limit=1))
+
+    assert [r.job_title for r in results[:5]] == ["0", "1", "2", "3", "4"]
+    assert isinstance(results[5], FetchError)
+
+
+def _echo_parser() -> MagicMock:
+    mock_parser = MagicMock()
+    mock_parser.sanitize_url.side_effect = lambda url: url
+    mock_parser.parse_html.side_effect = _make_listing
+    return mock_parser
+
+
+@patch("jobdog.jobdog.get_parser")
+def test_revalidate_sends_validators(mock_get_parser):
+    mock_get_parser.return_value = _echo_parser()
+    requests = []
+    pages = [
+        httpx.Response(304),
+        httpx.Response(410),
+        httpx.Response(200, text="7", headers={"ETag": '"v2"'}),
+        httpx.Response(500),
+    ]
+
+    def handler(request):
+        requests.append(request)
+        return pages.pop(0)
+
+    transport = httpx.MockTransport(handler)
+    dog = JobDog(http_client=httpx.Client(transport=transport), max_retries=0)
+    url = "https://example.com/job/7"
+
+    assert dog.revalidate(url, etag='"v1"').status_code == 304
+    assert requests[0].headers["If-None-Match"] == '"v1"'
+    assert "If-Modified-Since" not in requests[0].headers
+    assert dog.revalidate(url).listing is None
+    result = dog.revalidate(url, last_modified="Mon, 21 Oct 2024 07:28:00 GMT")
+    assert (result.status_code, result.listing.job_title, result.etag) == (
+        200,
+        "7",
+        '"v2"',
+    )
+    assert str(result.listing.job_listing_url) == url
+    with pytest.raises(FetchError):
+        dog.revalidate(url)
+
+
+@patch("jobdog.jobdog.get_parser")
+def test_iter_details_reads_input_lazily(mock_get_parser):
+    mock_get_parser.return_value = _echo_parser()
+
+    def get(url):
+        if url.endswith("bad"):
+            raise Exception("Connection error")
+        response = MagicMock()
+        response.text = url.rsplit("/", 1)[-1]
+        return response
+
+    mock_client = MagicMock()
+    mock_client.get.side_effect = get
+
+    consumed = []
+
+    def urls():
+        for i in range(50):
+            consumed.append(i)
+            yield f"https://example.com/job/{i}"
+        yield "https://example.com/job/bad"
+
+    dog = JobDog(http_client=mock_client)
+    results = dog.iter_details(urls(), max_concurrency=4)
+
+    url, listing = next(results)
+    assert listing.job_title == url.rsplit("/", 1)[-1]
+    assert len(consumed) <= 8
+
+    rest = dict(results)
+    assert len(rest) == 50
+    assert isinstance(rest["https://example.com/job/bad"], FetchError)
+
+
+@patch("jobdog.jobdog.get_parser")
+def test_async_iter_details_reads_input_lazily(mock_get_parser):
+    mock_get_parser.return_value = _echo_parser()
+
+    async def get(url):
+        await asyncio.sleep(0)
+        response = MagicMock()
+        response.text = url.rsplit("/", 1)[-1]
+        return response
+
+    mock_client = MagicMock()
+    mock_client.get.side_effect = get
+
+    consumed = []
+
+    async def urls():
+        for i in range(50):
+            consumed.append(i)
+            yield f"https://example.com/job/{i}"
+
+    async def run():
+        dog = AsyncJobDog(http_client=mock_client)
+        results = {}
+        async for url, listing in dog.iter_details(urls(), max_concurrency=4):
+            if not results:
+                assert len(consumed) <= 8
+            results[url] = listing
+        return results
+
+    results = asyncio.run(run())
+    assert len(results) == 50
+    assert results["https://example.com/job/7"].job_title == "7"
+
+
+@patch("jobdog.jobdog.get_parser")
+def test_async_iter_details_waits_for_cancelled_fetches(mock_get_parser):
+    mock_get_parser.return_value = _echo_parser()
+    unwound = []
+
+    async def get(url):
+        response = MagicMock()
+        response.text = url.rsplit("/", 1)[-1]
+        if not url.endswith("/0"):
+            try:
+                await asyncio.sleep(10)
+            finally:
+                unwound.append(url)
+        return response
+
+    mock_client = MagicMock()
+    mock_client.get.side_effect = get
+    urls = [f"https://example.com/job/{i}" for i in range(4)]
+
+    async def run():
+        dog = AsyncJobDog(http_client=mock_client)
+        results = dog.iter_details(urls, max_concurrency=4)
+        url, _ = await anext(results)
+        await results.aclose()
+        # before the loop gets to cancel leftover tasks on shutdown
+        assert sorted(unwound) == urls[1:]
+        return url
+
+    assert asyncio.run(run()) == urls[0]
+
+
+def test_jobdog_instances_have_their_own_client():
+    first = JobDog(connect_timeout=3)
+    second = JobDog()
+
+    assert first.http_client is not second.http_client
+    assert first.http_client.timeout.connect == 3
+    first.close()
+    assert not second.http_client.is_closed
+
+
+def test_set_headers_and_mounts_keep_client_options():
+    dog = JobDog(read_timeout=45)
+    old_client = dog.http_client
+    dog.set_headers({"Accept-Language": "da"})
+    dog.set_mounts({})
+
+    assert dog.http_client.headers["Accept-Language"] == "da"
+    assert dog.http_client.timeout.read == 45
+    assert old_client.is_closed
+    assert not dog.http_client.is_closed
+
+
+def test_set_mounts_refuses_a_client_passed_in():
+    client = httpx.Client()
+    dog = JobDog(http_client=client)
+
+    with pytest.raises(ValueError, match="set_mounts"):
+        dog.set_mounts({})
+    assert dog.http_client is client
+    assert not client.is_closed
+
+
+class _StreamParser(MagicMock):
+    stream_markers = {"job_title": r"<h1>.*?</h1>"}
+
+
+def _streamed_client(chunks: list[bytes], read: list[bytes]) -> httpx.Client:
+    def body():
+        for chunk in chunks:
+            read.append(chunk)
+            yield chunk
+
+    return httpx.Client(
+        transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, content=body())
+        )
+    )
+
+
+@patch("jobdog.jobdog.get_parser")
+def test_stream_stops_once_fields_are_found(mock_get_parser):
+    mock_parser = _StreamParser()
+    mock_parser.sanitize_url.return_value = "https://example.com/job/123"
+    mock_parser.parse_html.side_effect = lambda html, **kwargs: _make_listing(html)
+    mock_get_parser.return_value = mock_parser
+
+    read = []
+    chunks = [b"<html><h1>Likeable", b" Superhero</h1>", b"<footer>" * 1000]
+    cache = MemoryCache()
+    dog = JobDog(http_client=_streamed_client(chunks, read), cache=cache, stream=True)
+    result = dog.fetch_details("https://example.com/job/123")
+
+    assert result.job_title == "<html><h1>Likeable Superhero</h1>"
+    assert read == chunks[:2]
+    # partial pages are not cached
+    assert len(cache) == 0
+
+
+@patch("jobdog.jobdog.get_parser")
+def test_stream_caches_pages_read_in_full(mock_get_parser):
+    mock_parser = _StreamParser()
+    mock_parser.sanitize_url.return_value = "https://example.com/job/123"
+    mock_parser.parse_html.side_effect = lambda html, **kwargs: _make_listing(html)
+    mock_get_parser.return_value = mock_parser
+
+    read = []
+    chunks = [b"<html>", b"<p>No title</p>", b"</html>"]
+    cache = MemoryCache()
+    dog = JobDog(http_client=_streamed_client(chunks, read), cache=cache, stream=True)
+    dog.fetch_details("https://example.com/job/123")
+
+    assert read == chunks
+    assert (
+        cache.get("https://example.com/job/123").value == "<html><p>No title</p></html>"
+    )
+
+
+@patch("jobdog.jobdog.get_parser")
+def test_stream_stops_at_max_body_bytes(mock_get_parser):
+    mock_parser = _StreamParser()
+    mock_parser.sanitize_url.return_value = "https://example.com/job/123"
+    mock_parser.parse_html.side_effect = lambda html, **kwargs: _make_listing(html)
+    mock_get_parser.return_value = mock_parser
+
+    read = []
+    chunks = [b"x" * 100] * 10
+    dog = JobDog(
+        http_client=_streamed_client(chunks, read), stream=True, max_body_bytes=250
+    )
+    result = dog.fetch_details("https://example.com/job/123")
+
+    assert result.job_title == "x" * 300
+    assert len(read) == 3
+
+
+@patch("jobdog.jobdog.get_parser")
+def test_async_stream_stops_once_fields_are_found(mock_get_parser):
+    mock_parser = _StreamParser()
+    mock_parser.sanitize_url.return_value = "https://example.com/job/123"
+    mock_parser.parse_html.side_effect = lambda html, **kwargs: _make_listing(html)
+    mock_get_parser.return_value = mock_parser
+
+    read = []
+    chunks = [b"<html><h1>Likeable Superhero</h1>", b"<footer>" * 1000]
+
+    async def body():
+        for chunk in chunks:
+            read.append(chunk)
+            yield chunk
+
+    async def run():
+        client = httpx.AsyncClient(
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(200, content=body())
+            )
+        )
+        async with AsyncJobDog(http_client=client, stream=True) as dog:
+            return await dog.fetch_details("https://example.com/job/123")
+
+    result = asyncio.run(run())
+    assert result.job_title == "<html><h1>Likeable Superhero</h1>"
+    assert read == chunks[:1]
+
+
+def test_dedupe_key_matches_url_variants():
+    register_parser("greenhouse.io")(GreenhouseParser)
+    urls = [
+        "https://boards.greenhouse.io/anthropic/jobs/4182383008",
+        "https://job-boards.greenhouse.io/anthropic/jobs/4182383008?gh_src=feed",
+    ]
+    keys = {batch_key(url) for url in urls}
+    assert keys == {"greenhouse.io:4182383008"}
+    assert batch_key("https://unknown.com/job/1") == "https://unknown.com/job/1"
+
+
+@patch("jobdog.jobdog.get_parser")
+def test_fetch_many_fetches_duplicates_once(mock_get_parser):
+    mock_parser = _echo_parser()
+    mock_parser.sanitize_url.side_effect = lambda url: url.split("?")[0]
+    mock_get_parser.return_value = mock_parser
+
+    mock_client = MagicMock()
+    mock_client.get.side_effect = lambda url: MagicMock(text=url[-1])
+
+    urls = [
+        "https://example.com/job/1?ref=feed",
+        "https://example.com/job/2",
+        "https://example.com/job/1",
+    ]
+    results = JobDog(http_client=mock_client).fetch_many(urls)
+
+    assert mock_client.get.call_count == 2
+    assert results[0] is results[2]
+    assert [result.job_title for result in results] == ["1", "2", "1"]
+
+
+@patch("jobdog.jobdog.get_parser")
+def test_iter_details_skips_duplicates(mock_get_parser):
+    mock_parser = _echo_parser()
+    mock_parser.sanitize_url.side_effect = lambda url: url.split("?")[0]
+    mock_get_parser.return_value = mock_parser
+
+    mock_client = MagicMock()
+    mock_client.get.side_effect = lambda url: MagicMock(text=url[-1])
+
+    urls = ["https://example.com/job/1?ref=feed", "https://example.com/job/1"]
+    results = list(JobDog(http_client=mock_client).iter_details(urls, dedupe=True))
+
+    assert [url for url, _ in results] == [urls[0]]
+    assert mock_client.get.call_count == 1
+    # each URL is sanitized once, for the key and the fetch
+    assert mock_parser.sanitize_url.call_count == 2
+
+    # off by default, so long inputs do not pile up keys
+    results = list(JobDog(http_client=mock_client).iter_details(urls))
+    assert sorted(url for url, _ in results) == sorted(urls)
+
+
+@patch("jobdog.jobdog.get_parser")
+def test_fetch_details_coalesces_in_flight_requests(mock_get_parser):
+    mock_get_parser.return_value = _echo_parser()
+    release = threading.Event()
+
+    def get(url):
+        release.wait(5)
+        return MagicMock(text="Hero")
+
+    mock_client = MagicMock()
+    mock_client.get.side_effect = get
+    dog = JobDog(http_client=mock_client)
+
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(dog.fetch_details("https://example.com/1"))
+        )
+        for _ in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    while mock_client.get.call_count == 0:
+        time.sleep(0.001)
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert mock_client.get.call_count == 1
+    assert len(results) == 3
+    assert results[0] is results[1] is results[2]
+    assert dog._in_flight == {}
+
+
+@patch("jobdog.jobdog.get_parser")
+def test_async_fetch_details_coalesces_in_flight_requests(mock_get_parser):
+    mock_get_parser.return_value = _echo_parser()
+
+    async def get(url):
+        await asyncio.sleep(0.01)
+        if url.endswith("bad"):
+            raise Exception("Connection error")
+        return MagicMock(text="Hero")
+
+    mock_client = MagicMock()
+    mock_client.get.side_effect = get
+
+    async def run():
+        dog = AsyncJobDog(http_client=mock_client)
+        good = await asyncio.gather(
+            *(dog.fetch_details("https://example.com/1") for _ in range(3))
+        )
+        bad = await asyncio.gather(
+            *(dog.fetch_details("https://example.com/bad") for _ in range(2)),
+            return_exceptions=True,
+        )
+        return good, bad
+
+    good, bad = asyncio.run(run())
+    assert mock_client.get.call_count == 2
+    assert good[0] is good[1] is good[2]
+    assert all(isinstance(error, FetchError) for error in bad)
+
+
+@patch("jobdog.jobdog.get_parser")
+def test_async_cancelled_owner_does_not_cancel_joiners(mock_get_parser):
+    mock_get_parser.return_value = _echo_parser()
+
+    async def get(url):
+        await asyncio.sleep(10)
+
+    mock_client = MagicMock()
+    mock_client.get.side_effect = get
+
+    async def run():
+        dog = AsyncJobDog(http_client=mock_client)
+        owner = asyncio.create_task(dog.fetch_details("https://example.com/1"))
+        await asyncio.sleep(0)
+        batch = asyncio.create_task(dog.fetch_many(["https://example.com/1"]))
+        await asyncio.sleep(0.01)
+        owner.cancel()
+        return await batch
+
+    (result,) = asyncio.run(run())
+    assert isinstance(result, FetchError)
+    assert mock_client.get.call_count == 1
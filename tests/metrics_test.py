@@ -0,0 +1,134 @@
+import httpx
+import pytest
+from jobdog import metrics
+from jobdog.jobdog import JobDog
+from jobdog.metrics import HttpTrace, InMemoryExporter
+from jobdog.models.job_listing import JobListing
+from unittest.mock import MagicMock, patch
+
+
+@pytest.fixture
+def exporter():
+    exporter = metrics.add_hook(InMemoryExporter(buckets=(0.1, 1)))
+    yield exporter
+    metrics.remove_hook(exporter)
+
+
+def _stages(exporter: InMemoryExporter) -> dict[str, dict]:
+    return {stage["stage"]: stage for stage in exporter.snapshot()["stages"]}
+
+
+def test_spans_are_free_without_hooks():
+    assert not metrics.enabled()
+    with metrics.span("parse_html", provider="greenhouse.io") as span:
+        span.set_tag("status", 200)
+    assert isinstance(span, metrics._NoopSpan)
+
+
+def test_nested_spans_inherit_tags(exporter):
+    with metrics.span("fetch_details", provider="greenhouse.io"):
+        with metrics.span("parse_html"):
+            metrics.increment("cache_hits")
+        with pytest.raises(ValueError):
+            with metrics.span("validate"):
+                raise ValueError("bad listing")
+
+    stages = _stages(exporter)
+    assert stages["parse_html"]["tags"] == {
+        "provider": "greenhouse.io",
+        "outcome": "ok",
+    }
+    assert stages["validate"]["tags"]["outcome"] == "error"
+    assert stages["fetch_details"]["count"] == 1
+    assert exporter.snapshot()["counters"] == [
+        {"name": "cache_hits", "tags": {"provider": "greenhouse.io"}, "value": 1}
+    ]
+
+
+def test_render_prometheus_text(exporter):
+    metrics.record("parse_html", 0.05, provider="jobindex.dk")
+    metrics.record("parse_html", 0.5, provider="jobindex.dk")
+    metrics.increment("retries", status=429)
+
+    text = exporter.render()
+    labels = 'stage="parse_html",outcome="ok",provider="jobindex.dk"'
+    assert f'jobdog_stage_seconds_bucket{{{labels},le="0.1"}} 1' in text
+    assert f'jobdog_stage_seconds_bucket{{{labels},le="1.0"}} 2' in text
+    assert f'jobdog_stage_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+    assert f"jobdog_stage_seconds_count{{{labels}}} 2" in text
+    assert "# TYPE jobdog_retries_total counter" in text
+    assert 'jobdog_retries_total{status="429"} 1.0' in text
+
+
+def test_http_trace_records_phases(exporter):
+    trace = HttpTrace()
+    for event in [
+        "connection.connect_tcp.started",
+        "connection.connect_tcp.complete",
+        "http11.send_request_headers.started",
+        "http11.send_request_headers.complete",
+        "http11.receive_response_headers.started",
+        "http11.receive_response_headers.complete",
+        "http11.receive_response_body.started",
+        "http11.receive_response_body.failed",
+    ]:
+        trace(event, {})
+
+    stages = _stages(exporter)
+    assert set(stages) == {"http_connect", "http_send", "http_wait", "http_body"}
+    assert stages["http_body"]["tags"] == {"outcome": "error"}
+
+
+@patch("jobdog.jobdog.get_provider_domain", return_value="example.com")
+@patch("jobdog.jobdog.get_parser")
+def test_fetch_details_reports_stages(mock_get_parser, _, exporter):
+    mock_parser = MagicMock()
+    mock_parser.sanitize_url.return_value = "https://example.com/job/123"
+    mock_parser.parse_html.return_value = JobListing(
+        job_title="Likeable Superhero",
+        company_name="NotVought",
+        job_description="You will not be evil",
+    )
+    mock_get_parser.return_value = mock_parser
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, text="<html>"))
+    dog = JobDog(http_client=httpx.Client(transport=transport))
+
+    dog.fetch_details("https://example.com/job/123")
+
+    stages = _stages(exporter)
+    assert {"fetch_details", "get_parser", "sanitize_url", "http_request"} <= set(
+        stages
+    )
+    assert stages["http_request"]["tags"] == {
+        "provider": "example.com",
+        "status": "200",
+        "outcome": "ok",
+    }
+    assert stages["parse_html"]["count"] == 1
+
+
+def test_request_keeps_caller_extensions(exporter):
+    extensions = {}
+    events = []
+
+    def handler(request):
+        extensions.update(request.extensions)
+        return httpx.Response(200)
+
+    dog = JobDog(http_client=httpx.Client(transport=httpx.MockTransport(handler)))
+    dog._request(
+        "https://example.com/job/123",
+        extensions={
+            "trace": lambda event_name, info: events.append(event_name),
+            "sni_hostname": "example.org",
+        },
+    )
+
+    assert extensions["sni_hostname"] == "example.org"
+    extensions["trace"]("connection.connect_tcp.started", {})
+    extensions["trace"]("connection.connect_tcp.complete", {})
+    assert events == [
+        "connection.connect_tcp.started",
+        "connection.connect_tcp.complete",
+    ]
+    assert "http_connect" in _stages(exporter)
@@ -0,0 +1,74 @@
+from jobdog.models.compact_job_listing import CompactJobListing
+from jobdog.models.job_listing import (
+    EmploymentType,
+    ExperienceLevel,
+    JobListing,
+    LocationType,
+)
+from jobdog.providers.jobindex import JobIndexParser
+
+LISTING = JobListing(
+    job_title="Chief Squirrel Chaser",
+    company_name="Barks & Recreation",
+    job_description="Chase squirrels",
+    job_listing_url="https://example.com/jobs/1",
+    location=["Dog Park", "Backyard"],
+    location_type="Remote",
+    employment_type="Full-time",
+    experience_level="Mid-Senior level",
+    apply_url="https://example.com/jobs/1/apply",
+    skills=["Barking"],
+    industry="Outdoors",
+)
+
+
+def test_round_trip_is_lossless():
+    compact = CompactJobListing.from_listing(LISTING)
+    assert compact.to_listing() == LISTING
+    assert compact.to_listing().model_dump() == LISTING.model_dump()
+
+
+def test_from_values_normalizes_like_job_listing():
+    compact = CompactJobListing.from_values(
+        {
+            "job_title": "Chief Squirrel Chaser",
+            "company_name": "Barks & Recreation",
+            "job_description": "Chase squirrels",
+            "location": ["Dog Park"],
+            "location_type": "Remote",
+            "employment_type": "Full-time",
+            "experience_level": "senior",
+        }
+    )
+    assert compact.location == ("Dog Park",)
+    assert compact.location_type is LocationType.REMOTE
+    assert compact.employment_type is EmploymentType.FULL_TIME
+    assert compact.experience_level is ExperienceLevel.SENIOR
+    assert compact.apply_url is None
+
+
+def test_repeated_strings_are_shared():
+    # built at runtime so the strings are distinct objects
+    company_name = "".join(["Barks & ", "Recreation"])
+    location = "".join(["Dog ", "Park"])
+    assert company_name is not LISTING.company_name
+
+    first = CompactJobListing.from_listing(LISTING)
+    second = CompactJobListing.from_values(
+        {"company_name": company_name, "location": [location]}
+    )
+    assert first.company_name is second.company_name
+    assert first.location[0] is second.location[0]
+
+
+def test_parse_compact_matches_parse_html():
+    html = """
+    <html><body>
+    <h1>Pilot Scientist</h1>
+    <span class="jobtext-jobad__company">Novo Nordisk A/S</span>
+    <div class="jobtext-jobad__body"><p>Drive production campaigns.</p></div>
+    <div class="jobtext-jobad__place-item">2880 Bagsværd</div>
+    </body></html>
+    """
+    parser = JobIndexParser()
+    assert parser.parse_compact(html).to_listing() == parser.parse_html(html)
@@ -0,0 +1,75 @@
+import multiprocessing
+import pytest
+from httpx import Request, Response
+from unittest.mock import MagicMock
+from jobdog.jobdog import JobDog
+from jobdog.exceptions import UnsupportedProviderError
+from jobdog.models.job_listing import JobListing
+from jobdog.parse_pool import (
+    create_parse_pool,
+    listing_from_dict,
+    parse_html_in_worker,
+)
+from jobdog.providers.jobindex import JobIndexParser  # noqa: F401 registers parser
+
+URL = "https://www.jobindex.dk/jobannonce/r12800344"
+HTML = """
+<html><body>
+<h1>Pilot Scientist</h1>
+<span class="jobtext-jobad__company">Novo Nordisk A/S</span>
+<div class="jobtext-jobad__body"><p>Drive production campaigns.</p></div>
+<div class="jobtext-jobad__place-item">2880 Bagsværd</div>
+</body></html>
+"""
+
+
+@pytest.fixture(scope="module")
+def parse_pool():
+    # spawn so workers start without the test process' PARSER_MAP
+    pool = create_parse_pool(
+        max_workers=1, mp_context=multiprocessing.get_context("spawn")
+    )
+    yield pool
+    pool.shutdown()
+
+
+def test_parse_html_in_worker():
+    data = parse_html_in_worker("jobindex.dk", HTML)
+    assert data["job_title"] == "Pilot Scientist"
+    assert data["location"] == ["2880 Bagsværd"]
+
+
+def test_parse_html_in_worker_with_fields():
+    data = parse_html_in_worker("jobindex.dk", HTML, ["job_title", "location"])
+    listing = listing_from_dict(data, ["job_title", "location"])
+    assert listing.location == ["2880 Bagsværd"]
+    assert listing.company_name is None
+    assert "company_name" not in data
+
+
+def test_parse_html_in_worker_registers_parsers_again(restore_parser_map):
+    restore_parser_map.clear()
+    data = parse_html_in_worker("jobindex.dk", HTML)
+    assert data["job_title"] == "Pilot Scientist"
+
+    with pytest.raises(UnsupportedProviderError, match="parser_modules"):
+        parse_html_in_worker("example.com", HTML)
+
+
+def test_parse_pool_parses_in_worker_process(parse_pool):
+    data = parse_pool.submit(parse_html_in_worker, "jobindex.dk", HTML).result()
+    assert JobListing.model_validate(data).company_name == "Novo Nordisk A/S"
+
+
+def test_fetch_details_with_parse_executor(parse_pool):
+    mock_client = MagicMock()
+    mock_client.get.return_value = Response(200, text=HTML, request=Request("GET", URL))
+
+    dog = JobDog(http_client=mock_client, parse_executor=parse_pool)
+    results = dog.fetch_many([URL, URL])
+
+    for job_listing in results:
+        assert isinstance(job_listing, JobListing)
+        assert job_listing.job_title == "Pilot Scientist"
+        assert job_listing.job_description == "Drive production campaigns."
+        assert str(job_listing.job_listing_url) == URL
@@ -0,0 +1,121 @@
+from typing import Any, Callable
+
+import selectolax.parser
+from selectolax.parser import HTMLParser
+
+from jobdog.exceptions import ParserError
+from jobdog.profiling import OUTSIDE_EXTRACTORS, ParserProfiler
+from jobdog.providers.base import BaseParser
+from jobdog.providers.jobindex import JobIndexParser
+
+PAGE = """
+<html><body>
+  <h1>Likeable Superhero</h1>
+  <div class="company">NotVought</div>
+  <div class="body"><p>You will not be evil</p></div>
+</body></html>
+"""
+
+
+class FallbackParser(BaseParser):
+    def sanitize_url(self, url: str) -> str:
+        return url
+
+    def extractors(self, html: str) -> dict[str, Callable[[], Any]]:
+        tree = HTMLParser(html)
+        return {
+            "job_title": lambda: self._extract_job_title(tree),
+            "company_name": lambda: self._extract_company_name(tree),
+            "job_description": lambda: self._extract_job_description(tree),
+        }
+
+    def _extract_job_title(self, tree: HTMLParser) -> str:
+        return tree.css_first("h1").text()
+
+    def _extract_company_name(self, tree: HTMLParser) -> str:
+        for selector in ("span.employer", "a.company", "div.company"):
+            node = tree.css_first(selector)
+            if node is not None:
+                return node.text()
+        raise ParserError("Failed to extract company name")
+
+    def _extract_job_description(self, tree: HTMLParser) -> str:
+        if not tree.css("div.description"):
+            raise ParserError("Failed to extract job description")
+        return ""
+
+
+def test_profile_records_extractors_and_selectors():
+    parser = FallbackParser()
+    profiler = ParserProfiler()
+    for _ in range(3):
+        profiler.profile(parser, PAGE)
+
+    assert (profiler.pages, profiler.errors) == (3, 3)
+    assert profiler.dom_seconds["FallbackParser"] > 0
+
+    company = profiler.extractors[("FallbackParser", "_extract_company_name")]
+    assert company.calls == 3
+    assert company.fallback_depths == {2: 3}
+    assert company.mean_depth == 2
+
+    description = profiler.extractors[("FallbackParser", "_extract_job_description")]
+    assert description.errors == 3
+    assert description.fallback_depths == {None: 3}
+
+    missed = profiler.selectors[
+        ("FallbackParser", "_extract_company_name", "span.employer")
+    ]
+    hit = profiler.selectors[("FallbackParser", "_extract_company_name", "div.company")]
+    assert (missed.calls, missed.hits) == (3, 0)
+    assert (hit.calls, hit.hits) == (3, 3)
+
+    report = profiler.report()
+    assert "FallbackParser._extract_company_name" in report
+    assert "div.company" in report
+
+
+def test_instrument_restores_parser():
+    parser = FallbackParser()
+    with ParserProfiler().instrument(parser):
+        assert "_extract_job_title" in vars(parser)
+        assert globals()["HTMLParser"] is not selectolax.parser.HTMLParser
+    assert "_extract_job_title" not in vars(parser)
+    assert globals()["HTMLParser"] is selectolax.parser.HTMLParser
+
+
+JOBINDEX_PAGE = """
+<html><body>
+  <h1>Likeable Superhero</h1>
+  <span class="jobtext-jobad__company">NotVought</span>
+  <div class="jobtext-jobad__body"><p>You will not be evil</p></div>
+</body></html>
+"""
+
+
+def test_profile_spec_parser():
+    parser = JobIndexParser()
+    profiler = ParserProfiler()
+    with profiler.instrument(parser):
+        assert "extractors" in vars(parser)
+    assert "extractors" not in vars(parser)
+
+    for _ in range(2):
+        profiler.profile(parser, JOBINDEX_PAGE)
+
+    assert (profiler.pages, profiler.errors) == (2, 0)
+    company = profiler.extractors[("JobIndexParser", "company_name")]
+    assert company.fallback_depths == {1: 2}
+    assert profiler.extractors[("JobIndexParser", "location")].fallback_depths == {
+        None: 2
+    }
+    # lookups served by the shared query are reported per selector
+    title = profiler.selectors[("JobIndexParser", "job_title", "h1")]
+    assert (title.calls, title.hits) == (2, 2)
+    place = profiler.selectors[
+        ("JobIndexParser", "location", ".jobtext-jobad__place-item")
+    ]
+    assert (place.calls, place.hits) == (2, 0)
+    shared = [key for key in profiler.selectors if key[1] == OUTSIDE_EXTRACTORS]
+    assert len(shared) == 1
+    assert profiler.selectors[shared[0]].calls == 2
@@ -0,0 +1,132 @@
+import json
+import pytest
+from unittest.mock import patch
+from jobdog.models.job_listing import EmploymentType
+from jobdog.providers.base import (
+    BaseParser,
+    ParseContext,
+    build_listing,
+    map_job_posting,
+)
+
+JOB_POSTING = {
+    "@context": "https://schema.org",
+    "@type": "JobPosting",
+    "title": "Chief Squirrel Chaser",
+    "hiringOrganization": {"@type": "Organization", "name": "Barks & Recreation"},
+    "description": "&lt;p&gt;Chase &lt;b&gt;squirrels&lt;/b&gt;&lt;/p&gt;",
+    "datePosted": "2024-10-18T09:30:00.000Z",
+    "validThrough": "2025-01-23",
+    "employmentType": ["OTHER", "FULL_TIME"],
+    "baseSalary": {
+        "@type": "MonetaryAmount",
+        "currency": "DKK",
+        "value": {"minValue": 40000, "maxValue": 50000, "unitText": "MONTH"},
+    },
+}
+
+
+def _page(*blocks: str) -> str:
+    scripts = "".join(
+        f'<script type="application/ld+json">{block}</script>' for block in blocks
+    )
+    return f"<html><head>{scripts}</head><body><h1>Title</h1></body></html>"
+
+
+def test_map_job_posting():
+    assert map_job_posting(JOB_POSTING) == {
+        "job_title": "Chief Squirrel Chaser",
+        "company_name": "Barks & Recreation",
+        "job_description": "Chase squirrels",
+        "employment_type": EmploymentType.FULL_TIME,
+        "salary": "40000-50000 per month",
+        "currency": "DKK",
+        "job_posting_date": "2024-10-18",
+        "job_expiry_date": "2025-01-23",
+    }
+
+
+def test_map_job_posting_skips_missing_fields():
+    assert map_job_posting({"@type": "JobPosting", "title": "Good Boy"}) == {
+        "job_title": "Good Boy"
+    }
+
+
+def test_parse_context_finds_job_posting_among_blocks():
+    website = json.dumps({"@type": "WebSite", "name": "Jobindex"})
+    graph = json.dumps({"@graph": [{"@type": "Organization"}, JOB_POSTING]})
+    context = ParseContext(_page("{not json", website, graph))
+
+    assert [block["@type"] for block in context.json_ld] == [
+        "WebSite",
+        "Organization",
+        "JobPosting",
+    ]
+    assert context.job_posting["title"] == "Chief Squirrel Chaser"
+    assert context.job_posting_fields["company_name"] == "Barks & Recreation"
+
+
+def test_parse_context_decodes_json_ld_once():
+    context = ParseContext(_page(json.dumps(JOB_POSTING)))
+    with patch("jobdog.providers.base.json.loads", wraps=json.loads) as loads:
+        context.job_posting_fields
+        context.job_posting
+        context.job_posting_fields
+    assert loads.call_count == 1
+
+
+def test_parse_context_without_job_posting():
+    context = ParseContext(_page(json.dumps({"@type": "WebSite"})))
+    assert context.job_posting is None
+    assert context.job_posting_fields == {}
+    assert context.tree.css_first("h1").text() == "Title"
+
+
+def test_build_listing_runs_only_requested_extractors():
+    calls = []
+
+    def extractor(name, value):
+        def extract():
+            calls.append(name)
+            return value
+
+        return extract
+
+    extractors = {
+        "job_title": extractor("job_title", "Chief Squirrel Chaser"),
+        "company_name": extractor("company_name", "Barks & Recreation"),
+        "job_description": extractor("job_description", "Chase squirrels"),
+    }
+    listing = build_listing(extractors, fields=["job_title"])
+
+    assert calls == ["job_title"]
+    assert listing.job_title == "Chief Squirrel Chaser"
+    assert listing.company_name is None
+    assert listing.job_description is None
+    assert listing.model_fields_set == {"job_title"}
+
+
+def test_build_listing_rejects_unknown_fields():
+    with pytest.raises(ValueError, match="Unknown JobListing fields: wage"):
+        build_listing({}, fields=["job_title", "wage"])
+
+
+def test_parser_without_extraction_is_rejected():
+    with pytest.raises(TypeError, match="must set spec or implement"):
+
+        class NoopParser(BaseParser):
+            def sanitize_url(self, url):
+                return url
+
+    # bases that leave sanitize_url to their subclasses are not checked
+    class SiteParser(BaseParser):
+        pass
+
+    class ExampleParser(SiteParser):
+        def sanitize_url(self, url):
+            return url
+
+        def parse_html(self, html):
+            return {"title": "Example Job"}
+
+    assert ExampleParser().parse_html("") == {"title": "Example Job"}
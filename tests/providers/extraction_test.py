@@ -0,0 +1,140 @@
+import pytest
+
+from jobdog.exceptions import ParserError
+from jobdog.models.job_listing import EmploymentType, ExperienceLevel
+from jobdog.providers.base import ParseContext
+from jobdog.providers.extraction import (
+    ExtractionSpec,
+    Field,
+    LabelMap,
+    SpecDocument,
+)
+from jobdog.providers.linkedin import LinkedInParser
+
+PAGE = """
+<html><head><title>Likeable Superhero at NotVought</title></head><body>
+  <h1 class="top-card__title">Likeable Superhero</h1>
+  <a class="topcard__org-name-link" href="https://example.com/notvought">NotVought</a>
+  <div class="summary"><p></p></div>
+  <div class="summary description"><p>You will not be evil</p></div>
+  <ul class="location"><li>Copenhagen</li><li>Aarhus</li></ul>
+  <ul class="description__job-criteria-list">
+    <li class="description__job-criteria-item">
+      <h3>Seniority level</h3><span>Entry level</span>
+    </li>
+    <li class="description__job-criteria-item">
+      <h3>Employment type</h3><span>Full-time</span>
+    </li>
+    <li class="description__job-criteria-item">
+      <h3>Job function</h3><span>Engineering and Information Technology</span>
+    </li>
+    <li class="description__job-criteria-item">
+      <h3>Industries</h3><span>Research Services</span>
+    </li>
+  </ul>
+</body></html>
+"""
+
+SPEC = ExtractionSpec(
+    {
+        "job_title": Field(selectors=("h2", "h1.top-card__title"), required=True),
+        "company_name": Field(selectors=("a.topcard__org-name-link",)),
+        "apply_url": Field(selectors=("a.topcard__org-name-link",), attribute="href"),
+        # the first .summary is empty, so the fallback is used
+        "job_description": Field(selectors=("div.summary", "div.description")),
+        "location": Field(
+            selectors=("ul.location > li:nth-child(2)",),
+            process=lambda node: [node.text()],
+        ),
+        "job_function": Field(labels=("Function",)),
+        "industry": Field(selectors=("#industry",), labels=("industries",)),
+        "salary": Field(labels=("Salary",)),
+    },
+    LabelMap(items="li.description__job-criteria-item", label="h3", value="span"),
+)
+
+
+class CountingTree:
+    def __init__(self, tree) -> None:
+        self.tree = tree
+        self.queries = []
+
+    def css(self, query: str):
+        self.queries.append(query)
+        return self.tree.css(query)
+
+    def css_first(self, query: str):
+        self.queries.append(query)
+        return self.tree.css_first(query)
+
+
+def test_spec_extracts_fields_in_one_query():
+    context = ParseContext(PAGE)
+    context.tree = tree = CountingTree(context.tree)
+    extractors = SPEC.extractors(context)
+
+    assert {name: extract() for name, extract in extractors.items()} == {
+        "job_title": "Likeable Superhero",
+        "company_name": "NotVought",
+        "apply_url": "https://example.com/notvought",
+        "job_description": "You will not be evil",
+        "location": ["Aarhus"],
+        "job_function": "Engineering and Information Technology",
+        "industry": "Research Services",
+        "salary": None,
+    }
+    # simple selectors and the criteria share a query; the rest run alone,
+    # as do selectors sharing a node with another one
+    assert "li.description__job-criteria-item" in tree.queries[0]
+    assert tree.queries[1:] == [
+        "div.summary",
+        "div.description",
+        "ul.location > li:nth-child(2)",
+    ]
+
+
+def test_overlapping_selectors_keep_page_order():
+    spec = ExtractionSpec(
+        {
+            "job_title": Field(selectors=("h1", "h2")),
+            "job_description": Field(selectors=("p.lead", "p.note")),
+            "company_name": Field(selectors=("p.note",)),
+            "industry": Field(labels=("industries",)),
+            "skills": Field(selectors=("li",), process=lambda node: [node.text()]),
+        },
+        LabelMap(items="li.criteria", label="h3", value="span"),
+    )
+    page = """
+      <h2>Subtitle</h2><h1>Title</h1>
+      <p class=note>first</p><p class="lead note">lead</p>
+      <ul><li class=criteria><h3>Industries</h3><span>Research</span></li></ul>
+    """
+    document = SpecDocument(spec, ParseContext(page))
+    assert document.value("job_title") == "Title"
+    assert document.value("job_description") == "lead"
+    assert document.value("company_name") == "first"
+    assert document.value("industry") == "Research"
+    assert document.labels() == [("industries", document.first("li > span"))]
+
+
+def test_required_field_raises():
+    extractors = SPEC.extractors(ParseContext("<html><body></body></html>"))
+    assert extractors["company_name"]() is None
+    with pytest.raises(ParserError, match="Failed to extract job title"):
+        extractors["job_title"]()
+
+
+def test_linkedin_reads_job_criteria():
+    page = (
+        PAGE.replace("top-card__title", "")
+        .replace("topcard__org-name-link", "sub-nav-cta__optional-url")
+        .replace("summary description", "show-more-less-html__markup")
+    )
+    listing = LinkedInParser().parse_html(page)
+    assert listing.job_title == "Likeable Superhero"
+    assert listing.company_name == "NotVought"
+    assert "You will not be evil" in listing.job_description
+    assert listing.job_function == "Engineering and Information Technology"
+    assert listing.experience_level == ExperienceLevel.ENTRY
+    assert listing.employment_type == EmploymentType.FULL_TIME
+    assert listing.industry == "Research Services"
@@ -0,0 +1,117 @@
+import pytest
+from jobdog.exceptions import UnsupportedProviderError
+from jobdog.providers.base import BaseParser
+from jobdog.providers.greenhouse import GreenhouseParser
+from jobdog.providers.jobindex import JobIndexParser
+from jobdog.providers.linkedin import LinkedInParser
+from jobdog.providers.router import ParserRegistry, Router, split_url
+
+
+class ReedParser(BaseParser):
+    url_patterns = (r"^/jobs/[^/]+/(?P<job_id>\d+)",)
+
+    def sanitize_url(self, url):
+        return url
+
+    def parse_html(self, html):
+        return {"title": "Reed Job"}
+
+
+ROUTER = Router(
+    {
+        "greenhouse.io": GreenhouseParser,
+        "jobindex.dk": JobIndexParser,
+        "linkedin.com": LinkedInParser,
+        "reed.co.uk": ReedParser,
+    }
+)
+
+
+@pytest.mark.parametrize(
+    "url, domain, job_id",
+    [
+        (
+            "https://boards.greenhouse.io/anthropic/jobs/4182383008",
+            "greenhouse.io",
+            "4182383008",
+        ),
+        (
+            "https://job-boards.eu.greenhouse.io/acme/jobs/123?gh_src=x",
+            "greenhouse.io",
+            "123",
+        ),
+        (
+            "https://www.jobindex.dk/jobannonce/r12800344/pilot-scientist",
+            "jobindex.dk",
+            "r12800344",
+        ),
+        (
+            "https://www.linkedin.com/jobs/view/senior-engineer-at-acme-4053542511/",
+            "linkedin.com",
+            "4053542511",
+        ),
+        (
+            "https://www.linkedin.com/jobs/search/?currentJobId=4053542511&keywords=x",
+            "linkedin.com",
+            "4053542511",
+        ),
+        (
+            "HTTPS://WWW.Reed.CO.UK:443/jobs/data-engineer/51234567#apply",
+            "reed.co.uk",
+            "51234567",
+        ),
+        ("https://www.jobindex.dk/", "jobindex.dk", None),
+    ],
+)
+def test_router_match(url, domain, job_id):
+    route = ROUTER.match(url)
+    assert route.domain == domain
+    assert route.job_id == job_id
+    assert route.parser_class is ROUTER.match(f"https://{domain}/").parser_class
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "https://co.uk/jobs/1",
+        "https://greenhouse.io.evil.com/acme/jobs/1",
+        "https://notgreenhouse.io/acme/jobs/1",
+        "not a url",
+    ],
+)
+def test_router_rejects_unknown_hosts(url):
+    with pytest.raises(UnsupportedProviderError):
+        ROUTER.match(url)
+
+
+def test_router_classify():
+    urls = [
+        "https://boards.greenhouse.io/a/jobs/1",
+        "https://unknown.com/job/1",
+        "https://www.jobindex.dk/jobannonce/r1",
+        "https://job-boards.greenhouse.io/b/jobs/2",
+    ]
+    assert ROUTER.classify(urls) == {
+        "greenhouse.io": [urls[0], urls[3]],
+        None: [urls[1]],
+        "jobindex.dk": [urls[2]],
+    }
+
+
+def test_split_url():
+    assert split_url("https://user@Jobs.Example.com.:8080/a/b?c=1#d") == (
+        "jobs.example.com",
+        "/a/b?c=1",
+    )
+
+
+def test_parser_registry_rebuilds_router():
+    registry = ParserRegistry({"jobindex.dk": JobIndexParser})
+    assert registry.router.match("https://jobindex.dk/").domain == "jobindex.dk"
+
+    registry["reed.co.uk"] = ReedParser
+    assert registry.router.match("https://www.reed.co.uk/").domain == "reed.co.uk"
+
+    registry.clear()
+    with pytest.raises(UnsupportedProviderError):
+        registry.router.match("https://jobindex.dk/")
@@ -0,0 +1,79 @@
+import pytest
+from selectolax.parser import HTMLParser
+
+from jobdog.providers.text import html_to_text
+
+DESCRIPTION = """
+<div class="description">
+  <h2>About the   role</h2>
+  <p>You will chase <b>squirrels</b> &amp; fetch
+     balls.<br>Every day.</p>
+  <ul>
+    <li>Run fast</li>
+    <li><p>Bark loud</p>
+      <ul><li>at cats</li><li>at mail carriers</li></ul>
+      <p>but not at night</p>
+    </li>
+  </ul>
+  Loose text after the list
+  <script>track()</script>
+  <div class="apply"><a href="/apply">Apply</a></div>
+</div>
+"""
+
+TEXT = """About the role
+
+You will chase squirrels & fetch balls.
+Every day.
+
+• Run fast
+• Bark loud
+  • at cats
+  • at mail carriers
+  but not at night
+
+Loose text after the list
+
+Apply"""
+
+
+def test_html_to_text_keeps_structure():
+    assert html_to_text(DESCRIPTION) == TEXT
+
+
+def test_html_to_text_node_and_skip_classes():
+    node = HTMLParser(DESCRIPTION).css_first("div.description")
+    assert html_to_text(node, skip_classes=("apply",)) == TEXT[: -len("\n\nApply")]
+
+
+@pytest.mark.parametrize(
+    "html, expected",
+    [
+        (None, ""),
+        ("", ""),
+        ("  Plain   text ", "Plain text"),
+        ("<p> </p><p>\n</p>", ""),
+        ("<ol><li>One</li><li>Two</li></ol><p>Three</p>", "• One\n• Two\n\nThree"),
+    ],
+)
+def test_html_to_text_edge_cases(html, expected):
+    assert html_to_text(html) == expected
+
+
+@pytest.mark.parametrize(
+    "html",
+    [
+        "<h2>About</h2><p>We &amp; you</p><ul>\n<li>Run <b>fast</b></li>\n<li>Bark</li>\n</ul>",
+        "<div><p>One<br/>Two</p></div>Loose &nbsp;text<hr><P>Three</P>",
+        "<ul><li>One</li>between<li>Two</ul>after",
+        # the HTML parser repairs or restructures these
+        "<p>One<div>Two</div></p>",
+        "<h2>One<h3>Two</h3></h2>",
+        "<ul><li>One<ul><li>Two</li></ul></li></ul>",
+        "<b>One<p>Two</b>Three</p>",
+        "</div>One<pre>\nTwo</pre><!-- <p>Three</p> -->",
+        "<table><td>One</td></table>a < b",
+    ],
+)
+def test_html_to_text_fragment_matches_tree(html):
+    assert html_to_text(html) == html_to_text(HTMLParser(html).body)
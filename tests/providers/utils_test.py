@@ -1,8 +1,17 @@
+import re
+import threading
 import pytest
 from jobdog.providers.base import BaseParser
-from jobdog.providers.utils import register_parser, get_parser, PARSER_MAP
+from jobdog.providers.utils import (
+    register_parser,
+    get_parser,
+    get_provider_domain,
+    PARSER_MAP,
+)
 from jobdog.exceptions import UnsupportedProviderError
 
+pytestmark = pytest.mark.usefixtures("restore_parser_map")
+
 
 def test_base_parser_is_abstract():
     with pytest.raises(TypeError):
@@ -55,3 +64,91 @@ def test_multiple_parser_registration():
     assert "site2.com" in PARSER_MAP
     assert isinstance(get_parser("https://site1.com/job/123"), Site1Parser)
     assert isinstance(get_parser("https://site2.com/job/456"), Site2Parser)
+
+
+def test_get_provider_domain():
+    PARSER_MAP.clear()
+
+    @register_parser("example.com")
+    class ExampleParser(BaseParser):
+        def sanitize_url(self, url):
+            return url
+
+        def parse_html(self, html):
+            return {"title": "Example Job"}
+
+    assert get_provider_domain("https://jobs.Example.com/job/123") == "example.com"
+    with pytest.raises(UnsupportedProviderError):
+        get_provider_domain("https://unknown.com/job/123")
+
+
+def test_get_parser_reuses_set_up_instance():
+    PARSER_MAP.clear()
+
+    @register_parser("example.com")
+    class ExampleParser(BaseParser):
+        setup_calls = 0
+
+        def setup(self):
+            ExampleParser.setup_calls += 1
+            self.title_re = re.compile(r"<h1>(.*?)</h1>")
+
+        def sanitize_url(self, url):
+            return url
+
+        def parse_html(self, html):
+            return {"title": self.title_re.search(html).group(1)}
+
+    parser = get_parser("https://example.com/job/123")
+    assert get_parser("https://jobs.example.com/job/456") is parser
+    assert ExampleParser.setup_calls == 1
+    assert parser.title_re.pattern == r"<h1>(.*?)</h1>"
+
+    @register_parser("example.com")
+    class NewExampleParser(ExampleParser):
+        pass
+
+    assert isinstance(get_parser("https://example.com/job/123"), NewExampleParser)
+
+
+def test_get_parser_per_thread_when_not_thread_safe():
+    PARSER_MAP.clear()
+
+    @register_parser("example.com")
+    class ExampleParser(BaseParser):
+        thread_safe = False
+
+        def sanitize_url(self, url):
+            return url
+
+        def parse_html(self, html):
+            return {"title": "Example Job"}
+
+    parsers = []
+    thread = threading.Thread(
+        target=lambda: parsers.append(get_parser("https://example.com/job/1"))
+    )
+    thread.start()
+    thread.join()
+
+    parser = get_parser("https://example.com/job/1")
+    assert get_parser("https://example.com/job/2") is parser
+    assert parsers[0] is not parser
+
+
+def test_get_parser_after_merging_into_parser_map(restore_parser_map):
+    class ExampleParser(BaseParser):
+        def sanitize_url(self, url):
+            return url
+
+        def parse_html(self, html):
+            return {"title": "Example Job"}
+
+    # build the router before the change
+    with pytest.raises(UnsupportedProviderError):
+        get_parser("https://example.com/job/1")
+
+    restore_parser_map |= {"example.com": ExampleParser}
+
+    assert isinstance(get_parser("https://example.com/job/1"), ExampleParser)
+    assert get_provider_domain("https://jobs.example.com/job/1") == "example.com"
@@ -0,0 +1,136 @@
+import asyncio
+import time
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+import pytest
+from httpx import Request, Response
+from unittest.mock import patch, AsyncMock, MagicMock
+from jobdog.exceptions import FetchError
+from jobdog.jobdog import AsyncJobDog, JobDog
+from jobdog.models.job_listing import JobListing
+from jobdog.providers.base import BaseParser
+from jobdog.providers.utils import PARSER_MAP
+from jobdog.rate_limit import (
+    RateLimiters,
+    TokenBucket,
+    get_retry_delay,
+    parse_retry_after,
+)
+
+URL = "https://jobs.example.com/job/123"
+
+
+class ThrottledParser(BaseParser):
+    requests_per_second = 50
+    burst = 2
+
+    def sanitize_url(self, url):
+        return url
+
+    def parse_html(self, html):
+        return JobListing(
+            job_title=html, company_name="NotVought", job_description="Not evil"
+        )
+
+
+def _response(status_code: int, text: str = "", headers=None) -> Response:
+    return Response(
+        status_code, text=text, headers=headers, request=Request("GET", URL)
+    )
+
+
+def test_token_bucket_allows_burst_then_paces():
+    bucket = TokenBucket(rate=50, burst=3)
+    start = time.monotonic()
+    for _ in range(3):
+        bucket.acquire()
+    assert time.monotonic() - start < 0.01
+
+    for _ in range(5):
+        bucket.acquire()
+    assert time.monotonic() - start >= 0.09
+
+
+def test_token_bucket_pause():
+    bucket = TokenBucket(rate=1000)
+    bucket.pause(0.05)
+    start = time.monotonic()
+    asyncio.run(bucket.acquire_async())
+    assert time.monotonic() - start >= 0.04
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("120") == 120
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+    assert 28 <= parse_retry_after(format_datetime(retry_at, usegmt=True)) <= 30
+
+
+def test_get_retry_delay():
+    assert get_retry_delay(_response(200), 0, 3, 0.5, 60) is None
+    assert get_retry_delay(_response(404), 0, 3, 0.5, 60) is None
+    assert get_retry_delay(_response(429), 3, 3, 0.5, 60) is None
+    assert 0 <= get_retry_delay(_response(503), 2, 3, 0.5, 60) <= 2
+    assert (
+        get_retry_delay(_response(429, headers={"Retry-After": "7"}), 0, 3, 0.5, 60)
+        == 7
+    )
+    assert (
+        get_retry_delay(_response(429, headers={"Retry-After": "600"}), 0, 3, 0.5, 60)
+        is None
+    )
+
+
+def test_rate_limiters_use_parser_settings():
+    with patch.dict(PARSER_MAP, {"example.com": ThrottledParser}, clear=True):
+        limiters = RateLimiters()
+        bucket = limiters.get(URL)
+        assert bucket.rate == 50
+        assert bucket.burst == 2
+        assert limiters.get("https://www.example.com/other") is bucket
+        assert limiters.get("https://unknown.org/job/1") is None
+
+
+def test_fetch_details_retries_rate_limited_requests():
+    mock_client = MagicMock()
+    mock_client.get.side_effect = [
+        _response(429, headers={"Retry-After": "0"}),
+        _response(503),
+        _response(200, "Hero"),
+    ]
+
+    with patch.dict(PARSER_MAP, {"example.com": ThrottledParser}, clear=True):
+        dog = JobDog(http_client=mock_client, backoff_factor=0.001)
+        assert dog.fetch_details(URL).job_title == "Hero"
+
+    assert mock_client.get.call_count == 3
+
+
+def test_fetch_details_gives_up_after_max_retries():
+    mock_client = MagicMock()
+    mock_client.get.return_value = _response(429, headers={"Retry-After": "0"})
+
+    with patch.dict(PARSER_MAP, {"example.com": ThrottledParser}, clear=True):
+        dog = JobDog(http_client=mock_client, max_retries=2)
+        with pytest.raises(FetchError, match="429"):
+            dog.fetch_details(URL)
+
+    assert mock_client.get.call_count == 3
+
+
+def test_async_fetch_details_retries_rate_limited_requests():
+    mock_client = MagicMock()
+    mock_client.get = AsyncMock(
+        side_effect=[
+            _response(429, headers={"Retry-After": "0"}),
+            _response(200, "Hero"),
+        ]
+    )
+
+    with patch.dict(PARSER_MAP, {"example.com": ThrottledParser}, clear=True):
+        dog = AsyncJobDog(http_client=mock_client)
+        listing = asyncio.run(dog.fetch_details(URL))
+
+    assert listing.job_title == "Hero"
+    assert mock_client.get.await_count == 2
@@ -0,0 +1,172 @@
+import httpx
+import pytest
+from jobdog.exceptions import JobDogSanitizeUrlError
+from jobdog.jobdog import JobDog
+from jobdog.models.job_listing import JobListing
+from jobdog.scheduler import EXPIRED, GONE, RecrawlScheduler, expiry_timestamp
+from unittest.mock import MagicMock, patch
+
+URL = "https://example.com/job/123"
+NOW = 1_700_000_000.0
+DAY = 86400
+
+
+def _parser() -> MagicMock:
+    parser = MagicMock()
+    parser.sanitize_url.side_effect = lambda url: url.split("?")[0]
+    parser.parse_html.side_effect = lambda html: JobListing(
+        job_title=html,
+        company_name="NotVought",
+        job_description="You will not be evil",
+        job_expiry_date="2030-01-31",
+    )
+    return parser
+
+
+@pytest.fixture(autouse=True)
+def parser():
+    parser = _parser()
+    with (
+        patch("jobdog.scheduler.get_parser", return_value=parser),
+        patch("jobdog.jobdog.get_parser", return_value=parser),
+    ):
+        yield parser
+
+
+def _scheduler(
+    tmp_path, pages: list[httpx.Response], requests: list
+) -> RecrawlScheduler:
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return pages.pop(0)
+
+    dog = JobDog(http_client=httpx.Client(transport=httpx.MockTransport(handler)))
+    return RecrawlScheduler(dog, str(tmp_path / "recrawl.db"))
+
+
+def test_emits_only_changed_listings(tmp_path):
+    requests = []
+    pages = [
+        httpx.Response(200, text="Hero", headers={"ETag": '"v1"'}),
+        httpx.Response(304),
+        httpx.Response(200, text="Hero", headers={"ETag": '"v2"'}),
+        httpx.Response(200, text="Superhero", headers={"ETag": '"v3"'}),
+    ]
+    scheduler = _scheduler(tmp_path, pages, requests)
+    assert scheduler.add([URL + "?utm_source=x", URL], now=NOW) == 1
+
+    # a new listing is emitted on its first fetch
+    assert [job.job_title for job in scheduler.run_once(now=NOW)] == ["Hero"]
+    assert list(scheduler.run_once(now=NOW)) == []  # not due yet
+
+    now = NOW
+    for expected in [[], [], ["Superhero"]]:
+        now = scheduler.get(URL).next_fetch_at
+        assert [job.job_title for job in scheduler.run_once(now=now)] == expected
+    assert requests[1].headers["If-None-Match"] == '"v1"'
+
+    state = scheduler.get(URL)
+    assert (state.checks, state.changes, state.etag) == (4, 1, '"v3"')
+    # unchanged twice, then changed once
+    assert state.interval == DAY * 2
+    assert state.next_fetch_at == now + DAY * 2
+
+
+def test_intervals_stay_within_bounds(tmp_path):
+    pages = [httpx.Response(200, text="Hero")] + [httpx.Response(304)] * 10
+    scheduler = _scheduler(tmp_path, pages, [])
+    scheduler.add([URL], now=NOW)
+
+    now = NOW
+    for _ in range(6):
+        list(scheduler.run_once(now=now))
+        now = scheduler.get(URL).next_fetch_at
+    assert scheduler.get(URL).interval == scheduler.max_interval
+
+
+def test_skips_expired_and_removed_listings(tmp_path):
+    other_url = "https://example.com/job/456"
+    pages = [httpx.Response(200, text="Hero"), httpx.Response(410)]
+    scheduler = _scheduler(tmp_path, pages, [])
+    scheduler.add([URL, other_url], now=NOW)
+
+    assert len(list(scheduler.run_once(max_concurrency=1, now=NOW))) == 1
+    assert scheduler.get(other_url).status == GONE
+
+    expires_at = expiry_timestamp("2030-01-31")
+    assert scheduler.get(URL).expires_at == expires_at
+    assert scheduler.due(now=expires_at) == []
+    assert scheduler.get(URL).status == EXPIRED
+    assert scheduler.next_due_at() is None
+
+
+def test_errors_are_retried_after_min_interval(tmp_path):
+    pages = [httpx.Response(500), httpx.Response(200, text="Hero")]
+    scheduler = _scheduler(tmp_path, pages, [])
+    scheduler.dog.max_retries = 0
+    scheduler.add([URL], now=NOW)
+
+    assert list(scheduler.run_once(now=NOW)) == []
+    state = scheduler.get(URL)
+    assert state.content_hash is None
+    assert state.interval == scheduler.initial_interval
+    assert state.next_fetch_at == NOW + scheduler.min_interval
+
+    now = state.next_fetch_at
+    assert [job.job_title for job in scheduler.run_once(now=now)] == ["Hero"]
+
+
+def test_add_skips_urls_that_cannot_be_sanitized(tmp_path, parser):
+    bad_url = "https://www.jobindex.dk/notajob"
+
+    def sanitize_url(url):
+        if url == bad_url:
+            raise JobDogSanitizeUrlError(f"No job id in {url}")
+        return url
+
+    parser.sanitize_url.side_effect = sanitize_url
+    scheduler = _scheduler(tmp_path, [], [])
+
+    assert scheduler.add([URL, bad_url], now=NOW) == 1
+    assert scheduler.get(bad_url) is None
+
+
+def test_run_checks_due_listings_in_batches(tmp_path):
+    urls = [f"{URL}{i}" for i in range(5)]
+    pages = [httpx.Response(200, text=str(i)) for i in range(5)]
+    scheduler = _scheduler(tmp_path, pages, [])
+    scheduler.add(urls)
+
+    class Idle(Exception):
+        pass
+
+    def sleep(seconds):
+        if seconds > 0:
+            raise Idle
+
+    titles = []
+    with (
+        patch("jobdog.scheduler.time.sleep", side_effect=sleep),
+        patch.object(scheduler, "due", wraps=scheduler.due) as due,
+        pytest.raises(Idle),
+    ):
+        for job in scheduler.run(batch_size=2):
+            titles.append(job.job_title)
+
+    assert sorted(titles) == ["0", "1", "2", "3", "4"]
+    assert [call.args[1] for call in due.call_args_list] == [2, 2, 2]
+
+
+def test_state_survives_reopening(tmp_path):
+    path = str(tmp_path / "recrawl.db")
+    with RecrawlScheduler(JobDog(), path) as scheduler:
+        scheduler.add([URL], now=NOW)
+    with RecrawlScheduler(JobDog(), path) as scheduler:
+        assert len(scheduler) == 1
+        assert [state.url for state in scheduler.due(now=NOW)] == [URL]
+
+
+def test_expiry_timestamp():
+    assert expiry_timestamp(None) is None
+    assert expiry_timestamp("soon") is None
+    assert expiry_timestamp("2030-01-31") == expiry_timestamp("2030-02-01T00:00:00Z")
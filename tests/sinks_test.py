@@ -0,0 +1,76 @@
+import io
+import json
+import pytest
+from jobdog.models.compact_job_listing import CompactJobListing
+from jobdog.models.job_listing import JobListing
+from jobdog.sinks import ColumnBuffer, NDJSONSink, ParquetSink
+
+LISTINGS = [
+    JobListing(
+        job_title="Likeable Superhero",
+        company_name="NotVought",
+        job_description="You will not be evil",
+        job_listing_url="https://example.com/job/123",
+        location=["New York", "Remote"],
+        employment_type="Full-time",
+    ),
+    JobListing(
+        job_title="Chief Squirrel Chaser",
+        company_name="Barks & Recreation",
+        job_description="Chase squirrels",
+        location_type="remote",
+        skills=["Barking"],
+    ),
+]
+
+
+def test_column_buffer():
+    buffer = ColumnBuffer()
+    buffer.append(LISTINGS[0])
+    buffer.append(CompactJobListing.from_listing(LISTINGS[1]))
+
+    assert len(buffer) == 2
+    assert buffer.columns["job_title"] == [
+        "Likeable Superhero",
+        "Chief Squirrel Chaser",
+    ]
+    assert buffer.columns["job_listing_url"] == ["https://example.com/job/123", None]
+    assert buffer.columns["location"] == [["New York", "Remote"], None]
+    assert buffer.columns["employment_type"] == ["full_time", None]
+    assert buffer.columns["skills"] == [None, ["Barking"]]
+
+    buffer.clear()
+    assert len(buffer) == 0
+
+
+def test_ndjson_sink():
+    out = io.StringIO()
+    with NDJSONSink(out) as sink:
+        sink.write_many(LISTINGS)
+
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [record["job_title"] for record in records] == [
+        "Likeable Superhero",
+        "Chief Squirrel Chaser",
+    ]
+    assert records[1]["location_type"] == "remote"
+    assert records[1]["job_function"] is None
+    assert JobListing.model_validate(records[0]) == LISTINGS[0]
+
+
+def test_parquet_sink_writes_row_groups(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "listings.parquet"
+
+    with ParquetSink(path, row_group_size=2) as sink:
+        sink.write_many(LISTINGS * 3)
+
+    parquet_file = pq.ParquetFile(path)
+    assert parquet_file.metadata.num_row_groups == 3
+    assert str(parquet_file.schema_arrow.field("employment_type").type).startswith(
+        "dictionary"
+    )
+    rows = parquet_file.read().to_pylist()
+    assert len(rows) == 6
+    assert JobListing.model_validate(rows[0]) == LISTINGS[0]
+    assert rows[1]["skills"] == ["Barking"]
@@ -0,0 +1,73 @@
+import re
+
+from jobdog.streaming import (
+    MARKER_OVERLAP,
+    MARKER_RESCAN,
+    MARKER_WINDOW,
+    FieldScanner,
+)
+
+MARKERS = {"job_title": r"<h1>.*?</h1>", "location": r"class=\"location\".*?</p>"}
+
+
+def test_field_scanner_waits_for_all_markers():
+    scanner = FieldScanner(MARKERS)
+    assert not scanner.feed("<html><h1>Chief Squirrel")
+    assert not scanner.feed(" Chaser</h1>")
+    assert scanner.feed('<p class="location">Park</p><footer>')
+    assert scanner.html.startswith("<html><h1>Chief Squirrel Chaser</h1>")
+
+
+def test_field_scanner_with_fields():
+    scanner = FieldScanner(MARKERS, fields=["job_title"])
+    assert scanner.feed("<h1>Chief Squirrel Chaser</h1>")
+
+
+def test_field_scanner_reads_everything_without_markers():
+    assert not FieldScanner({}).feed("<h1>Chief Squirrel Chaser</h1>")
+    # a wanted field without a marker needs the whole page
+    scanner = FieldScanner(MARKERS, fields=["job_title", "salary"])
+    assert not scanner.feed('<h1>Title</h1><p class="location">Park</p>')
+
+
+def test_field_scanner_searches_a_window_of_the_page():
+    scanner = FieldScanner(MARKERS)
+    assert not scanner.feed("<h1>")
+    for _ in range(3):
+        assert not scanner.feed("x" * MARKER_WINDOW)
+    # the opening tag is out of the window by now
+    assert not scanner.feed("</h1>")
+    assert not scanner.feed("<h1>Title")
+    assert not scanner.feed("</h1>")
+    assert scanner.feed('<p class="location">Park</p>')
+    assert scanner.html.endswith('x</h1><h1>Title</h1><p class="location">Park</p>')
+    assert len(scanner.html) == 4 + 3 * MARKER_WINDOW + 5 + 9 + 5 + 28
+
+
+def test_field_scanner_sees_matches_longer_than_a_chunk():
+    scanner = FieldScanner(MARKERS, fields=["job_title"])
+    assert not scanner.feed("<h1>" + "x" * 3 * MARKER_OVERLAP)
+    # too far from the opening tag for the overlap; the window search finds it
+    assert not scanner.feed("</h1>")
+    fed = 0
+    while not scanner.feed("x" * 1024):
+        fed += 1024
+        assert fed < MARKER_RESCAN
+
+
+def test_field_scanner_search_is_linear_in_the_page():
+    searched = []
+
+    class Pattern:
+        def search(self, text):
+            searched.append(len(text))
+            return re.search(r"<h1>.*?</h1>", text, re.DOTALL)
+
+    scanner = FieldScanner(MARKERS, fields=["job_title"])
+    scanner._pending = {"job_title": Pattern()}
+    page_size = 5 * 1024 * 1024
+    scanner.feed("<h1>")
+    for _ in range(page_size // 4096):
+        scanner.feed("x" * 4096)
+
+    assert sum(searched) < 12 * page_size